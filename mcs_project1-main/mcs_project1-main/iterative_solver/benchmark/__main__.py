@@ -0,0 +1,76 @@
+"""
+Suite di benchmark sui metodi iterativi.
+
+Esempi:
+    python -m iterative_solver.benchmark --output bench.json
+    python -m iterative_solver.benchmark --save-baseline baseline.json
+    python -m iterative_solver.benchmark --baseline baseline.json --threshold 0.2
+    python -m iterative_solver.benchmark --methods spmv conjugate_gradient --threads 1 2 4 8
+    python -m iterative_solver.benchmark --precisions double mixed
+
+Con --baseline il processo termina con codice 1 se viene rilevata almeno una regressione.
+"""
+import argparse
+import sys
+
+from iterative_solver.benchmark.generators import FAMILIES
+from iterative_solver.utils.mixed_precision import PRECISIONS
+from iterative_solver.benchmark.runner import (
+    BENCHMARK_METHODS,
+    SPMV,
+    compare_to_baseline,
+    load_json,
+    run_benchmark,
+    save_json,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m iterative_solver.benchmark", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), default=None)
+    parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                        help="numeri di incognite (per Poisson si usa la griglia con n più vicino)")
+    parser.add_argument("--methods", nargs="+", choices=[SPMV] + list(BENCHMARK_METHODS), default=None)
+    parser.add_argument("--tol", type=float, default=1e-6)
+    parser.add_argument("--max-iter", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", nargs="+", type=int, default=None,
+                        help="numeri di thread del prodotto matrice-vettore (scalabilità; default: 1)")
+    parser.add_argument("--precisions", nargs="+", choices=list(PRECISIONS), default=None,
+                        help="precisioni da confrontare (default: double)")
+    parser.add_argument("--output", help="file JSON in cui salvare i risultati")
+    parser.add_argument("--baseline", help="file JSON di baseline con cui confrontare i risultati")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="peggioramento relativo del tempo per iterazione considerato regressione")
+    parser.add_argument("--save-baseline", help="salva i risultati come nuova baseline")
+    args = parser.parse_args(argv)
+
+    risultati = run_benchmark(
+        families=args.families, sizes=args.sizes, methods=args.methods,
+        tol=args.tol, max_iter=args.max_iter, warmup=args.warmup, repeats=args.repeats, seed=args.seed,
+        threads=args.threads, precisions=args.precisions,
+    )
+    if args.output:
+        save_json(risultati, args.output)
+    if args.save_baseline:
+        save_json(risultati, args.save_baseline)
+
+    if args.baseline:
+        regressioni = compare_to_baseline(risultati, load_json(args.baseline), threshold=args.threshold)
+        risultati["regressions"] = regressioni
+        if args.output:
+            save_json(risultati, args.output)
+        if regressioni:
+            print(f"\n✘ {len(regressioni)} regressioni rispetto a {args.baseline}:")
+            for r in regressioni:
+                print(f"- {r['case']}: {r['metric']} {r['baseline']} -> {r['current']}")
+            return 1
+        print(f"\n✔ Nessuna regressione rispetto a {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+
+def poisson_2d(m: int) -> sp.csr_matrix:
+    """
+    Laplaciano 2D a 5 punti su una griglia m x m (condizioni di Dirichlet).
+    Matrice SPD di dimensione n = m^2.
+    """
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    I = sp.identity(m)
+    return (sp.kron(I, T) + sp.kron(T, I)).tocsr()
+
+
+def poisson_2d_operator(m: int):
+    """
+    Laplaciano 2D a 5 punti applicato senza assemblare la matrice (stencil su griglia m x m).
+    Ritorna (LinearOperator, diagonale): stesso operatore di poisson_2d(m).
+    """
+    n = m * m
+
+    def matvec(v):
+        u = np.asarray(v, dtype=np.float64).reshape(m, m)
+        out = 4.0 * u
+        out[1:, :] -= u[:-1, :]
+        out[:-1, :] -= u[1:, :]
+        out[:, 1:] -= u[:, :-1]
+        out[:, :-1] -= u[:, 1:]
+        return out.reshape(-1)
+
+    return LinearOperator((n, n), matvec=matvec, dtype=np.float64), np.full(n, 4.0)
+
+
+def poisson_3d(m: int) -> sp.csr_matrix:
+    """
+    Laplaciano 3D a 7 punti su una griglia m x m x m (condizioni di Dirichlet).
+    Matrice SPD di dimensione n = m^3.
+    """
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    I = sp.identity(m)
+    return (sp.kron(sp.kron(I, I), T) + sp.kron(sp.kron(I, T), I) + sp.kron(sp.kron(T, I), I)).tocsr()
+
+
+def _random_sparse(n: int, nnz_per_row: float, seed: int) -> sp.csr_matrix:
+    """Matrice sparsa casuale n x n con circa nnz_per_row elementi N(0, 1) per riga."""
+    rng = np.random.default_rng(seed)
+    density = min(1.0, nnz_per_row / n)
+    return sp.random(n, n, density=density, format="csr", random_state=rng, data_rvs=rng.standard_normal)
+
+
+def random_spd(n: int, cond: float = 1e3, nnz_per_row: int = 10, seed: int = 0) -> sp.csr_matrix:
+    """
+    Matrice sparsa SPD casuale con numero di condizionamento (circa) pari a cond.
+
+    Si genera una matrice simmetrica sparsa S e la si trasforma in alpha * S + beta * I
+    in modo che lo spettro sia esattamente [1, cond] (estremi stimati con Lanczos).
+    """
+    if cond < 1:
+        raise ValueError(f"Il numero di condizionamento deve essere >= 1; trovato cond={cond}.")
+    S = _random_sparse(n, nnz_per_row / 2, seed)
+    S = (S + S.T).tocsr()
+    if S.nnz == 0:
+        return sp.identity(n, format="csr")
+    if n <= 64:
+        autovalori = np.linalg.eigvalsh(S.toarray())
+        lmin, lmax = autovalori[0], autovalori[-1]
+    else:
+        lmax = eigsh(S, k=1, which="LA", tol=1e-8, return_eigenvectors=False)[0]
+        lmin = eigsh(S, k=1, which="SA", tol=1e-8, return_eigenvectors=False)[0]
+    alpha = (cond - 1.0) / (lmax - lmin) if lmax > lmin else 0.0
+    beta = 1.0 - alpha * lmin
+    return (alpha * S + beta * sp.identity(n)).tocsr()
+
+
+def diag_dominant(n: int, nnz_per_row: int = 10, margin: float = 0.1, seed: int = 0) -> sp.csr_matrix:
+    """
+    Matrice sparsa non simmetrica, strettamente diagonalmente dominante per righe:
+    a_ii = (1 + margin) * sum_{j != i} |a_ij| (e almeno 1 per le righe vuote).
+    """
+    R = _random_sparse(n, nnz_per_row, seed)
+    R.setdiag(0.0)
+    R.eliminate_zeros()
+    row_sums = np.asarray(abs(R).sum(axis=1)).ravel()
+    diag = np.maximum((1.0 + margin) * row_sums, 1.0)
+    return (R + sp.diags(diag)).tocsr()
+
+
+def _grid_side(n: int, dim: int) -> int:
+    """Lato della griglia con circa n incognite in dimensione dim."""
+    return max(2, int(round(n ** (1.0 / dim))))
+
+
+# Famiglie di matrici: nome -> (generatore(n, seed), matrice simmetrica)
+FAMILIES = {
+    "poisson2d": (lambda n, seed: poisson_2d(_grid_side(n, 2)), True),
+    "poisson3d": (lambda n, seed: poisson_3d(_grid_side(n, 3)), True),
+    "random_spd": (lambda n, seed: random_spd(n, seed=seed), True),
+    "diag_dominant": (lambda n, seed: diag_dominant(n, seed=seed), False),
+}
+
+# Numero di incognite predefinito (per Poisson si usa la griglia con n più vicino)
+DEFAULT_SIZES = (1000, 4000, 16000)
+
+
+def make_matrix(family: str, n: int, seed: int = 0) -> sp.csr_matrix:
+    """Genera la matrice della famiglia indicata con circa n incognite."""
+    if family not in FAMILIES:
+        raise ValueError(f"Famiglia sconosciuta: {family!r}. Valori ammessi: {list(FAMILIES)}.")
+    generatore, _ = FAMILIES[family]
+    return generatore(n, seed)
@@ -0,0 +1,271 @@
+import json
+import os
+import platform
+import statistics
+import time
+import warnings
+from functools import partial
+from typing import Dict, List, Optional
+
+import numpy as np
+import scipy
+
+from iterative_solver.benchmark.generators import DEFAULT_SIZES, FAMILIES, make_matrix
+from iterative_solver.iterative_methods.amg import amg
+from iterative_solver.iterative_methods.bicgstab import bicgstab
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gmres import gmres
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.iterative_methods.sor import sor, ssor
+from iterative_solver.utils.mixed_precision import PRECISIONS
+from iterative_solver.utils.setup_variable import setup_variable
+from iterative_solver.utils.spmv import SpMVKernel, spmv_threads
+
+BENCHMARK_METHODS = {
+    "jacobi": jacobi,
+    "gauss_seidel": gauss_seidel,
+    "gauss_seidel_multicolor": partial(gauss_seidel, variant="multicolor"),
+    "gradient": gradient,
+    "conjugate_gradient": conjugate_gradient,
+    "bicgstab": bicgstab,
+    "gmres": gmres,
+    "amg": amg,
+    "sor": sor,
+    "ssor": ssor,
+}
+
+# Metodi che richiedono una matrice simmetrica definita positiva
+SPD_ONLY = ("gradient", "conjugate_gradient")
+
+# Metodo fittizio per la misura del solo prodotto matrice-vettore
+SPMV = "spmv"
+
+
+def _timed(fn, warmup: int, repeats: int):
+    """Esegue fn warmup volte senza misurare, poi repeats volte con perf_counter. Ritorna (ultimo esito, tempi)."""
+    for _ in range(warmup):
+        fn()
+    tempi = []
+    esito = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        esito = fn()
+        tempi.append(time.perf_counter() - start)
+    return esito, tempi
+
+
+def bench_spmv(A, warmup: int = 1, repeats: int = 5, products: int = 50, threads: int = 1) -> dict:
+    """
+    Throughput del prodotto A @ x (media su products prodotti per ripetizione) con il
+    kernel SpMV dei metodi iterativi su threads thread, scrivendo in un buffer riusato.
+    """
+    x = np.ones(A.shape[1])
+    y = np.empty(A.shape[0])
+    matvec = SpMVKernel(A, threads)
+
+    def kernel():
+        for _ in range(products):
+            matvec(x, out=y)
+
+    _, tempi = _timed(kernel, warmup, repeats)
+    t = statistics.median(tempi) / products
+    return {
+        "time_median": t,
+        "time_min": min(tempi) / products,
+        "time_per_iter": t,
+        "nnz_per_s": A.nnz / t if t > 0 else None,
+    }
+
+
+def bench_method(name: str, A, b, x_esatto, tol: float, max_iter: int, warmup: int = 1, repeats: int = 3,
+                 precision: str = "double") -> dict:
+    """
+    Misura un metodo iterativo su (A, b) fino alla tolleranza tol (precision: 'double' o 'mixed').
+
+    Il warmup popola anche la cache dei profili di matrice (fattorizzazioni,
+    controlli): i tempi misurati sono quelli di una risoluzione "a regime".
+    """
+    solver = BENCHMARK_METHODS[name]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        esito, tempi = _timed(lambda: solver(A, b, x_esatto, tol, max_iter, precision=precision),
+                               warmup, repeats)
+    _, iterazioni, errore, _, convergenza = esito
+    t = statistics.median(tempi)
+    iterazioni = int(iterazioni)
+    return {
+        "iterations": iterazioni,
+        "converged": bool(convergenza),
+        "err_rel": float(errore),
+        "time_median": t,
+        "time_min": min(tempi),
+        "times": tempi,
+        "time_per_iter": t / iterazioni if iterazioni else None,
+        # Una passata su A per iterazione (SpMV o sweep triangolare)
+        "nnz_per_s": A.nnz * iterazioni / t if iterazioni and t > 0 else None,
+    }
+
+
+def run_benchmark(
+    families: Optional[List[str]] = None,
+    sizes: Optional[List[int]] = None,
+    methods: Optional[List[str]] = None,
+    tol: float = 1e-6,
+    max_iter: int = 20000,
+    warmup: int = 1,
+    repeats: int = 3,
+    seed: int = 0,
+    verbose: bool = True,
+    threads: Optional[List[int]] = None,
+    precisions: Optional[List[str]] = None
+) -> dict:
+    """
+    Esegue la suite di benchmark sulle famiglie di matrici sintetiche.
+
+    Parametri:
+    - families: famiglie da generare (default: tutte quelle in FAMILIES)
+    - sizes: numeri di incognite (default: DEFAULT_SIZES); per Poisson si usa la griglia più vicina
+    - methods: metodi da misurare (default: tutti; 'spmv' misura il solo prodotto A @ x)
+    - tol, max_iter: tolleranza e massimo numero di iterazioni dei metodi
+    - warmup, repeats: esecuzioni non misurate e misurate per ogni caso
+    - threads: numeri di thread del prodotto matrice-vettore da provare (default: [1])
+    - precisions: precisioni da provare (default: ['double']; 'mixed' = float32 con
+      raffinamento in float64, per 'spmv' il prodotto con la copia float32 di A)
+
+    Ogni caso viene ripetuto per ogni combinazione (threads, precisione); il record
+    riporta 'speedup' ed 'extra_iterations' rispetto alla prima combinazione.
+
+    Ritorna un dizionario serializzabile in JSON con 'meta' e 'results'.
+    """
+    families = list(FAMILIES) if families is None else families
+    threads = [1] if threads is None else list(threads)
+    precisions = ["double"] if precisions is None else list(precisions)
+    for precision in precisions:
+        if precision not in PRECISIONS:
+            raise ValueError(f"Precisione sconosciuta: {precision!r}. Valori ammessi: {list(PRECISIONS)}.")
+    methods = [SPMV] + list(BENCHMARK_METHODS) if methods is None else methods
+    for name in methods:
+        if name != SPMV and name not in BENCHMARK_METHODS:
+            raise ValueError(f"Metodo sconosciuto: {name!r}. Valori ammessi: {[SPMV] + list(BENCHMARK_METHODS)}.")
+
+    results = []
+    for family in families:
+        _, simmetrica = FAMILIES[family]
+        for size in (DEFAULT_SIZES if sizes is None else sizes):
+            A = make_matrix(family, size, seed=seed)
+            A32 = A.astype(np.float32) if "mixed" in precisions else None
+            x_esatto, b = setup_variable(A)
+            for name in methods:
+                if name in SPD_ONLY and not simmetrica:
+                    continue
+                riferimento = None
+                for t in threads:
+                    for precision in precisions:
+                        record = {"family": family, "size": size, "n": A.shape[0], "nnz": int(A.nnz), "method": name,
+                                  "threads": t, "precision": precision}
+                        try:
+                            if name == SPMV:
+                                M = A32 if precision == "mixed" else A
+                                record.update(bench_spmv(M, warmup=warmup, repeats=max(repeats, 3), threads=t))
+                            else:
+                                record.update({"tol": tol})
+                                with spmv_threads(t):
+                                    record.update(bench_method(name, A, b, x_esatto, tol, max_iter, warmup, repeats,
+                                                               precision))
+                        except ValueError as e:
+                            record["error"] = str(e)
+                        if "error" not in record:
+                            if riferimento is None:
+                                riferimento = record
+                            t_rif, t_cur = riferimento["time_median"], record["time_median"]
+                            record["speedup"] = t_rif / t_cur if t_cur > 0 else None
+                            if name != SPMV:
+                                record["extra_iterations"] = record["iterations"] - riferimento["iterations"]
+                        results.append(record)
+                        if verbose:
+                            _print_record(record)
+
+    return {"meta": _meta(tol, max_iter, warmup, repeats, seed), "results": results}
+
+
+def _meta(tol, max_iter, warmup, repeats, seed) -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "processor": platform.processor(),
+        "tol": tol,
+        "max_iter": max_iter,
+        "warmup": warmup,
+        "repeats": repeats,
+        "seed": seed,
+    }
+
+
+def _print_record(r: dict) -> None:
+    caso = (f"{r['family']:>14} n={r['n']:<8} {r['method']:<19} t={r.get('threads', 1):<3}"
+            f" {r.get('precision', 'double'):<6}")
+    if "error" in r:
+        print(f"{caso} ERRORE: {r['error']}")
+    elif r["method"] == SPMV:
+        print(f"{caso} {r['time_per_iter'] * 1e3:9.4f} ms/prodotto   {r['nnz_per_s'] / 1e6:8.1f} Mnnz/s"
+              f"   x{r['speedup']:.2f}")
+    else:
+        stato = "✔" if r["converged"] else "✘"
+        per_iter = f"{r['time_per_iter'] * 1e3:9.4f} ms/iter" if r["time_per_iter"] else " " * 16
+        print(f"{caso} {stato} {r['iterations']:>6} iter  {r['time_median']:8.4f} s  {per_iter}   x{r['speedup']:.2f}"
+              f"  {r['extra_iterations']:+d} iter")
+
+
+def _key(r: dict):
+    return r["family"], r["size"], r["method"], r.get("threads", 1), r.get("precision", "double")
+
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    Confronta i risultati con una baseline salvata.
+
+    È una regressione:
+    - un tempo per iterazione (o per prodotto) peggiore di oltre threshold (frazione relativa);
+    - un aumento del numero di iterazioni;
+    - un caso che prima convergeva e ora no (o che ora termina con errore).
+
+    Ritorna la lista delle regressioni (dizionari con caso, metrica, baseline, valore attuale).
+    """
+    base = {_key(r): r for r in baseline.get("results", [])}
+    regressioni = []
+    for r in current.get("results", []):
+        b = base.get(_key(r))
+        if b is None or "error" in b:
+            continue
+        caso = "/".join(str(v) for v in _key(r))
+        if "error" in r:
+            regressioni.append({"case": caso, "metric": "error", "baseline": None, "current": r["error"]})
+            continue
+        if r["method"] != SPMV:
+            if b["converged"] and not r["converged"]:
+                regressioni.append({"case": caso, "metric": "converged", "baseline": True, "current": False})
+            if r["iterations"] > b["iterations"]:
+                regressioni.append({"case": caso, "metric": "iterations", "baseline": b["iterations"], "current": r["iterations"]})
+        t_base, t_cur = b.get("time_per_iter"), r.get("time_per_iter")
+        if t_base and t_cur and t_cur > t_base * (1.0 + threshold):
+            regressioni.append({
+                "case": caso, "metric": "time_per_iter", "baseline": t_base, "current": t_cur,
+                "ratio": t_cur / t_base,
+            })
+    return regressioni
+
+
+def save_json(data: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
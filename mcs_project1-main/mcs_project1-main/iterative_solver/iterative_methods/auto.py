@@ -0,0 +1,40 @@
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+
+# Metodi tra cui sceglie auto (nomi di utils.convergence)
+AUTO_METHODS = {
+    "jacobi": jacobi,
+    "gauss_seidel": gauss_seidel,
+    "gradient": gradient,
+    "conjugate_gradient": conjugate_gradient,
+}
+
+
+def auto(A, b, x_true, tol, max_iter=20000, profile=None, checkpoints=None, recorder=None, x0=None,
+         precision="double"):
+    """
+    Risolve A x = b con il metodo dal minor tempo previsto a tolleranza tol.
+
+    La previsione (fattori di riduzione stimati e costo misurato di un'iterazione,
+    vedi utils.convergence) è calcolata una volta per matrice e salvata nel profilo;
+    i metodi previsti divergenti o oltre max_iter vengono esclusi.
+    precision ('double' o 'mixed') è passata al metodo scelto.
+    Ritorna la tupla del metodo scelto (x, iterazioni, errore relativo, tempo, convergenza).
+    """
+    if profile is None:
+        profile = get_matrix_profile(A)
+    nome = profile.convergence.best(tol, max_iter)
+    if nome is None:
+        raise ValueError("Nessun metodo è previsto convergente entro il massimo di iterazioni per questa matrice.")
+    return AUTO_METHODS[nome](A, b, x_true, tol, max_iter, profile=profile, checkpoints=checkpoints,
+                              recorder=recorder, x0=x0, precision=precision)
+
+
+def auto_method_name(A, tol, max_iter=20000, profile=None):
+    """Nome del metodo che auto userebbe per A a tolleranza tol (None se nessuno è previsto convergente)."""
+    if profile is None:
+        profile = get_matrix_profile(A)
+    return profile.convergence.best(tol, max_iter)
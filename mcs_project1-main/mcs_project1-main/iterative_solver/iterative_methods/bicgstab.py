@@ -0,0 +1,161 @@
+import time
+import warnings
+from functools import partial
+
+import numpy as np
+
+from iterative_solver.iterative_methods.preconditioners import make_preconditioner
+from iterative_solver.utils.block_rhs import is_block, solve_columns
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.mixed_precision import check_precision, mixed_precision_solve, working_dtype
+from iterative_solver.utils.operators import as_linear_operator, is_operator
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
+
+
+def bicgstab(A, b, x_exact, tol, max_iter=20000, profile=None, checkpoints=None, preconditioner=None,
+             recorder=None, precision="double", x0=None):
+    """
+    BiCGSTAB (van der Vorst) per matrici quadrate anche non simmetriche.
+    - Ogni iterazione costa due prodotti A @ v (e due applicazioni del precondizionatore).
+    - preconditioner: None, 'jacobi', 'ssor', 'ic0', 'amg', un Preconditioner oppure una funzione
+      r -> z ≈ M^{-1} r, applicato a destra (il residuo monitorato è quello vero, non precondizionato).
+    - Il residuo è aggiornato per ricorrenza; quando scende sotto tol (o sotto una tolleranza
+      dei checkpoint) viene ricalcolato come b - A x e, se quello vero non basta, il metodo
+      riparte da esso (la ricorrenza può discostarsi molto dal residuo vero).
+    - Breakdown (rho = 0, r_hat · A p = 0 oppure omega = 0): WARNING, stop pulito, convergenza=False.
+    - profile, checkpoints, recorder, precision, x0: come per conjugate_gradient.
+    - A può essere anche un LinearOperator o una funzione matvec; se b è un blocco (n, k)
+      le colonne vengono risolte una alla volta.
+    """
+    setup_start = time.perf_counter()
+    check_precision(precision)
+    if precision == "mixed":
+        interno = partial(bicgstab, preconditioner=preconditioner)
+        return mixed_precision_solve(interno, "bicgstab", A, b, x_exact, tol, max_iter, profile,
+                                     checkpoints, recorder, setup_start, x0=x0)
+
+    if is_operator(A):
+        A = as_linear_operator(A, np.shape(b)[0])
+    elif profile is None:
+        profile = get_matrix_profile(A)
+    if A.shape[0] != A.shape[1]:
+        raise ValueError(f"A deve essere quadrata; trovata {A.shape}.")
+
+    M = make_preconditioner(preconditioner, A, profile)
+    matvec = spmv_kernel(A, profile)
+
+    if is_block(b):
+        if checkpoints is not None or recorder is not None:
+            raise ValueError("Checkpoint e recorder non sono supportati con un blocco di termini noti.")
+        return solve_columns(
+            lambda bj, xj, x0j: bicgstab(A, bj, xj, tol, max_iter, profile=profile, preconditioner=M, x0=x0j),
+            b, x_exact, x0,
+        )
+
+    if recorder is not None:
+        # Ogni iterazione: due prodotti, due applicazioni di M, sei prodotti scalari/norme
+        solve = 2 * M.solves_per_apply if M is not None else 0
+        recorder.begin("bicgstab", max_iter, setup_start, spmv=2, solve=solve, dot=6, alloc=2 if M else 0)
+        recorder.count(spmv=1, dot=2, alloc=8)  # residuo iniziale, norma di b, x, r, r_hat, p, v, s, t, buffer
+
+    x = initial_guess(x0, b, working_dtype(A, b))
+    r = b - matvec(x)
+    nb = np.linalg.norm(b)
+    start_time = time.time()
+    if nb == 0.0:
+        x.fill(0.0)
+        err_rel = np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact) if np.linalg.norm(x_exact) > 0 else 0.0
+        return x, 0, err_rel, time.time() - start_time, True
+
+    # Buffer di lavoro riusati ad ogni iterazione
+    r_hat = r.copy()
+    p = np.zeros_like(r)
+    v = np.zeros_like(r)
+    t = np.empty_like(r)
+    rho = alpha = omega = 1.0
+    iterazioni = 0
+    convergenza = False
+    res_rel = np.linalg.norm(r) / nb
+    if checkpoints is not None:
+        checkpoints.observe(0, res_rel, x, start_time)
+    if recorder is not None:
+        recorder.record(0, res_rel)
+
+    while iterazioni < max_iter:
+        if res_rel < tol or (checkpoints is not None and checkpoints.crosses(res_rel)):
+            # Verifica sul residuo vero
+            r_vero = b - matvec(x)
+            res_vero = np.linalg.norm(r_vero) / nb
+            if recorder is not None:
+                recorder.count(spmv=1, dot=1, alloc=1)
+            attraversa = checkpoints is not None and checkpoints.crosses(res_vero)
+            if attraversa:
+                checkpoints.observe(iterazioni, res_vero, x, start_time)
+            if res_vero < tol:
+                res_rel = res_vero
+                convergenza = True
+                break
+            if res_rel < tol or not attraversa:
+                # Ripartenza dal residuo vero
+                r, res_rel = r_vero, res_vero
+                r_hat = r.copy()
+                p.fill(0.0)
+                v.fill(0.0)
+                rho = alpha = omega = 1.0
+
+        rho_new = float(r_hat @ r)
+        if rho_new == 0.0:
+            warnings.warn("BiCGSTAB: breakdown (r_hat · r = 0), metodo interrotto.", RuntimeWarning, stacklevel=2)
+            break
+        beta = (rho_new / rho) * (alpha / omega)
+        # p = r + beta (p - omega v)
+        p -= omega * v
+        p *= beta
+        p += r
+        p_hat = p if M is None else M(p)
+        matvec(p_hat, out=v)
+        r_hat_v = float(r_hat @ v)
+        if r_hat_v == 0.0:
+            warnings.warn("BiCGSTAB: breakdown (r_hat · A p = 0), metodo interrotto.", RuntimeWarning, stacklevel=2)
+            break
+        alpha = rho_new / r_hat_v
+        s = r - alpha * v
+        iterazioni += 1
+
+        res_s = np.linalg.norm(s) / nb
+        if res_s < tol:
+            # Mezzo passo sufficiente: x += alpha p_hat
+            x += alpha * p_hat
+            r = s
+            res_rel = res_s
+        else:
+            s_hat = s if M is None else M(s)
+            matvec(s_hat, out=t)
+            tt = float(t @ t)
+            omega = float(t @ s) / tt if tt > 0 else 0.0
+            x += alpha * p_hat
+            x += omega * s_hat
+            r = s - omega * t
+            res_rel = np.linalg.norm(r) / nb
+            if omega == 0.0:
+                warnings.warn("BiCGSTAB: breakdown (omega = 0), metodo interrotto.", RuntimeWarning, stacklevel=2)
+                break
+        rho = rho_new
+
+        if recorder is not None and recorder.record(iterazioni, res_rel):
+            convergenza = res_rel < tol
+            break
+        if not np.isfinite(res_rel):
+            break
+    else:
+        if res_rel < tol:
+            res_rel = np.linalg.norm(b - matvec(x)) / nb
+            if checkpoints is not None:
+                checkpoints.observe(iterazioni, res_rel, x, start_time)
+        convergenza = res_rel < tol
+
+    tempo_calcolo = time.time() - start_time
+    err_relativo = (np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact)
+                    if np.linalg.norm(x_exact) > 0 else np.linalg.norm(x - x_exact))
+    return x, iterazioni, err_relativo, tempo_calcolo, convergenza
@@ -1,76 +1,194 @@
 import time
 import numpy as np
 import warnings
-import scipy.sparse as sp
-import scipy.sparse.linalg as spla
-
-def _is_symmetric(A, atol: float = 1e-12) -> bool:
-    if sp.issparse(A):
-        D = (A - A.T).tocoo()
-        return D.nnz == 0 or np.max(np.abs(D.data)) <= atol
-    return np.allclose(A, A.T, atol=atol, rtol=0.0)
-
-def _is_positive_definite(A, atol: float = 0.0) -> bool:
-    if sp.issparse(A):
-        try:
-            w_min, _ = spla.eigsh(A, k=1, which='SA')  # min eigenvalue
-            return float(w_min[0]) > atol
-        except Exception:
-            return False
-    else:
-        try:
-            np.linalg.cholesky(A)
-            return True
-        except np.linalg.LinAlgError:
-            try:
-                w = np.linalg.eigvalsh(A)
-                return float(np.min(w)) > atol
-            except Exception:
-                return False
-
-def conjugate_gradient(A, b, x_exact, tol, maxIter=20000):
+from functools import partial
+
+from iterative_solver.iterative_methods.preconditioners import make_preconditioner
+from iterative_solver.utils.block_rhs import block_errors, check_block, column_dots, column_norms, is_block
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.mixed_precision import check_precision, mixed_precision_solve, working_dtype
+from iterative_solver.utils.operators import as_linear_operator, check_spd_operator, is_operator
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
+
+
+def _conjugate_gradient_block(matvec, B, X_exact, tol, maxIter, M, X0=None):
+    """
+    (P)CG su un blocco di termini noti B (n, k): coefficienti alpha/beta per colonna
+    e un solo prodotto A @ D per iterazione per tutto il blocco attivo.
+    Ritorna (X, iterazioni[k], errore_relativo[k], tempo, convergenza[k]).
+    """
+    B, X_exact = check_block(B, X_exact)
+    _, k = B.shape
+    X = initial_guess(X0, B, B.dtype)
+    iterazioni = np.zeros(k, dtype=int)
+    convergenza = np.zeros(k, dtype=bool)
+    nb = column_norms(B)
+
+    X[:, nb == 0] = 0.0
+    convergenza[nb == 0] = True
+    if X0 is not None:
+        # Colonne già risolte dal punto iniziale: nessuna iterazione
+        convergenza |= column_norms(B - matvec(X)) < tol * nb
+    cols = np.flatnonzero(~convergenza)
+    Xa, nba = np.ascontiguousarray(X[:, cols]), nb[cols]
+    Ra = np.ascontiguousarray(B[:, cols]) - matvec(Xa)
+    Za = Ra if M is None else M(Ra)
+    Da = Za.copy()
+    rr = column_dots(Ra, Ra)
+    delta_new = rr if M is None else column_dots(Ra, Za)
+    start_time = time.time()
+    it = 0
+
+    while cols.size and it < maxIter:
+        Q = matvec(Da)
+        alpha = delta_new / column_dots(Da, Q)
+        Xa += Da * alpha
+        Ra -= Q * alpha
+        rr = column_dots(Ra, Ra)
+        delta_old = delta_new
+        if M is None:
+            Za = Ra
+            delta_new = rr
+        else:
+            Za = M(Ra)
+            delta_new = column_dots(Ra, Za)
+        Da = Za + Da * (delta_new / delta_old)
+        it += 1
+
+        res = np.sqrt(rr) / nba
+        ok = res <= tol
+        done = ok | ~np.isfinite(res)
+        if done.any():
+            X[:, cols[done]] = Xa[:, done]
+            iterazioni[cols[done]] = it
+            convergenza[cols[ok]] = True
+            keep = ~done
+            cols, nba, rr, delta_new = cols[keep], nba[keep], rr[keep], delta_new[keep]
+            Xa, Ra, Da = (np.ascontiguousarray(V[:, keep]) for V in (Xa, Ra, Da))
+
+    X[:, cols] = Xa
+    iterazioni[cols] = it
+    tempo_calcolo = time.time() - start_time
+    return X, iterazioni, block_errors(X, X_exact), tempo_calcolo, convergenza
+
+def conjugate_gradient(A, b, x_exact, tol, maxIter=20000, profile=None, checkpoints=None, preconditioner=None,
+                       recorder=None, precision="double", x0=None):
     """
     Conjugate Gradient per matrici SPD.
     - Se A NON è simmetrica o NON è PD -> raise.
     - Se a runtime capita d^T A d <= 0 -> WARNING, stop pulito, convergenza=False.
+    - profile: MatrixProfile di A (se None viene preso dalla cache dei profili).
+    - checkpoints: ToleranceCheckpoints opzionale, aggiornato ad ogni iterazione.
+    - preconditioner: None (CG classico), 'jacobi', 'ssor', 'ic0', 'amg' (un V-ciclo del
+      multigrid algebrico), un Preconditioner oppure una funzione r -> z ≈ M^{-1} r; in tal
+      caso il ciclo diventa PCG. I precondizionatori predefiniti sono fattorizzati una volta per matrice.
+    - Se b è un blocco (n, k) le colonne vengono risolte insieme e iterazioni,
+      errori e convergenza sono restituiti come array per colonna.
+    - recorder: IterationRecorder opzionale (storia del residuo, contatori, callback).
+    - A può essere anche un LinearOperator o una funzione matvec (non assemblata):
+      simmetria e positività sono stimate su vettori casuali e il precondizionatore,
+      se presente, deve essere una funzione o un Preconditioner.
+    - precision: 'double' oppure 'mixed' (correzioni in float32 con raffinamento
+      iterativo in float64, vedi utils.mixed_precision). Un precondizionatore indicato
+      per nome viene fattorizzato sulla copia float32 di A.
+    - x0: punto iniziale (default: zeri), ad esempio da una SolutionCache (utils.warm_start).
     """
-    # --- CONTROLLI SPD  ---
-    if not _is_symmetric(A):
-        raise ValueError("Matrix A is not symmetric, Conjugate Gradient failed.")
-    if not _is_positive_definite(A):
-        raise ValueError("Matrix A is not positive-definite, Conjugate Gradient failed.")
-
-    n = b.size
-    x = np.zeros(n)
-    r = b - A @ x
-    d = r.copy()
-    delta_new = float(r @ r)
+    setup_start = time.perf_counter()
+    check_precision(precision)
+    if precision == "mixed":
+        interno = partial(conjugate_gradient, preconditioner=preconditioner)
+        return mixed_precision_solve(interno, "conjugate_gradient", A, b, x_exact, tol, maxIter, profile,
+                                     checkpoints, recorder, setup_start, x0=x0)
+
+    if is_operator(A):
+        A = as_linear_operator(A, np.shape(b)[0])
+        check_spd_operator(A, A.shape[0], "Conjugate Gradient")
+    else:
+        if profile is None:
+            profile = get_matrix_profile(A)
+
+        # --- CONTROLLI SPD  ---
+        if not profile.is_symmetric:
+            raise ValueError("Matrix A is not symmetric, Conjugate Gradient failed.")
+        if not profile.is_positive_definite:
+            raise ValueError(f"Matrix A is not positive-definite ({profile.spd_certificate.evidence}), "
+                             "Conjugate Gradient failed.")
+
+    M = make_preconditioner(preconditioner, A, profile)
+    # Prodotto matrice-vettore (eventualmente multithread, vedi utils.spmv)
+    matvec = spmv_kernel(A, profile)
+
+    if is_block(b):
+        if checkpoints is not None or recorder is not None:
+            raise ValueError("Checkpoint e recorder non sono supportati con un blocco di termini noti.")
+        return _conjugate_gradient_block(matvec, b, x_exact, tol, maxIter, M, x0)
+
+    if recorder is not None:
+        # Ogni iterazione: A d (nel buffer q), d·q, r·r (+ r·z e applicazione di M con il
+        # precondizionatore) e i vettori temporanei degli aggiornamenti di x, r, d
+        pcg = M is not None
+        recorder.begin("conjugate_gradient", maxIter, setup_start, spmv=1, solve=M.solves_per_apply if pcg else 0,
+                       dot=2 + pcg, alloc=6 + pcg)
+        recorder.count(spmv=1, solve=M.solves_per_apply if pcg else 0, dot=2 + pcg, alloc=5 + pcg)
+
+    x = initial_guess(x0, b, working_dtype(A, b))
+    r = b - matvec(x)
+    q = np.empty_like(r)
+    z = r if M is None else M(r)
+    d = z.copy()
+    rr = float(r @ r)
+    delta_new = rr if M is None else float(r @ z)
     iterazioni = 0
     start_time = time.time()
     convergenza = True
 
     nb = np.linalg.norm(b)
     if nb == 0.0:
+        x.fill(0.0)
         tempo_calcolo = time.time() - start_time
         err_rel = (np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact)
                    if np.linalg.norm(x_exact) > 0 else 0.0)
         return x, 0, err_rel, tempo_calcolo, True
 
-    while np.sqrt(delta_new) / nb > tol:
+    if checkpoints is not None:
+        checkpoints.observe(0, np.sqrt(rr) / nb, x, start_time)
+    if recorder is not None:
+        recorder.record(0, np.sqrt(rr) / nb)
+
+    while np.sqrt(rr) / nb > tol:
         if iterazioni >= maxIter:
             convergenza = False
             break
 
-        q = A @ d
-        alpha = delta_new / np.dot(d, q)
+        matvec(d, out=q)
+        dq = np.dot(d, q)
+        if dq <= 0:
+            warnings.warn("d^T A d <= 0: A non è definita positiva, Conjugate Gradient interrotto.", RuntimeWarning,
+                          stacklevel=2)
+            convergenza = False
+            break
+        alpha = delta_new / dq
         x = x + alpha * d
         r = r - alpha * q
+        rr = float(r @ r)
         delta_old = delta_new
-        delta_new = float(r @ r)
+        if M is None:
+            z = r
+            delta_new = rr
+        else:
+            z = M(r)
+            delta_new = float(r @ z)
         beta = delta_new / delta_old
-        d = r + beta * d
+        d = z + beta * d
         iterazioni += 1
 
+        if checkpoints is not None:
+            checkpoints.observe(iterazioni, np.sqrt(rr) / nb, x, start_time)
+        if recorder is not None and recorder.record(iterazioni, np.sqrt(rr) / nb):
+            convergenza = np.sqrt(rr) / nb <= tol
+            break
+
     tempo_calcolo = time.time() - start_time
     err_relativo = (np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact)
                     if np.linalg.norm(x_exact) > 0 else np.linalg.norm(x - x_exact))
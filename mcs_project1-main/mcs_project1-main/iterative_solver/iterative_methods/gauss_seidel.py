@@ -2,87 +2,208 @@ import numpy as np
 import scipy.sparse as sp
 import time
 import warnings
+from functools import partial
 
-def _is_diagonally_dominant(A) -> bool:
+from iterative_solver.utils.block_rhs import block_errors, check_block, column_norms, is_block
+from iterative_solver.iterative_methods.sweep_engine import triangular_solver
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.mixed_precision import check_precision, mixed_precision_solve, working_dtype
+from iterative_solver.utils.operators import as_linear_operator, is_operator
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
+
+# Costo di uno sweep per variante (per IterationRecorder): la parte triangolare
+# "vecchia" moltiplicata per x conta come un prodotto matrice-vettore
+_SWEEP_COSTS = {
+    "forward": dict(spmv=1, solve=1, dot=1, alloc=2),
+    "backward": dict(spmv=1, solve=1, dot=1, alloc=2),
+    "symmetric": dict(spmv=2, solve=2, dot=1, alloc=8),
+    # Prodotti L_c x su tutti i colori + U x_new: una passata su A, nessuna risoluzione
+    "multicolor": dict(spmv=1, dot=1),
+}
+
+
+def _gauss_seidel_block(engine, B, X_true, tol, max_iter, variant, X0=None, omega=1.0):
     """
-    Controlla (row-wise) se A è diagonalmente dominante (debole).
+    Gauss-Seidel su un blocco di termini noti B (n, k): ogni sweep risolve il
+    sistema triangolare per tutte le colonne attive insieme.
+    Quando delle colonne convergono lo sweep riparte solo sulle rimanenti.
+    Ritorna (X, iterazioni[k], errore_relativo[k], tempo, convergenza[k]).
     """
-    A = A.tocsr()
-    n = A.shape[0]
-    diag = A.diagonal()
-
-    for i in range(n):
-        row_start = A.indptr[i]
-        row_end = A.indptr[i + 1]
-        idxs = A.indices[row_start:row_end]
-        vals = A.data[row_start:row_end]
-
-        sum_offdiag = 0.0
-        aii = 0.0
-        for j, v in zip(idxs, vals):
-            if j == i:
-                aii = v
-            else:
-                sum_offdiag += abs(v)
-
-        if abs(aii) < sum_offdiag:
-            return False
-    return True
-
-
-def gauss_seidel(A, b, x_true, tol, max_iter=20000):
+    B, X_true = check_block(B, X_true)
+    _, k = B.shape
+    X = initial_guess(X0, B, B.dtype)
+    iterazioni = np.full(k, max_iter, dtype=int)
+    convergenza = np.zeros(k, dtype=bool)
+    nb = column_norms(B)
+
+    X[:, nb == 0] = 0.0
+    convergenza[nb == 0] = True
+    if X0 is not None:
+        # Colonne già risolte dal punto iniziale: nessuna iterazione
+        convergenza |= column_norms(B - engine.A @ X) < tol * nb
+    iterazioni[convergenza] = 0
+    cols = np.flatnonzero(~convergenza)
+    start_time = time.time()
+    run = engine.start(np.ascontiguousarray(B[:, cols]), np.ascontiguousarray(X[:, cols]),
+                       variant=variant, omega=omega)
+
+    for it in range(1, max_iter + 1):
+        if cols.size == 0:
+            break
+        residuo = run.sweep()
+        res = column_norms(residuo) / nb[cols]
+
+        ok = res < tol
+        done = ok | ~np.isfinite(res)
+        if done.any():
+            X[:, cols] = run.x
+            iterazioni[cols[done]] = it
+            convergenza[cols[ok]] = True
+            cols = cols[~done]
+            if cols.size == 0:
+                break
+            run = engine.start(np.ascontiguousarray(B[:, cols]), np.ascontiguousarray(X[:, cols]),
+                               variant=variant, omega=omega)
+
+    if cols.size:
+        X[:, cols] = run.x
+    elapsed = time.time() - start_time
+    return X, iterazioni, block_errors(X, X_true), elapsed, convergenza
+
+def _gauss_seidel_splitting(A, b, x_true, tol, max_iter, solve, checkpoints, recorder, setup_start, x0=None):
+    """
+    Iterazione stazionaria x_{k+1} = x_k + M^{-1} (b - A x_k) con uno splitting fornito
+    (M = D + L per Gauss-Seidel). A serve solo come prodotto A @ x, quindi può essere
+    un operatore non assemblato.
+    """
+    x = initial_guess(x0, b)
+    r = np.empty_like(x)
+    nb = np.linalg.norm(b)
+    matvec = spmv_kernel(A)
+    if recorder is not None:
+        recorder.begin("gauss_seidel", max_iter, setup_start, spmv=1, solve=1, dot=1, alloc=1)
+        recorder.count(spmv=1, dot=2, alloc=4)  # residuo iniziale, norma di b, x, r
+    start_time = time.time()
+
+    for k in range(max_iter + 1):
+        matvec(x, out=r)
+        np.subtract(b, r, out=r)
+        err_rel_res = np.linalg.norm(r) / nb
+        if checkpoints is not None:
+            checkpoints.observe(k, err_rel_res, x, start_time)
+        interrotto = recorder is not None and recorder.record(k, err_rel_res)
+        if err_rel_res < tol or interrotto or not np.isfinite(err_rel_res) or k == max_iter:
+            break
+        x += solve(r)
+
+    elapsed = time.time() - start_time
+    err = np.linalg.norm(x - x_true) / np.linalg.norm(x_true)
+    return x, k, err, elapsed, bool(err_rel_res < tol)
+
+
+def gauss_seidel(A, b, x_true, tol, max_iter=20000, variant="forward", profile=None, checkpoints=None,
+                 recorder=None, splitting=None, precision="double", x0=None, omega=1.0):
     """
     Gauss-Seidel ottimizzato per matrici sparse (CSR).
     - Errore se la diagonale contiene zeri.
     - Warning se la matrice non è diagonalmente dominante.
+
+    Ogni iterazione è uno sweep del SweepEngine (risoluzione triangolare
+    sparsa + un prodotto matrice-vettore); il residuo arriva dallo sweep stesso.
+    - variant: 'forward' (classico), 'backward', 'symmetric' (SGS) oppure 'multicolor':
+      le righe sono colorate una volta per matrice (colorazione greedy, in cache nel
+      profilo) e ogni classe di colore è aggiornata in blocco con prodotti matrice-vettore
+      (multithread con utils.spmv); le iterazioni differiscono da quelle dell'ordine naturale
+    - profile: MatrixProfile di A (se None viene preso dalla cache dei profili)
+    - checkpoints: ToleranceCheckpoints opzionale, aggiornato ad ogni sweep
+    - recorder: IterationRecorder opzionale (storia del residuo, contatori, callback)
+    - splitting: parte triangolare M = D + L (matrice sparsa) oppure una funzione
+      r -> M^{-1} r. Obbligatorio se A è un LinearOperator o una funzione matvec:
+      si itera x += M^{-1} (b - A x) senza assemblare A (un prodotto A @ x e una
+      risoluzione per iterazione; i controlli sulla diagonale sono saltati).
+    - precision: 'double' oppure 'mixed' (sweep in float32 con raffinamento iterativo
+      in float64, vedi utils.mixed_precision; non combinabile con splitting).
+    - x0: punto iniziale (default: zeri), ad esempio da una SolutionCache (utils.warm_start).
+    - omega: parametro di rilassamento in (0, 2); con omega != 1 lo sweep 'forward' (o
+      'backward') è SOR e quello 'symmetric' è SSOR (vedi iterative_methods.sor per la
+      scelta automatica di omega). Non disponibile per 'multicolor' e con lo splitting.
+
+    Se b è un blocco (n, k) le colonne vengono risolte insieme e iterazioni,
+    errori e convergenza sono restituiti come array per colonna.
     """
+    setup_start = time.perf_counter()
+    check_precision(precision)
+    if precision == "mixed":
+        if splitting is not None:
+            raise ValueError("La precisione mista non supporta lo splitting esplicito: usa precision='double'.")
+        return mixed_precision_solve(partial(gauss_seidel, variant=variant, omega=omega), "gauss_seidel", A, b,
+                                     x_true, tol, max_iter, profile, checkpoints, recorder, setup_start, x0=x0)
+
+    if omega != 1.0 and (splitting is not None or is_operator(A)):
+        raise ValueError("Il rilassamento (omega != 1) richiede una matrice assemblata, non uno splitting.")
+    if splitting is not None or is_operator(A):
+        if splitting is None:
+            raise ValueError("Con un operatore non assemblato Gauss-Seidel richiede lo splitting (splitting=...).")
+        if is_block(b):
+            raise ValueError("Lo splitting esplicito non supporta un blocco di termini noti.")
+        if is_operator(A):
+            A = as_linear_operator(A, np.shape(b)[0])
+        solve = splitting if callable(splitting) else triangular_solver(sp.csr_matrix(splitting))
+        return _gauss_seidel_splitting(A, b, x_true, tol, max_iter, solve, checkpoints, recorder, setup_start, x0)
+
     if not sp.isspmatrix_csr(A):
         A = A.tocsr()
 
+    if profile is None:
+        profile = get_matrix_profile(A)
+
     # --- Controlli ---
-    diag = A.diagonal()
-    if np.any(diag == 0):
+    if profile.has_zero_diagonal:
         raise ValueError("La diagonale di A contiene almeno uno zero: Gauss-Seidel non è applicabile.")
-    if not _is_diagonally_dominant(A):
+    if not profile.is_diagonally_dominant:
         warnings.warn(
             "ATTENZIONE: la matrice non è diagonalmente dominante; Gauss-Seidel può non convergere.",
             RuntimeWarning,
             stacklevel=2
         )
 
-    n = A.shape[0]
-    x = np.zeros_like(b, dtype=np.float64)
+    engine = profile.multicolor_engine if variant == "multicolor" else profile.sweep_engine
+    if is_block(b):
+        if checkpoints is not None or recorder is not None:
+            raise ValueError("Checkpoint e recorder non sono supportati con un blocco di termini noti.")
+        return _gauss_seidel_block(engine, b, x_true, tol, max_iter, variant, x0, omega)
+
+    x = initial_guess(x0, b, working_dtype(A, b))
     nb = np.linalg.norm(b)
+    # x_0 = 0: residuo relativo iniziale pari a 1; con un punto iniziale va calcolato
+    res_iniziale = 1.0 if x0 is None else np.linalg.norm(b - spmv_kernel(A, profile)(x)) / nb
+    if recorder is not None:
+        recorder.begin("gauss_seidel", max_iter, setup_start, **_SWEEP_COSTS.get(variant, {}))
+        recorder.count(spmv=1, dot=1, alloc=3)  # norma di b, x, prodotto triangolare iniziale, buffer del residuo
+        if x0 is not None:
+            recorder.count(spmv=1, dot=1, alloc=2)
+        recorder.record(0, res_iniziale)
     start_time = time.time()
+    if res_iniziale < tol:
+        err = np.linalg.norm(x - x_true) / np.linalg.norm(x_true)
+        if checkpoints is not None:
+            checkpoints.observe(0, res_iniziale, x, start_time)
+        return x, 0, err, time.time() - start_time, True
+    run = engine.start(b, x, variant=variant, omega=omega)
 
     for k in range(max_iter):
-        for i in range(n):
-            row_start = A.indptr[i]
-            row_end = A.indptr[i + 1]
-            Ai = A.indices[row_start:row_end]
-            Av = A.data[row_start:row_end]
-
-            sigma = 0.0
-            aii = None
-
-            for idx, j in enumerate(Ai):
-                if j == i:
-                    aii = Av[idx]
-                else:
-                    sigma += Av[idx] * x[j]
-
-            if aii == 0:
-                raise ZeroDivisionError(f"A[{i},{i}] nullo: divisione impossibile")
-
-            x[i] = (b[i] - sigma) / aii
+        residuo = run.sweep()
 
         # Criterio di arresto sul residuo relativo
-        residuo = A @ x - b
         err_rel_res = np.linalg.norm(residuo) / nb
-        if err_rel_res < tol:
+        if checkpoints is not None:
+            checkpoints.observe(k + 1, err_rel_res, x, start_time)
+        interrotto = recorder is not None and recorder.record(k + 1, err_rel_res)
+        if err_rel_res < tol or interrotto:
             elapsed = time.time() - start_time
             err = np.linalg.norm(x - x_true) / np.linalg.norm(x_true)
-            return x, k + 1, err, elapsed, True
+            return x, k + 1, err, elapsed, err_rel_res < tol
 
     elapsed = time.time() - start_time
     err = np.linalg.norm(x - x_true) / np.linalg.norm(x_true)
@@ -0,0 +1,167 @@
+import time
+from functools import partial
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from iterative_solver.iterative_methods.preconditioners import make_preconditioner
+from iterative_solver.utils.block_rhs import is_block, solve_columns
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.mixed_precision import check_precision, mixed_precision_solve, working_dtype
+from iterative_solver.utils.operators import as_linear_operator, is_operator
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
+
+# Lunghezza di restart predefinita: memoria (restart + 1) * n per la base di Krylov
+DEFAULT_RESTART = 30
+
+
+def _correction(V, H, g, j, M):
+    """Correzione M^{-1} V_j y con y soluzione del sistema triangolare H[:j, :j] y = g[:j]."""
+    y = solve_triangular(H[:j, :j], g[:j], check_finite=False)
+    u = V[:, :j] @ y
+    return u if M is None else M(u)
+
+
+def gmres(A, b, x_exact, tol, max_iter=20000, profile=None, checkpoints=None, preconditioner=None,
+          recorder=None, precision="double", x0=None, restart=DEFAULT_RESTART):
+    """
+    GMRES(m) con restart per matrici quadrate anche non simmetriche.
+    - restart: dimensione m della base di Krylov; la base (n, m + 1) e la matrice di
+      Hessenberg (m + 1, m) sono allocate una sola volta e riusate ad ogni ciclo,
+      quindi la memoria è limitata a (m + 1) vettori qualunque sia max_iter.
+    - Ortogonalizzazione di Gram-Schmidt classica ripetuta due volte (CGS2, operazioni
+      BLAS-2 sull'intera base) e rotazioni di Givens: il residuo di ogni iterazione è
+      disponibile senza formare x; a fine ciclo x viene aggiornata e il residuo ricalcolato.
+    - Ogni iterazione (passo di Arnoldi) costa un prodotto A @ v e un'applicazione di M.
+    - preconditioner: None, 'jacobi', 'ssor', 'ic0', 'amg', un Preconditioner oppure una funzione
+      r -> z ≈ M^{-1} r, applicato a destra (il residuo monitorato è quello vero).
+    - profile, checkpoints, recorder, precision, x0: come per conjugate_gradient.
+    - A può essere anche un LinearOperator o una funzione matvec; se b è un blocco (n, k)
+      le colonne vengono risolte una alla volta.
+    """
+    setup_start = time.perf_counter()
+    check_precision(precision)
+    if restart < 1:
+        raise ValueError(f"restart deve essere >= 1; trovato restart={restart}.")
+    if precision == "mixed":
+        interno = partial(gmres, preconditioner=preconditioner, restart=restart)
+        return mixed_precision_solve(interno, "gmres", A, b, x_exact, tol, max_iter, profile,
+                                     checkpoints, recorder, setup_start, x0=x0)
+
+    if is_operator(A):
+        A = as_linear_operator(A, np.shape(b)[0])
+    elif profile is None:
+        profile = get_matrix_profile(A)
+    if A.shape[0] != A.shape[1]:
+        raise ValueError(f"A deve essere quadrata; trovata {A.shape}.")
+
+    M = make_preconditioner(preconditioner, A, profile)
+    matvec = spmv_kernel(A, profile)
+
+    if is_block(b):
+        if checkpoints is not None or recorder is not None:
+            raise ValueError("Checkpoint e recorder non sono supportati con un blocco di termini noti.")
+        return solve_columns(
+            lambda bj, xj, x0j: gmres(A, bj, xj, tol, max_iter, profile=profile, preconditioner=M,
+                                      x0=x0j, restart=restart),
+            b, x_exact, x0,
+        )
+
+    n = np.shape(b)[0]
+    m = min(restart, max(n, 1))
+    x = initial_guess(x0, b, working_dtype(A, b))
+    if recorder is not None:
+        # Ogni iterazione: un prodotto, un'applicazione di M, due passate di Gram-Schmidt
+        # (contate come prodotti scalari) e la norma del nuovo vettore
+        solve = M.solves_per_apply if M is not None else 0
+        recorder.begin("gmres", max_iter, setup_start, spmv=1, solve=solve, dot=3, alloc=1 if M else 0)
+        recorder.count(spmv=1, dot=2, alloc=3)  # residuo iniziale, norma di b, x, r, base di Krylov
+
+    # Strutture preallocate, riusate ad ogni restart
+    V = np.empty((n, m + 1), dtype=x.dtype, order="F")
+    H = np.zeros((m + 1, m))
+    cs = np.zeros(m)
+    sn = np.zeros(m)
+    g = np.zeros(m + 1)
+
+    r = b - matvec(x)
+    nb = np.linalg.norm(b)
+    start_time = time.time()
+    if nb == 0.0:
+        x.fill(0.0)
+        err_rel = np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact) if np.linalg.norm(x_exact) > 0 else 0.0
+        return x, 0, err_rel, time.time() - start_time, True
+
+    beta = np.linalg.norm(r)
+    res_rel = beta / nb
+    iterazioni = 0
+    interrotto = False
+    if checkpoints is not None:
+        checkpoints.observe(0, res_rel, x, start_time)
+    if recorder is not None:
+        recorder.record(0, res_rel)
+
+    while res_rel >= tol and iterazioni < max_iter and not interrotto:
+        np.divide(r, beta, out=V[:, 0])
+        g.fill(0.0)
+        g[0] = beta
+        j = 0
+        while j < m and iterazioni < max_iter:
+            w = V[:, j + 1]
+            matvec(V[:, j] if M is None else M(V[:, j]), out=w)
+            # CGS2: due passate di Gram-Schmidt classico sulla base corrente
+            base = V[:, :j + 1]
+            h = base.T @ w
+            w -= base @ h
+            h2 = base.T @ w
+            w -= base @ h2
+            h += h2
+            h_next = np.linalg.norm(w)
+            H[:j + 1, j] = h
+            H[j + 1, j] = h_next
+            if h_next > 0:
+                w /= h_next
+
+            # Rotazioni di Givens precedenti e nuova rotazione che annulla H[j+1, j]
+            for i in range(j):
+                hi, hk = H[i, j], H[i + 1, j]
+                H[i, j] = cs[i] * hi + sn[i] * hk
+                H[i + 1, j] = -sn[i] * hi + cs[i] * hk
+            denom = np.hypot(H[j, j], H[j + 1, j])
+            if denom == 0.0:
+                break
+            cs[j], sn[j] = H[j, j] / denom, H[j + 1, j] / denom
+            H[j, j], H[j + 1, j] = denom, 0.0
+            g[j + 1] = -sn[j] * g[j]
+            g[j] *= cs[j]
+            j += 1
+            iterazioni += 1
+
+            res_rel = abs(g[j]) / nb
+            if checkpoints is not None and checkpoints.crosses(res_rel):
+                checkpoints.observe(iterazioni, res_rel, x + _correction(V, H, g, j, M), start_time)
+            if recorder is not None and recorder.record(iterazioni, res_rel):
+                interrotto = True
+                break
+            # Convergenza stimata oppure breakdown "felice" (soluzione esatta nello spazio di Krylov)
+            if res_rel < tol or h_next == 0.0:
+                break
+
+        if j == 0:
+            break  # nessun progresso possibile (stagnazione)
+        x += _correction(V, H, g, j, M)
+        # Residuo vero a fine ciclo: punto di partenza del ciclo successivo
+        matvec(x, out=r)
+        np.subtract(b, r, out=r)
+        beta = np.linalg.norm(r)
+        res_rel = beta / nb
+        if recorder is not None:
+            recorder.count(spmv=1, solve=M.solves_per_apply if M is not None else 0, dot=1)
+        if not np.isfinite(res_rel):
+            break
+
+    tempo_calcolo = time.time() - start_time
+    err_relativo = (np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact)
+                    if np.linalg.norm(x_exact) > 0 else np.linalg.norm(x - x_exact))
+    return x, iterazioni, err_relativo, tempo_calcolo, bool(res_rel < tol)
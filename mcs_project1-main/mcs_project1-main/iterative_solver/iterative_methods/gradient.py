@@ -1,88 +1,209 @@
 import numpy as np
 import time
+from functools import partial
 import scipy.sparse as sp
-import scipy.sparse.linalg as spla
+from scipy.linalg import get_blas_funcs
 
-def _is_symmetric(A, atol: float = 1e-12) -> bool:
-    """
-    Ritorna True se A è (numericamente) simmetrica.
-    Supporta dense e sparse.
-    """
-    if sp.issparse(A):
-        # Confronto numerico: differenza sparsa e massimo valore assoluto
-        diff = (A - A.T).tocoo()
-        if diff.nnz == 0:
-            return True
-        return np.max(np.abs(diff.data)) <= atol
-    else:
-        return np.allclose(A, A.T, atol=atol, rtol=0.0)
+from iterative_solver.utils.block_rhs import block_errors, check_block, column_dots, column_norms, is_block
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.mixed_precision import check_precision, mixed_precision_solve, working_dtype
+from iterative_solver.utils.operators import as_linear_operator, check_spd_operator, is_operator
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
 
-def _is_positive_definite(A, atol: float = 0.0) -> bool:
+
+def _gradient_block(matvec, B, X_exact, tol, max_iter, residual_replacement, X0=None):
     """
-    Verifica PD:
-    - dense: prova Cholesky; fallback a eigvalsh minimo
-    - sparse simmetrica: stima l'autovalore minimo con eigsh(k=1, which='SA')
+    Metodo del gradiente su un blocco di termini noti B (n, k): passo alpha per
+    colonna e un solo prodotto A @ R per iterazione per tutto il blocco attivo.
+    Ritorna (X, iterazioni[k], errore_relativo[k], tempo, convergenza[k]).
     """
-    if sp.issparse(A):
-        # Assumi simmetria già verificata a monte
-        try:
-            # Autovalore minimo (algebraic) per matrici simmetriche
-            w_min, _ = spla.eigsh(A, k=1, which='SA')
-            return w_min[0] > atol
-        except Exception:
-            return False
-    else:
-        try:
-            np.linalg.cholesky(A)
-            return True
-        except np.linalg.LinAlgError:
-            try:
-                w = np.linalg.eigvalsh(A)
-                return np.min(w) > atol
-            except Exception:
-                return False
-
-def gradient(A, b, x_exact, tol, max_iter=20000):
+    B, X_exact = check_block(B, X_exact)
+    _, k = B.shape
+    X = initial_guess(X0, B, B.dtype)
+    iterazioni = np.zeros(k, dtype=int)
+    convergenza = np.zeros(k, dtype=bool)
+    nb = column_norms(B)
+
+    X[:, nb == 0] = 0.0
+    convergenza[nb == 0] = True
+    if X0 is not None:
+        # Colonne già risolte dal punto iniziale: nessuna iterazione
+        convergenza |= column_norms(B - matvec(X)) < tol * nb
+    cols = np.flatnonzero(~convergenza)
+    Xa, Ba, nba = np.ascontiguousarray(X[:, cols]), np.ascontiguousarray(B[:, cols]), nb[cols]
+    Ra = Ba - matvec(Xa)
+    rr = column_dots(Ra, Ra)
+    W = np.empty_like(Ra)  # buffer per alpha * R, riusato a ogni iterazione
+    start_time = time.time()
+    it = 0
+
+    while cols.size and it < max_iter:
+        it += 1
+        ARa = matvec(Ra)
+        rAr = column_dots(Ra, ARa)
+        fermo = rAr == 0.0  # Protezione numerica: passo nullo -> colonna interrotta
+        alpha = np.where(fermo, 0.0, rr / np.where(fermo, 1.0, rAr))
+        np.multiply(Ra, alpha, out=W)
+        Xa += W
+
+        residuo_vero = bool(residual_replacement) and it % residual_replacement == 0
+        if residuo_vero:
+            Ra = Ba - matvec(Xa)
+        else:
+            np.multiply(ARa, alpha, out=ARa)
+            Ra -= ARa
+        rr = column_dots(Ra, Ra)
+        res = np.sqrt(rr) / nba
+
+        ok = res <= tol
+        if ok.any() and not residuo_vero:
+            # Verifica sul residuo vero per le colonne candidate alla convergenza
+            Ra[:, ok] = Ba[:, ok] - matvec(Xa[:, ok])
+            rr[ok] = column_dots(Ra[:, ok], Ra[:, ok])
+            res = np.sqrt(rr) / nba
+            ok = res <= tol
+
+        done = ok | fermo | ~np.isfinite(res)
+        if done.any():
+            X[:, cols[done]] = Xa[:, done]
+            iterazioni[cols[done]] = it
+            convergenza[cols[ok]] = True
+            keep = ~done
+            cols, nba, rr = cols[keep], nba[keep], rr[keep]
+            Xa, Ba, Ra = (np.ascontiguousarray(M[:, keep]) for M in (Xa, Ba, Ra))
+            W = np.empty_like(Ra)
+
+    X[:, cols] = Xa
+    iterazioni[cols] = it
+    tempo_calcolo = time.time() - start_time
+    return X, iterazioni, block_errors(X, X_exact), tempo_calcolo, convergenza
+
+def gradient(A, b, x_exact, tol, max_iter=20000, profile=None, checkpoints=None, residual_replacement=50,
+             recorder=None, precision="double", x0=None):
     """
     Metodo del gradiente ottimizzato per matrici sparse (funziona anche su dense).
 
     Controlli eseguiti prima di partire:
       - A deve essere simmetrica
       - A deve essere definita positiva
+
+    I controlli vengono letti dal MatrixProfile di A (parametro profile oppure cache dei profili).
+    Se checkpoints (ToleranceCheckpoints) è fornito viene aggiornato ad ogni iterazione;
+    recorder (IterationRecorder) registra storia del residuo, contatori e chiama la callback.
+
+    Il residuo è aggiornato per ricorrenza (r -= alpha * A r), quindi basta un
+    solo prodotto matrice-vettore per iterazione:
+      - residual_replacement: ogni quante iterazioni sostituire r con il residuo
+        vero b - A x per controllare la deriva (1 = sempre, 0/None = mai).
+        Prima di dichiarare convergenza il residuo viene comunque ricalcolato.
+
+    Se b è un blocco (n, k) le colonne vengono risolte insieme e iterazioni,
+    errori e convergenza sono restituiti come array per colonna.
+
+    A può essere anche un LinearOperator o una funzione matvec (non assemblata):
+    simmetria e positività sono allora stimate su vettori casuali.
+
+    precision: 'double' oppure 'mixed' (correzioni in float32 con raffinamento
+    iterativo in float64, vedi utils.mixed_precision).
+
+    x0: punto iniziale (default: zeri), ad esempio da una SolutionCache (utils.warm_start).
     """
+    setup_start = time.perf_counter()
+    check_precision(precision)
+    if precision == "mixed":
+        interno = partial(gradient, residual_replacement=residual_replacement)
+        return mixed_precision_solve(interno, "gradient", A, b, x_exact, tol, max_iter, profile,
+                                     checkpoints, recorder, setup_start, x0=x0)
+
     # Se è sparse
     if sp.issparse(A) and not (sp.isspmatrix_csr(A) or sp.isspmatrix_csc(A)):
         A = A.tocsr()
 
-    # --- Controlli richiesti ---
-    if not _is_symmetric(A):
-        raise ValueError("Matrix A is not symmetric, Gradient method failed.")
-    if not _is_positive_definite(A):
-        raise ValueError("Matrix A is not positive-definite, Gradient method failed.")
+    if is_operator(A):
+        A = as_linear_operator(A, np.shape(b)[0])
+        check_spd_operator(A, A.shape[0], "Gradient method")
+    else:
+        if profile is None:
+            profile = get_matrix_profile(A)
+
+        # --- Controlli richiesti ---
+        if not profile.is_symmetric:
+            raise ValueError("Matrix A is not symmetric, Gradient method failed.")
+        if not profile.is_positive_definite:
+            raise ValueError(f"Matrix A is not positive-definite ({profile.spd_certificate.evidence}), "
+                             "Gradient method failed.")
+
+    # Prodotto matrice-vettore (eventualmente multithread, vedi utils.spmv)
+    matvec = spmv_kernel(A, profile)
+
+    if is_block(b):
+        if checkpoints is not None or recorder is not None:
+            raise ValueError("Checkpoint e recorder non sono supportati con un blocco di termini noti.")
+        return _gradient_block(matvec, b, x_exact, tol, max_iter, residual_replacement, x0)
 
     # --- Algoritmo ---
-    x = np.zeros_like(b)
-    r = b - A @ x  # residuo iniziale
+    x = initial_guess(x0, b, working_dtype(A, b))
+    r = b - matvec(x)  # residuo iniziale
+    Ar = np.empty_like(r)
 
     nb = np.linalg.norm(b)
     # Gestione caso ||b|| = 0 per evitare divisione per zero nella condizione di arresto
     if nb == 0.0:
+        x.fill(0.0)
         return x, 0, (np.linalg.norm(x_exact - x) / np.linalg.norm(x_exact) if np.linalg.norm(x_exact) > 0 else 0.0), 0.0, True
 
+    # Aggiornamenti in place x += alpha*r, r -= alpha*Ar sui buffer preallocati
+    axpy = get_blas_funcs("axpy", (x, r))
+
+    if recorder is not None:
+        # Ogni iterazione: A r (nel buffer Ar), r·Ar e r·r
+        recorder.begin("gradient", max_iter, setup_start, spmv=1, dot=2)
+        recorder.count(spmv=1, dot=2, alloc=4)  # residuo iniziale, norma di b, x, Ar
+
     start_time = time.time()
     iterazioni = 0
+    rr = float(np.dot(r, r))
+    res_rel = np.sqrt(rr) / nb
+    if checkpoints is not None:
+        checkpoints.observe(0, res_rel, x, start_time)
+    if recorder is not None:
+        recorder.record(0, res_rel)
 
-    while np.linalg.norm(r) / nb > tol and iterazioni < max_iter:
+    while res_rel > tol and iterazioni < max_iter:
         iterazioni += 1
-        Ar = A @ r
-        rr = float(np.dot(r, r))
+        matvec(r, out=Ar)
         rAr = float(np.dot(r, Ar))
         if rAr == 0.0:
             # Protezione numerica: passo nullo -> interrompo
             break
         alpha = rr / rAr
-        x = x + alpha * r
-        r = b - A @ x
+        axpy(r, x, a=alpha)
+
+        residuo_vero = bool(residual_replacement) and iterazioni % residual_replacement == 0
+        if residuo_vero:
+            matvec(x, out=r)
+            np.subtract(b, r, out=r)
+            if recorder is not None:
+                recorder.count(spmv=1)
+        else:
+            axpy(Ar, r, a=-alpha)
+        rr = float(np.dot(r, r))
+        res_rel = np.sqrt(rr) / nb
+
+        # Il residuo per ricorrenza può derivare: la convergenza si verifica su quello vero
+        if res_rel <= tol and not residuo_vero:
+            matvec(x, out=r)
+            np.subtract(b, r, out=r)
+            rr = float(np.dot(r, r))
+            res_rel = np.sqrt(rr) / nb
+            if recorder is not None:
+                recorder.count(spmv=1, dot=1)
+
+        if checkpoints is not None:
+            checkpoints.observe(iterazioni, res_rel, x, start_time)
+        if recorder is not None and recorder.record(iterazioni, res_rel):
+            break
 
     tempo_calcolo = time.time() - start_time
     # Errore relativo rispetto a x_exact (se ha norma > 0)
@@ -92,6 +213,6 @@ def gradient(A, b, x_exact, tol, max_iter=20000):
     else:
         errore_relativo = np.linalg.norm(x - x_exact)
 
-    convergenza = (np.linalg.norm(r) / nb <= tol) and (iterazioni <= max_iter)
+    convergenza = (res_rel <= tol) and (iterazioni <= max_iter)
 
     return x, iterazioni, errore_relativo, tempo_calcolo, convergenza
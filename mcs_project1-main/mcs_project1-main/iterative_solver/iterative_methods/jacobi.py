@@ -2,13 +2,103 @@ import numpy as np
 import scipy.sparse as sp
 import time
 import warnings
+from functools import partial
+from scipy.linalg import get_blas_funcs
+
+from iterative_solver.utils.block_rhs import block_errors, check_block, column_norms, is_block
+from iterative_solver.utils.matrix_profile import _jacobi_spectrum, get_matrix_profile
+from iterative_solver.utils.mixed_precision import check_precision, mixed_precision_solve, working_dtype
+from iterative_solver.utils.operators import (
+    SYMMETRY_PROBE_RTOL,
+    as_linear_operator,
+    is_operator,
+    probe_symmetry_defect,
+)
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
+
+
+def _jacobi_block(matvec, B, X_true, tol, max_iter, D_inv, omega, chebyshev_params, X0=None):
+    """
+    Jacobi su un blocco di termini noti B (n, k): un solo prodotto A @ X per iterazione.
+    Le colonne che convergono (o divergono) escono dal blocco attivo e non vengono più aggiornate.
+    Ritorna (X, iterazioni[k], errore_relativo[k], tempo, convergenza[k]).
+    """
+    B, X_true = check_block(B, X_true)
+    _, k = B.shape
+    X = initial_guess(X0, B, B.dtype)
+    iterazioni = np.full(k, max_iter, dtype=int)
+    convergenza = np.zeros(k, dtype=bool)
+    nb = column_norms(B)
+
+    # Colonne con b = 0: x = 0 è già soluzione
+    X[:, nb == 0] = 0.0
+    convergenza[nb == 0] = True
+    iterazioni[nb == 0] = 0
+    cols = np.flatnonzero(nb > 0)
+    # Blocco attivo compatto (C-contiguo) per il prodotto sparso-denso A @ Xa
+    Xa, Ba, nba = np.ascontiguousarray(X[:, cols]), np.ascontiguousarray(B[:, cols]), nb[cols]
+    R, Z, Da = np.empty_like(Xa), np.empty_like(Xa), np.zeros_like(Xa)
+    D_inv = D_inv[:, None]
+    start_time = time.time()
+
+    for it in range(max_iter + 1):
+        if cols.size == 0:
+            break
+        matvec(Xa, out=R)
+        np.subtract(Ba, R, out=R)
+        res = column_norms(R) / nba
+
+        finite = np.isfinite(res)
+        ok = res < tol
+        done = ok | ~finite
+        if done.any():
+            X[:, cols[done]] = Xa[:, done]
+            iterazioni[cols[done]] = it
+            convergenza[cols[ok]] = True
+            keep = ~done
+            cols, nba = cols[keep], nba[keep]
+            Xa, Ba, R, Da = (np.ascontiguousarray(M[:, keep]) for M in (Xa, Ba, R, Da))
+            Z = np.empty_like(Xa)
+            if cols.size == 0:
+                break
+        if it == max_iter:
+            break
+
+        np.multiply(D_inv, R, out=Z)
+        if chebyshev_params is not None:
+            theta, delta, sigma, rho = chebyshev_params
+            if it == 0:
+                np.multiply(Z, 1.0 / theta, out=Da)
+            else:
+                rho_new = 1.0 / (2.0 * sigma - rho)
+                Da *= rho_new * rho
+                Z *= 2.0 * rho_new / delta
+                Da += Z
+                chebyshev_params = (theta, delta, sigma, rho_new)
+            Xa += Da
+        else:
+            Z *= omega
+            Xa += Z
+
+    X[:, cols] = Xa
+    tempo = time.time() - start_time
+    return X, iterazioni, block_errors(X, X_true), tempo, convergenza
 
 def jacobi(
     A, b, x_true, tol, max_iter=20000,
     check_matrix=True,
     require_diagonal_dominance=False,
     check_symmetry=False,
-    symmetry_tol=1e-12
+    symmetry_tol=1e-12,
+    profile=None,
+    checkpoints=None,
+    omega=1.0,
+    chebyshev=False,
+    recorder=None,
+    diag=None,
+    precision="double",
+    x0=None
 ):
     """
     Jacobi per sistemi sparsi con controlli di matrice.
@@ -19,98 +109,194 @@ def jacobi(
       diagonalmente dominante per righe. Se False, emette solo un warning.
     - check_symmetry: se True, verifica (blandamente) A ≈ A^T (utile come diagnosi).
     - symmetry_tol: tolleranza per il check di simmetria.
+    - profile: MatrixProfile di A (se None viene preso dalla cache dei profili).
+    - checkpoints: ToleranceCheckpoints opzionale, aggiornato ad ogni iterazione.
+    - omega: peso del Jacobi smorzato x += omega * D^-1 r (1.0 = Jacobi classico,
+      'auto' = 2 / (lambda_min + lambda_max) dallo spettro stimato di D^-1 A).
+    - chebyshev: se True usa l'accelerazione di Chebyshev con gli estremi dello
+      spettro di D^-1 A stimati una volta per matrice (richiede A SPD).
+    - recorder: IterationRecorder opzionale (storia del residuo, contatori, callback).
+    - diag: diagonale di A esplicita. Obbligatoria se A è un LinearOperator o una
+      funzione matvec (A non assemblata) senza metodo diagonal(): in tal caso i controlli
+      di dominanza diagonale sono saltati e la simmetria è stimata con vettori casuali.
+    - precision: 'double' oppure 'mixed' (correzioni in float32 con raffinamento
+      iterativo in float64, vedi utils.mixed_precision).
+    - x0: punto iniziale (default: zeri), ad esempio da una SolutionCache (utils.warm_start).
+
+    Se b è un blocco (n, k) tutte le colonne vengono risolte insieme (un prodotto
+    A @ X per iterazione) e iterazioni, errori e convergenza sono array per colonna.
+
+    Ogni iterazione richiede un solo prodotto matrice-vettore: il residuo
+    r_k = b - A x_k = D (x_{k+1} - x_k) / omega serve sia per il test d'arresto
+    sia per l'aggiornamento, e tutti i vettori di lavoro sono riusati.
     """
+    setup_start = time.perf_counter()
+    check_precision(precision)
+    if precision == "mixed":
+        interno = partial(jacobi, check_matrix=check_matrix, require_diagonal_dominance=require_diagonal_dominance,
+                          omega=omega, chebyshev=chebyshev)
+        return mixed_precision_solve(interno, "jacobi", A, b, x_true, tol, max_iter, profile,
+                                     checkpoints, recorder, setup_start, x0=x0)
+
+    operatore = is_operator(A)
+    if operatore:
+        A = as_linear_operator(A, np.shape(b)[0])
+        if diag is None and hasattr(A, "diagonal"):
+            # Operatori che conoscono la propria diagonale (es. MemmapCSR, utils.out_of_core)
+            diag = A.diagonal()
+        if diag is None:
+            raise ValueError("Con un operatore non assemblato Jacobi richiede la diagonale esplicita (diag=...).")
+    if diag is not None:
+        diag = np.asarray(diag, dtype=np.float64)
+
     if check_matrix:
         # Tipo e forma
-        if not sp.isspmatrix(A):
-            raise TypeError("A deve essere una matrice sparsa SciPy (scipy.sparse.spmatrix).")
+        if not (operatore or sp.isspmatrix(A)):
+            raise TypeError("A deve essere una matrice sparsa SciPy (scipy.sparse.spmatrix), "
+                            "un LinearOperator o una funzione matvec.")
         n, m = A.shape
         if n != m:
             raise ValueError(f"A deve essere quadrata; trovata {A.shape}.")
-        b = np.asarray(b).reshape(-1)
-        if b.size != n:
-            raise ValueError(f"Dimensioni incoerenti: len(b)={b.size} ma A è {A.shape}.")
+        b = np.asarray(b)
+        if not is_block(b):
+            b = b.reshape(-1)
+        if b.shape[0] != n:
+            raise ValueError(f"Dimensioni incoerenti: len(b)={b.shape[0]} ma A è {A.shape}.")
+
+    if check_matrix and operatore:
+        zero_rows = np.where(diag == 0)[0]
+        if zero_rows.size:
+            raise ValueError(f"Elementi nulli sulla diagonale di A ai/alle riga/e {zero_rows[:5]}. "
+                             "Jacobi richiede D invertibile.")
+        if check_symmetry:
+            difetto = probe_symmetry_defect(A, n)
+            if difetto > SYMMETRY_PROBE_RTOL:
+                warnings.warn(f"L'operatore A non risulta simmetrico: difetto relativo stimato ≈ {difetto:.2e}",
+                              stacklevel=2)
+    elif check_matrix:
+        if profile is None:
+            profile = get_matrix_profile(A)
 
         # Diagonale non nulla
-        D = A.diagonal()
-        if np.any(D == 0):
+        if profile.has_zero_diagonal:
             # Evita divisioni per zero in Jacobi
-            idx0 = np.where(D == 0)[0][:5]  # mostra fino a 5 indici per diagnostica
+            idx0 = profile.zero_diagonal_rows[:5]  # mostra fino a 5 indici per diagnostica
             raise ValueError(f"Elementi nulli sulla diagonale di A ai/alle riga/e {idx0}. "
                              "Jacobi richiede D invertibile.")
 
         # check simmetria
         if check_symmetry:
-            # Usa differenza sparsa senza densificare
-            diff = (A - A.T).tocoo()
-            max_abs = 0.0
-            if diff.nnz > 0:
-                max_abs = np.max(np.abs(diff.data))
+            max_abs = profile.symmetry_defect
             if max_abs > symmetry_tol:
-                warnings.warn(f"A non risulta simmetrica: ||A - A.T||_max ≈ {max_abs:.2e} > {symmetry_tol:.2e}")
+                warnings.warn(f"A non risulta simmetrica: ||A - A.T||_max ≈ {max_abs:.2e} > {symmetry_tol:.2e}",
+                              stacklevel=2)
 
         # Dominanza diagonale
-        absA = abs(A).tocsr()
-        row_sums = np.array(absA.sum(axis=1)).ravel()
-        offdiag = row_sums - np.abs(D)
-        weak_dd = np.all(np.abs(D) >= offdiag - 1e-15)
-        strict_some = np.any(np.abs(D) > offdiag + 1e-15)
-
-        if not weak_dd:
+        if not profile.is_diagonally_dominant:
             msg = ("La matrice A non è (nemmeno) diagonalmente dominante per righe. "
                    "Jacobi potrebbe non convergere.")
             if require_diagonal_dominance:
                 raise ValueError(msg)
             else:
-                warnings.warn(msg)
-        elif not strict_some:
+                warnings.warn(msg, stacklevel=2)
+        elif not profile.has_strictly_dominant_row:
             # Caso limite: solo uguaglianze; potrebbe rallentare la convergenza.
-            warnings.warn("A è solo debolmente dominante (nessuna riga strettamente dominante).")
+            warnings.warn("A è solo debolmente dominante (nessuna riga strettamente dominante).", stacklevel=2)
+
+    # --- Implementazione Jacobi
+    if profile is None and not operatore:
+        profile = get_matrix_profile(A)
+
+    x = initial_guess(x0, b, working_dtype(A, b))
+    if diag is None:
+        D_inv = profile.inv_diag.astype(x.dtype, copy=False)
+    else:
+        D_inv = np.zeros_like(diag)
+        np.divide(1.0, diag, out=D_inv, where=diag != 0)
 
-    # --- Implementazione Jacobi invariata
-    x = np.zeros_like(b, dtype=float)
-    D = A.diagonal().astype(float)
-    D_inv = 1.0 / D
+    if chebyshev or omega == "auto":
+        if diag is None:
+            lmin, lmax = profile.jacobi_spectrum
+        else:
+            # Diagonale fornita (o operatore): stima dello spettro senza cache del profilo
+            if np.any(diag <= 0) or probe_symmetry_defect(A, A.shape[0]) > SYMMETRY_PROBE_RTOL:
+                raise ValueError("La stima dello spettro di D^-1 A richiede A simmetrica con diagonale positiva.")
+            lmin, lmax = _jacobi_spectrum(A, diag)
+        if lmin <= 0:
+            raise ValueError("Lo spettro stimato di D^-1 A non è positivo: Jacobi-Chebyshev richiede A SPD.")
+        if omega == "auto":
+            omega = 2.0 / (lmin + lmax)
+        # Parametri della ricorrenza di Chebyshev sull'intervallo [lmin, lmax]
+        theta = 0.5 * (lmax + lmin)
+        delta = 0.5 * (lmax - lmin)
+        sigma = theta / delta
+        rho = 1.0 / sigma
 
-    # Prepara N = -A con diagonale azzerata (efficiente su sparsa)
-    A_nodiag = A.tolil(copy=True)
-    A_nodiag.setdiag(0)
-    N = (-A_nodiag).tocsr()
+    # Prodotto matrice-vettore (eventualmente multithread, vedi utils.spmv)
+    matvec = spmv_kernel(A, profile)
+
+    if is_block(b):
+        if checkpoints is not None or recorder is not None:
+            raise ValueError("Checkpoint e recorder non sono supportati con un blocco di termini noti.")
+        cheb = (theta, delta, sigma, rho) if chebyshev else None
+        return _jacobi_block(matvec, b, x_true, tol, max_iter, D_inv, omega, cheb, x0)
+
+    # Buffer di lavoro riusati ad ogni iterazione
+    r = np.empty_like(x)
+    z = np.empty_like(x)
+    d = np.zeros_like(x)
+    axpy = get_blas_funcs("axpy", (x, z))
 
     norm_b = np.linalg.norm(b)
+    if recorder is not None:
+        # Ogni iterazione: A @ x (scritto nel buffer del residuo) e norma del residuo
+        recorder.begin("jacobi", max_iter, setup_start, spmv=1, dot=1)
+        recorder.count(spmv=1, dot=2, alloc=5)  # residuo iniziale, norma di b, x e buffer di lavoro
     start_time = time.time()
 
-    # Early exit se il residuo iniziale è già sotto soglia
-    residuo0 = A @ x - b
     if norm_b == 0:
         # sistema omogeneo b=0: x=0 è soluzione
-        tempo = time.time() - start_time
-        err_rel = (np.linalg.norm(x - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
-        return x, 0, err_rel, tempo, True
-    if np.linalg.norm(residuo0) / norm_b < tol:
+        x.fill(0.0)
         tempo = time.time() - start_time
         err_rel = (np.linalg.norm(x - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
         return x, 0, err_rel, tempo, True
 
-    for k in range(max_iter):
-        Nx = N.dot(x)
-        x_new = D_inv * (Nx + b)
+    # k = numero di aggiornamenti già applicati a x; il residuo di x_k decide l'arresto
+    for k in range(max_iter + 1):
+        matvec(x, out=r)
+        np.subtract(b, r, out=r)
+        err_rel_residuo = np.linalg.norm(r) / norm_b
 
-        residuo = A @ x_new - b
-        err_rel_residuo = np.linalg.norm(residuo) / norm_b
+        if checkpoints is not None:
+            checkpoints.observe(k, err_rel_residuo, x, start_time)
+        interrotto = recorder is not None and recorder.record(k, err_rel_residuo)
 
         if err_rel_residuo < tol:
             tempo = time.time() - start_time
-            err_rel = (np.linalg.norm(x_new - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
-            return x_new, k + 1, err_rel, tempo, True
+            err_rel = (np.linalg.norm(x - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
+            return x, k, err_rel, tempo, True
 
-        # fallback numerico: interrompi se diverge o produce NaN/inf
-        if not np.isfinite(err_rel_residuo):
+        # fallback numerico: interrompi se diverge o produce NaN/inf (o su richiesta della callback)
+        if interrotto or not np.isfinite(err_rel_residuo):
             tempo = time.time() - start_time
-            err_rel = (np.linalg.norm(x_new - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
-            return x_new, k + 1, err_rel, tempo, False
+            err_rel = (np.linalg.norm(x - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
+            return x, k, err_rel, tempo, False
+
+        if k == max_iter:
+            break
 
-        x = x_new
+        np.multiply(D_inv, r, out=z)
+        if chebyshev:
+            if k == 0:
+                np.multiply(z, 1.0 / theta, out=d)
+            else:
+                rho_new = 1.0 / (2.0 * sigma - rho)
+                d *= rho_new * rho
+                axpy(z, d, a=2.0 * rho_new / delta)
+                rho = rho_new
+            x += d
+        else:
+            axpy(z, x, a=omega)
 
     tempo = time.time() - start_time
     err_rel = (np.linalg.norm(x - x_true) / np.linalg.norm(x_true)) if x_true is not None and np.linalg.norm(x_true) != 0 else None
@@ -0,0 +1,254 @@
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from iterative_solver.utils.matrix_profile import MatrixProfile
+from iterative_solver.utils.spmv import spmv_kernel
+
+# Smoother ammessi per i V-cicli
+SMOOTHERS = ("gauss_seidel", "jacobi")
+
+# Parametri della gerarchia
+MAX_LEVELS = 10
+# Sotto questa dimensione il livello più grossolano è risolto con una fattorizzazione LU
+MAX_COARSE = 100
+# Soglia di forte accoppiamento sul livello fine (dimezzata ad ogni livello, Vaněk-Mandel-Brezina)
+STRENGTH_THETA = 0.08
+
+
+def strength_of_connection(A, diag, theta: float):
+    """
+    Grafo dei forti accoppiamenti: i e j sono forti se |a_ij| >= theta * sqrt(|a_ii a_jj|).
+    Il grafo è reso simmetrico (anche per A non simmetrica) e non contiene la diagonale.
+    """
+    C = A.tocoo()
+    scala = np.sqrt(np.abs(diag))
+    forte = (C.row != C.col) & (np.abs(C.data) >= theta * scala[C.row] * scala[C.col])
+    S = sp.csr_matrix((np.ones(np.count_nonzero(forte)), (C.row[forte], C.col[forte])), shape=A.shape)
+    S = (S + S.T).tocsr()
+    S.sort_indices()
+    return S
+
+
+def aggregate(S) -> np.ndarray:
+    """
+    Aggregazione standard in tre passate sul grafo S.
+    1. ogni nodo con l'intorno ancora libero forma un aggregato con i suoi vicini;
+    2. i nodi rimasti si uniscono a un aggregato vicino della prima passata;
+    3. i nodi ancora liberi formano nuovi aggregati con i loro vicini liberi.
+    I nodi isolati (senza forti accoppiamenti, es. righe di Dirichlet) non vengono
+    aggregati: lo smoother li risolve già e non servono sui livelli grossolani.
+    Ritorna l'aggregato di ogni nodo (0 .. n_aggregati - 1, -1 per i nodi isolati).
+    """
+    n = S.shape[0]
+    indptr, indices = S.indptr, S.indices
+    isolati = np.diff(indptr) == 0
+    aggregati = np.full(n, -1, dtype=np.int64)
+    n_agg = 0
+
+    for i in range(n):
+        if aggregati[i] >= 0 or isolati[i]:
+            continue
+        vicini = indices[indptr[i]:indptr[i + 1]]
+        if np.all(aggregati[vicini] < 0):
+            aggregati[vicini] = n_agg
+            aggregati[i] = n_agg
+            n_agg += 1
+
+    prima_passata = aggregati.copy()
+    for i in np.flatnonzero((aggregati < 0) & ~isolati):
+        vicini = prima_passata[indices[indptr[i]:indptr[i + 1]]]
+        vicini = vicini[vicini >= 0]
+        if vicini.size:
+            aggregati[i] = vicini[0]
+
+    for i in np.flatnonzero((aggregati < 0) & ~isolati):
+        if aggregati[i] >= 0:
+            continue
+        vicini = indices[indptr[i]:indptr[i + 1]]
+        liberi = vicini[aggregati[vicini] < 0]
+        aggregati[liberi] = n_agg
+        aggregati[i] = n_agg
+        n_agg += 1
+    return aggregati
+
+
+def _jacobi_radius(profile) -> float:
+    """Stima (per eccesso) di rho(D^{-1} A): Lanczos se A è simmetrica con diagonale positiva, altrimenti Gershgorin."""
+    if profile.is_symmetric and np.all(profile.diag > 0):
+        try:
+            return float(profile.jacobi_spectrum[1])
+        except spla.ArpackError:
+            pass
+    return float(np.max(np.abs(profile.inv_diag) * np.asarray(abs(profile.A).sum(axis=1)).ravel()))
+
+
+class _Level:
+    """Un livello della gerarchia: matrice, profilo (splitting e sweep), prolungamento verso il livello più fine."""
+
+    def __init__(self, profile, smoother: str):
+        self.profile = profile
+        self.A = profile.A
+        self.n = profile.n
+        self.nnz = profile.nnz
+        self.matvec = spmv_kernel(self.A, profile)
+        self.P = None
+        self.R = None
+        if smoother == "jacobi":
+            # Jacobi pesato con omega = 4 / (3 rho(D^{-1} A)) (smoother di Jacobi dell'aggregazione levigata)
+            self.omega = 4.0 / (3.0 * _jacobi_radius(profile))
+            self.weights = (self.omega * profile.inv_diag).astype(self.A.dtype, copy=False)
+        else:
+            self.engine = profile.sweep_engine
+
+
+class AMGHierarchy:
+    """
+    Gerarchia del multigrid algebrico ad aggregazione levigata (smoothed aggregation).
+
+    Per ogni livello: grafo dei forti accoppiamenti, aggregazione, prolungamento
+    tentativo costante sugli aggregati (vettore quasi-nullo = costanti) levigato
+    con un passo di Jacobi pesato P = (I - omega D^{-1} A) T, restrizione R = P^T e
+    operatore grossolano di Galerkin A_c = R A P. Il livello più grossolano è fattorizzato (LU).
+
+    Gli smoother sono quelli del pacchetto: gli sweep del SweepEngine di Gauss-Seidel
+    (forward prima della correzione, backward dopo: V-ciclo simmetrico, utilizzabile come
+    precondizionatore del gradiente coniugato) oppure Jacobi pesato con il kernel SpMV.
+    Il tempo di costruzione (setup_time) e il tempo medio di un V-ciclo sono tenuti separati.
+    """
+
+    def __init__(self, profile, smoother: str = "gauss_seidel", presmooth: int = 1, postsmooth: int = 1,
+                 max_levels: int = MAX_LEVELS, max_coarse: int = MAX_COARSE, theta: float = STRENGTH_THETA):
+        """
+        Parametri:
+        - profile: MatrixProfile della matrice (livello fine)
+        - smoother: 'gauss_seidel' oppure 'jacobi'
+        - presmooth, postsmooth: sweep dello smoother prima e dopo la correzione grossolana
+        - max_levels, max_coarse: limiti sul numero di livelli e sulla dimensione del livello grossolano
+        - theta: soglia di forte accoppiamento sul livello fine
+        """
+        if smoother not in SMOOTHERS:
+            raise ValueError(f"Smoother sconosciuto: {smoother!r}. Valori ammessi: {SMOOTHERS}.")
+        if profile.has_zero_diagonal:
+            raise ValueError("Multigrid algebrico: la diagonale di A contiene zeri.")
+        start_time = time.time()
+        self.smoother = smoother
+        self.presmooth = presmooth
+        self.postsmooth = postsmooth
+        self.levels = [_Level(profile, smoother)]
+
+        while len(self.levels) < max_levels and self.levels[-1].n > max_coarse:
+            fine = self.levels[-1]
+            soglia = theta * 0.5 ** (len(self.levels) - 1)
+            aggregati = aggregate(strength_of_connection(fine.A, fine.profile.diag, soglia))
+            n_c = int(aggregati.max()) + 1
+            if n_c == 0 or n_c >= fine.n:
+                break  # nessuna riduzione: inutile proseguire
+            # Prolungamento tentativo: costanti sugli aggregati (righe nulle per i nodi isolati),
+            # colonne normalizzate
+            nodi = np.flatnonzero(aggregati >= 0)
+            T = sp.csr_matrix((np.ones(nodi.size), (nodi, aggregati[nodi])), shape=(fine.n, n_c))
+            T = T @ sp.diags(1.0 / np.sqrt(np.bincount(aggregati[nodi], minlength=n_c)))
+            omega = 4.0 / (3.0 * _jacobi_radius(fine.profile))
+            P = (T - sp.diags(omega * fine.profile.inv_diag) @ (fine.A @ T)).tocsr().astype(fine.A.dtype)
+            fine.P, fine.R = P, P.T.tocsr()
+            A_c = (fine.R @ fine.A @ P).tocsr()
+            A_c.sum_duplicates()
+            # Profilo dedicato (non nella cache globale: i livelli appartengono alla gerarchia)
+            self.levels.append(_Level(MatrixProfile(A_c), smoother))
+
+        self._coarse_solve = spla.splu(self.levels[-1].A.tocsc()).solve
+        self.setup_time = time.time() - start_time
+        # V-cicli eseguiti e tempo complessivo (costo medio di un ciclo)
+        self.cycles = 0
+        self.cycle_time = 0.0
+
+    @property
+    def n_levels(self) -> int:
+        return len(self.levels)
+
+    @property
+    def operator_complexity(self) -> float:
+        """Somma degli nnz di tutti i livelli rispetto a quelli della matrice fine."""
+        return sum(lv.nnz for lv in self.levels) / self.levels[0].nnz
+
+    @property
+    def grid_complexity(self) -> float:
+        return sum(lv.n for lv in self.levels) / self.levels[0].n
+
+    @property
+    def mean_cycle_time(self):
+        return self.cycle_time / self.cycles if self.cycles else None
+
+    @property
+    def solves_per_cycle(self) -> int:
+        """Risoluzioni (triangolari e grossolana) in un V-ciclo, per IterationRecorder."""
+        sweep = self.presmooth + self.postsmooth if self.smoother == "gauss_seidel" else 0
+        return sweep * (self.n_levels - 1) + 1
+
+    @property
+    def spmv_per_cycle(self) -> int:
+        """Prodotti (A, P, R, parti triangolari) in un V-ciclo, per IterationRecorder."""
+        if self.smoother == "gauss_seidel":
+            # Un prodotto per sweep più quello iniziale di ogni sequenza di sweep
+            per_livello = self.presmooth + self.postsmooth + 2
+        else:
+            per_livello = self.presmooth + self.postsmooth + 1
+        return (per_livello + 2) * (self.n_levels - 1)
+
+    def _smooth(self, level: _Level, b, x, nu: int, variant: str):
+        """nu sweep dello smoother su A x = b (x in place); ritorna il residuo se disponibile, altrimenti None."""
+        if nu == 0:
+            return None
+        if self.smoother == "gauss_seidel":
+            run = level.engine.start(b, x, variant=variant)
+            for _ in range(nu):
+                r = run.sweep()
+            return r
+        pesi = level.weights if x.ndim == 1 else level.weights[:, None]
+        for _ in range(nu):
+            x += pesi * (b - level.matvec(x))
+        return None
+
+    def _vcycle(self, i: int, b, x):
+        level = self.levels[i]
+        if i == len(self.levels) - 1:
+            x[:] = self._coarse_solve(b)
+            return None
+        r = self._smooth(level, b, x, self.presmooth, "forward")
+        if r is None:
+            r = b - level.matvec(x)
+        b_c = level.R @ r
+        x_c = np.zeros_like(b_c)
+        self._vcycle(i + 1, b_c, x_c)
+        x += level.P @ x_c
+        return self._smooth(level, b, x, self.postsmooth, "backward")
+
+    def cycle(self, b, x):
+        """
+        Un V-ciclo su A x = b a partire da x (aggiornata in place).
+        Ritorna il residuo b - A x se lo smoother lo fornisce (Gauss-Seidel), altrimenti None.
+        """
+        start_time = time.perf_counter()
+        r = self._vcycle(0, b, x)
+        self.cycle_time += time.perf_counter() - start_time
+        self.cycles += 1
+        return r
+
+    def precondition(self, r):
+        """z ≈ A^{-1} r con un V-ciclo da z = 0 (vettore o blocco (n, k))."""
+        z = np.zeros_like(r)
+        self.cycle(r, z)
+        return z
+
+    def report(self) -> str:
+        righe = [f"Multigrid algebrico (smoother {self.smoother}): {self.n_levels} livelli, "
+                 f"complessità di operatore {self.operator_complexity:.2f}, di griglia {self.grid_complexity:.2f}"]
+        for i, lv in enumerate(self.levels):
+            righe.append(f"- livello {i}: n = {lv.n}, nnz = {lv.nnz}")
+        righe.append(f"- tempo di setup: {self.setup_time:.4f} s")
+        if self.cycles:
+            righe.append(f"- tempo medio di un V-ciclo: {self.mean_cycle_time:.6f} s ({self.cycles} cicli)")
+        return "\n".join(righe)
@@ -0,0 +1,238 @@
+import time
+from functools import partial
+
+import numpy as np
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.multigrid import AMGHierarchy
+from iterative_solver.iterative_methods.sweep_engine import triangular_solver
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.operators import is_operator
+
+
+def _scale_rows(d, v):
+    """d * v riga per riga, sia per un vettore sia per un blocco (n, k)."""
+    return d * v if v.ndim == 1 else d[:, None] * v
+
+
+class Preconditioner:
+    """
+    Precondizionatore M per metodi di tipo Krylov: apply(r) restituisce z ≈ M^{-1} r.
+
+    La fattorizzazione viene eseguita una sola volta nel costruttore e il suo
+    costo è disponibile in setup_time, separato dal tempo delle iterazioni.
+    """
+
+    name = "custom"
+    # Risoluzioni triangolari per ogni applicazione (contatori di IterationRecorder)
+    solves_per_apply = 0
+
+    def __init__(self, A, profile=None):
+        if profile is None:
+            profile = get_matrix_profile(A)
+        start_time = time.time()
+        self._setup(profile)
+        self.setup_time = time.time() - start_time
+
+    def _setup(self, profile):
+        raise NotImplementedError
+
+    def apply(self, r):
+        raise NotImplementedError
+
+    def __call__(self, r):
+        return self.apply(r)
+
+
+class JacobiPreconditioner(Preconditioner):
+    """M = D (diagonale di A)."""
+
+    name = "jacobi"
+
+    def _setup(self, profile):
+        if profile.has_zero_diagonal:
+            raise ValueError("Precondizionatore di Jacobi: la diagonale di A contiene zeri.")
+        # Nel tipo di A (float32 per le correzioni della precisione mista)
+        self.inv_diag = profile.inv_diag.astype(np.result_type(profile.A.dtype, np.float32), copy=False)
+
+    def apply(self, r):
+        return _scale_rows(self.inv_diag, r)
+
+
+class SSORPreconditioner(Preconditioner):
+    """
+    M = omega/(2-omega) (D/omega + L) (D/omega)^{-1} (D/omega + U).
+    Riusa le fattorizzazioni triangolari (rilassate) del motore di Gauss-Seidel.
+    """
+
+    name = "ssor"
+    solves_per_apply = 2
+
+    def __init__(self, A, profile=None, omega: float = 1.0):
+        if not 0.0 < omega < 2.0:
+            raise ValueError(f"SSOR richiede 0 < omega < 2; trovato omega={omega}.")
+        self.omega = omega
+        super().__init__(A, profile)
+
+    def _setup(self, profile):
+        if profile.has_zero_diagonal:
+            raise ValueError("Precondizionatore SSOR: la diagonale di A contiene zeri.")
+        d_omega = profile.diag / self.omega
+        self._d_omega = d_omega
+        self._scale = (2.0 - self.omega) / self.omega
+        engine = profile.sweep_engine
+        self._solve_lower = partial(engine.solve_lower, omega=self.omega)
+        self._solve_upper = partial(engine.solve_upper, omega=self.omega)
+
+    def apply(self, r):
+        y = _scale_rows(self._d_omega, self._solve_lower(r))
+        z = self._solve_upper(y)
+        z *= self._scale
+        return z
+
+
+def _ic0(A_lower, n):
+    """
+    Fattorizzazione di Cholesky incompleta IC(0) sul pattern di tril(A).
+    Ritorna i dati della L (stesso pattern CSR di A_lower) oppure None se un pivot è <= 0.
+    """
+    indptr, indices = A_lower.indptr, A_lower.indices
+    data = A_lower.data.astype(np.float64, copy=True)
+    diag_pos = indptr[1:] - 1  # righe ordinate: la diagonale è l'ultimo elemento
+    w = np.zeros(n)
+
+    for i in range(n):
+        start, end = indptr[i], indptr[i + 1]
+        cols = indices[start:end]
+        w[cols] = data[start:end]
+        for p in range(start, end - 1):
+            k = indices[p]
+            k_start, k_diag = indptr[k], diag_pos[k]
+            # L_ik = (a_ik - sum_{j<k} L_ij L_kj) / L_kk, con L_ij = 0 fuori dal pattern
+            s = w[k] - np.dot(data[k_start:k_diag], w[indices[k_start:k_diag]])
+            w[k] = s / data[k_diag]
+        pivot = w[i] - np.dot(w[cols[:-1]], w[cols[:-1]])
+        if pivot <= 0.0:
+            return None
+        w[i] = np.sqrt(pivot)
+        data[start:end] = w[cols]
+        w[cols] = 0.0
+    return data
+
+
+class IncompleteCholeskyPreconditioner(Preconditioner):
+    """
+    M = L L^T con L fattore di Cholesky incompleto IC(0) (nessun fill-in).
+    Se la fattorizzazione incontra un pivot non positivo viene ripetuta su
+    A + shift * diag(A), raddoppiando lo shift a ogni tentativo.
+    """
+
+    name = "ic0"
+    solves_per_apply = 2
+
+    def __init__(self, A, profile=None, max_shifts: int = 10):
+        self.max_shifts = max_shifts
+        self.shift = 0.0
+        super().__init__(A, profile)
+
+    def _setup(self, profile):
+        if not profile.is_symmetric:
+            raise ValueError("IC(0) richiede una matrice simmetrica.")
+        if np.any(profile.diag <= 0):
+            raise ValueError("IC(0) richiede una diagonale positiva.")
+        n = profile.n
+        lower = (profile.L + sp.diags(profile.diag)).tocsr()
+        lower.sort_indices()
+
+        data = _ic0(lower, n)
+        shift = 1e-3
+        tentativi = 0
+        while data is None:
+            if tentativi >= self.max_shifts:
+                raise ValueError("IC(0) non riuscita anche con shift diagonale.")
+            shifted = (profile.L + sp.diags(profile.diag * (1.0 + shift))).tocsr()
+            shifted.sort_indices()
+            data = _ic0(shifted, n)
+            self.shift = shift
+            shift *= 2.0
+            tentativi += 1
+
+        L = sp.csr_matrix((data, lower.indices, lower.indptr), shape=lower.shape)
+        self.L = L
+        self._solve_lower = triangular_solver(L)
+        self._solve_upper = triangular_solver(L.T.tocsr())
+
+    def apply(self, r):
+        return self._solve_upper(self._solve_lower(r))
+
+
+class AMGPreconditioner(Preconditioner):
+    """
+    M^{-1} r = un V-ciclo del multigrid algebrico ad aggregazione levigata (vedi multigrid).
+    Con lo smoother di Gauss-Seidel (forward/backward) il V-ciclo è simmetrico.
+    """
+
+    name = "amg"
+
+    def __init__(self, A, profile=None, smoother: str = "gauss_seidel"):
+        self.smoother = smoother
+        super().__init__(A, profile)
+
+    def _setup(self, profile):
+        self.hierarchy = AMGHierarchy(profile, smoother=self.smoother)
+        self.solves_per_apply = self.hierarchy.solves_per_cycle
+
+    def apply(self, r):
+        return self.hierarchy.precondition(r)
+
+
+class CallablePreconditioner(Preconditioner):
+    """Adattatore per una funzione r -> z fornita dall'utente (setup nullo)."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.name = getattr(fn, "__name__", "custom")
+        self.setup_time = 0.0
+
+    def apply(self, r):
+        return self.fn(r)
+
+
+PRECONDITIONERS = {
+    "jacobi": JacobiPreconditioner,
+    "ssor": SSORPreconditioner,
+    "ic0": IncompleteCholeskyPreconditioner,
+    "amg": AMGPreconditioner,
+    "amg_jacobi": partial(AMGPreconditioner, smoother="jacobi"),
+}
+
+
+def make_preconditioner(spec, A, profile=None) -> Preconditioner:
+    """
+    Costruisce (o recupera dalla cache del profilo) un precondizionatore.
+
+    Parametri:
+    - spec: nome ('jacobi', 'ssor', 'ic0', 'amg', 'amg_jacobi'), istanza di Preconditioner oppure funzione r -> z
+    - A: matrice del sistema
+    - profile: MatrixProfile di A (se None viene preso dalla cache dei profili)
+
+    I precondizionatori predefiniti vengono fattorizzati una volta per matrice e
+    riusati per tutte le tolleranze e tutti i termini noti.
+    """
+    if spec is None or isinstance(spec, Preconditioner):
+        return spec
+    if callable(spec):
+        return CallablePreconditioner(spec)
+    if spec not in PRECONDITIONERS:
+        raise ValueError(f"Precondizionatore sconosciuto: {spec!r}. Valori ammessi: {list(PRECONDITIONERS)}.")
+    if is_operator(A):
+        raise ValueError("I precondizionatori predefiniti richiedono una matrice assemblata; "
+                         "con un operatore passare una funzione r -> z o un Preconditioner.")
+
+    if profile is None:
+        profile = get_matrix_profile(A)
+    M = profile.preconditioners.get(spec)
+    if M is None:
+        M = PRECONDITIONERS[spec](A, profile)
+        profile.preconditioners[spec] = M
+    return M
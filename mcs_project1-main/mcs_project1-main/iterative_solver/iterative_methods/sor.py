@@ -0,0 +1,130 @@
+import math
+import time
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+
+# Sweep di Gauss-Seidel usato da ciascun metodo
+RELAXED_VARIANTS = {"sor": "forward", "ssor": "symmetric"}
+# Strategie di stima di omega
+STRATEGIES = ("auto", "spectrum", "sweeps")
+
+
+class Relaxation:
+    """Parametro di rilassamento scelto per una matrice e un metodo ('sor' o 'ssor')."""
+
+    def __init__(self, method: str, omega: float, source: str, rho_jacobi: float = None, setup_time: float = 0.0):
+        self.method = method
+        self.omega = omega
+        # 'spettro di Jacobi' oppure 'sweep di Gauss-Seidel'
+        self.source = source
+        self.rho_jacobi = rho_jacobi
+        self.setup_time = setup_time
+
+    def __repr__(self) -> str:
+        return f"Relaxation({self.method}, omega={self.omega:.4f}, {self.source})"
+
+
+def omega_from_jacobi(rho_jacobi: float, method: str = "sor") -> float:
+    """
+    omega quasi ottimo dal raggio spettrale rho della matrice di iterazione di Jacobi.
+    - SOR (Young, matrici consistentemente ordinate): 2 / (1 + sqrt(1 - rho^2))
+    - SSOR (stima di Young): 2 / (1 + sqrt(2 (1 - rho)))
+    """
+    if not 0.0 <= rho_jacobi < 1.0:
+        raise ValueError(f"La formula richiede 0 <= rho < 1; trovato rho={rho_jacobi}.")
+    if method == "ssor":
+        return 2.0 / (1.0 + math.sqrt(2.0 * (1.0 - rho_jacobi)))
+    return 2.0 / (1.0 + math.sqrt(1.0 - rho_jacobi ** 2))
+
+
+def relaxation_parameter(profile, method: str = "sor", strategy: str = "auto") -> Relaxation:
+    """
+    omega per SOR o SSOR sulla matrice del profilo, stimato una volta e salvato nel profilo.
+
+    Parametri:
+    - profile: MatrixProfile della matrice
+    - method: 'sor' oppure 'ssor'
+    - strategy: 'spectrum' (formula di Young dal raggio spettrale di D^{-1} A stimato con
+      Lanczos, richiede A simmetrica con diagonale positiva), 'sweeps' (raggio spettrale
+      rho_GS della matrice di iterazione di Gauss-Seidel stimato con poche iterazioni di
+      Arnoldi sugli sweep, vedi utils.convergence, e rho_J = sqrt(rho_GS)) oppure 'auto'
+      (spettro se applicabile, altrimenti sweep)
+    Con 'auto', se lo spettro dà rho_J >= 1 si passa agli sweep (con un warning); se
+    nessuna stima dà rho_J < 1 si usa omega = 1 (Gauss-Seidel), sempre con un warning.
+    """
+    if method not in RELAXED_VARIANTS:
+        raise ValueError(f"Metodo sconosciuto: {method!r}. Valori ammessi: {list(RELAXED_VARIANTS)}.")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Strategia sconosciuta: {strategy!r}. Valori ammessi: {STRATEGIES}.")
+    chiave = (method, strategy)
+    rilassamento = profile.relaxation.get(chiave)
+    if rilassamento is not None:
+        return rilassamento
+
+    start_time = time.time()
+    rho = None
+    if strategy != "sweeps" and profile.is_symmetric and np.all(profile.diag > 0):
+        # Estremi dello spettro di D^{-1} A senza margine (in cache nel profilo)
+        lmin, lmax = profile.jacobi_extremes
+        rho, fonte = max(1.0 - lmin, lmax - 1.0), "spettro di Jacobi"
+        if rho >= 1.0 and strategy == "auto":
+            warnings.warn(f"rho(J) stimato dallo spettro = {rho:.4f} >= 1: omega stimato dagli sweep di "
+                          "Gauss-Seidel.", RuntimeWarning, stacklevel=2)
+            rho = None
+    elif strategy == "spectrum":
+        raise ValueError("La stima dallo spettro richiede A simmetrica con diagonale positiva.")
+    if rho is None:
+        # Matrici consistentemente ordinate: rho_GS = rho_J^2 (previsione in cache nel profilo)
+        rho_gs = profile.convergence["gauss_seidel"].rate
+        if rho_gs is None:
+            raise ValueError("Gauss-Seidel non è applicabile: impossibile stimare omega.")
+        rho, fonte = math.sqrt(rho_gs), "sweep di Gauss-Seidel"
+    if rho < 1.0:
+        # Arrotondato a 1e-3 come la tolleranza delle stime degli autovalori (stesso omega a ogni stima)
+        omega = round(omega_from_jacobi(rho, method), 3)
+    else:
+        warnings.warn(f"rho(J) stimato = {rho:.4f} >= 1 ({fonte}): omega = 1 (Gauss-Seidel).", RuntimeWarning,
+                      stacklevel=2)
+        omega = 1.0
+
+    rilassamento = Relaxation(method, omega, fonte, rho, time.time() - start_time)
+    profile.relaxation[chiave] = rilassamento
+    return rilassamento
+
+
+def _relaxed_solve(method, A, b, x_true, tol, max_iter, omega, profile, strategy, **kwargs):
+    if omega is None:
+        if not sp.issparse(A):
+            raise ValueError("La stima automatica di omega richiede una matrice assemblata.")
+        if profile is None:
+            profile = get_matrix_profile(A)
+        omega = relaxation_parameter(profile, method, strategy).omega
+    return gauss_seidel(A, b, x_true, tol, max_iter, variant=RELAXED_VARIANTS[method], profile=profile,
+                        omega=omega, **kwargs)
+
+
+def sor(A, b, x_true, tol, max_iter=20000, omega=None, profile=None, checkpoints=None, recorder=None,
+        precision="double", x0=None, strategy="auto"):
+    """
+    SOR: sweep forward di Gauss-Seidel rilassato, (D/omega + L) x_new = b - U x_old + (1/omega - 1) D x_old.
+    - omega: se None viene stimato una volta per matrice (vedi relaxation_parameter e strategy).
+    - Stessi parametri e stesso risultato di gauss_seidel (x, iterazioni, errore relativo, tempo, convergenza).
+    """
+    return _relaxed_solve("sor", A, b, x_true, tol, max_iter, omega, profile, strategy,
+                          checkpoints=checkpoints, recorder=recorder, precision=precision, x0=x0)
+
+
+def ssor(A, b, x_true, tol, max_iter=20000, omega=None, profile=None, checkpoints=None, recorder=None,
+         precision="double", x0=None, strategy="auto"):
+    """
+    SSOR: sweep SOR forward seguito da uno backward (ogni iterazione costa due risoluzioni triangolari).
+    - omega: se None viene stimato una volta per matrice (vedi relaxation_parameter e strategy).
+    - Stessi parametri e stesso risultato di gauss_seidel.
+    """
+    return _relaxed_solve("ssor", A, b, x_true, tol, max_iter, omega, profile, strategy,
+                          checkpoints=checkpoints, recorder=recorder, precision=precision, x0=x0)
@@ -0,0 +1,326 @@
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from iterative_solver.utils.coloring import color_classes
+from iterative_solver.utils.spmv import SpMVKernel, get_spmv_threads
+
+_VARIANTI = ("forward", "backward", "symmetric")
+# Fattorizzazioni rilassate (omega != 1) mantenute per motore (politica LRU)
+RELAXED_CACHE_SIZE = 4
+
+
+def _cached_kernel(cache: dict, key, M) -> SpMVKernel:
+    """Kernel SpMV di M per il numero di thread corrente, costruito una volta per chiave."""
+    threads = get_spmv_threads()
+    kernel = cache.get((key, threads))
+    if kernel is None:
+        kernel = SpMVKernel(M, threads)
+        cache[(key, threads)] = kernel
+    return kernel
+
+
+def triangular_solver(T):
+    """
+    Prepara la risoluzione di un sistema triangolare sparso.
+
+    Usa SuperLU con ordinamento naturale e pivot sulla diagonale: su una matrice
+    già triangolare la fattorizzazione non introduce fill-in e la solve è
+    interamente compilata (niente loop Python per riga).
+    """
+    lu = spla.splu(
+        T.tocsc(),
+        permc_spec="NATURAL",
+        diag_pivot_thresh=0.0,
+        options=dict(SymmetricMode=True),
+    )
+    return lu.solve
+
+
+class SweepEngine:
+    """
+    Motore di sweep Gauss-Seidel per matrici sparse CSR.
+
+    Lo splitting A = D + L + U viene calcolato una sola volta; ogni sweep è poi
+    una risoluzione triangolare sparsa più un prodotto matrice-vettore, e
+    restituisce anche il residuo b - A x senza un ulteriore prodotto A @ x.
+
+    Varianti disponibili:
+    - 'forward'   : (D + L) x_new = b - U x_old
+    - 'backward'  : (D + U) x_new = b - L x_old
+    - 'symmetric' : sweep forward seguito da uno backward (SGS)
+
+    Con un parametro di rilassamento omega != 1 gli stessi sweep diventano SOR
+    ('forward', 'backward') e SSOR ('symmetric'): (D/omega + L) x_new = b - U x_old + (1/omega - 1) D x_old.
+    """
+
+    def __init__(self, A, diag=None, L=None, U=None):
+        """
+        Parametri:
+        - A: matrice sparsa quadrata
+        - diag, L, U: splitting già calcolato (es. da un MatrixProfile); se None viene ricavato da A
+        """
+        if not sp.isspmatrix_csr(A):
+            A = A.tocsr()
+        self.A = A
+        self.diag = np.asarray(A.diagonal() if diag is None else diag, dtype=np.float64)
+        if np.any(self.diag == 0):
+            raise ValueError("La diagonale di A contiene almeno uno zero: lo sweep di Gauss-Seidel non è applicabile.")
+
+        self.L = sp.tril(A, k=-1, format="csr") if L is None else L
+        self.U = sp.triu(A, k=1, format="csr") if U is None else U
+
+        # Le fattorizzazioni triangolari vengono create solo quando servono
+        self._solve_lower = None
+        self._solve_upper = None
+        # Kernel SpMV per L e U ((parte, numero di thread) -> SpMVKernel)
+        self._kernels = {}
+        # Risoluzioni triangolari con diagonale D/omega ((parte, omega) -> solve)
+        self._relaxed: "OrderedDict[tuple, object]" = OrderedDict()
+
+    def _relaxed_solver(self, part: str, omega: float):
+        """Risoluzione con (D/omega + L) oppure (D/omega + U), fattorizzata una volta per omega."""
+        chiave = (part, float(omega))
+        solve = self._relaxed.get(chiave)
+        if solve is not None:
+            self._relaxed.move_to_end(chiave)
+            return solve
+        T = self.L if part == "L" else self.U
+        solve = triangular_solver(T + sp.diags(self.diag / omega))
+        self._relaxed[chiave] = solve
+        while len(self._relaxed) > RELAXED_CACHE_SIZE:
+            self._relaxed.popitem(last=False)
+        return solve
+
+    def solve_lower(self, rhs, omega: float = 1.0):
+        """Risolve (D/omega + L) y = rhs (D + L con omega = 1)."""
+        if omega != 1.0:
+            return self._relaxed_solver("L", omega)(rhs)
+        if self._solve_lower is None:
+            self._solve_lower = triangular_solver(self.L + sp.diags(self.diag))
+        return self._solve_lower(rhs)
+
+    def solve_upper(self, rhs, omega: float = 1.0):
+        """Risolve (D/omega + U) y = rhs (D + U con omega = 1)."""
+        if omega != 1.0:
+            return self._relaxed_solver("U", omega)(rhs)
+        if self._solve_upper is None:
+            self._solve_upper = triangular_solver(self.U + sp.diags(self.diag))
+        return self._solve_upper(rhs)
+
+    def lower_product(self, x, out=None):
+        """L x (scritto in out se fornito)."""
+        return _cached_kernel(self._kernels, "L", self.L)(x, out)
+
+    def upper_product(self, x, out=None):
+        """U x (scritto in out se fornito)."""
+        return _cached_kernel(self._kernels, "U", self.U)(x, out)
+
+    def start(self, b, x=None, variant="forward", omega: float = 1.0):
+        """
+        Inizializza una sequenza di sweep per il sistema A x = b.
+
+        Parametri:
+        - b: termine noto (vettore n oppure blocco n x k)
+        - x: vettore iniziale (aggiornato in place dagli sweep); se None parte da zero
+        - variant: 'forward', 'backward' o 'symmetric'
+        - omega: parametro di rilassamento in (0, 2) (1 = Gauss-Seidel)
+
+        Ritorna:
+        - SweepRun: oggetto con il metodo sweep() che restituisce il residuo
+        """
+        if variant not in _VARIANTI:
+            raise ValueError(f"Variante di sweep sconosciuta: {variant!r}. Valori ammessi: {_VARIANTI}.")
+        if not 0.0 < omega < 2.0:
+            raise ValueError(f"Il rilassamento richiede 0 < omega < 2; trovato omega={omega}.")
+        if x is None:
+            x = np.zeros(np.shape(b), dtype=np.float64)
+        return SweepRun(self, np.asarray(b, dtype=x.dtype), x, variant, omega)
+
+
+class SweepRun:
+    """
+    Stato di una sequenza di sweep su un singolo termine noto.
+
+    Mantiene il prodotto con la parte triangolare "vecchia" (U x oppure L x),
+    in modo che il residuo di ogni sweep si ottenga per differenza:
+    forward  -> r = U x_old - U x_new
+    backward -> r = L x_old - L x_new
+    Con omega != 1 al residuo si aggiunge (1/omega - 1) D (x_new - x_old).
+    """
+
+    def __init__(self, engine, b, x, variant, omega: float = 1.0):
+        self.engine = engine
+        self.b = b
+        self.x = x
+        self.variant = variant
+        self.omega = omega
+        self._r = np.empty_like(b)
+        # Buffer per il prodotto con la parte triangolare dell'iterata nuova (scambiato ad ogni sweep)
+        self._spare = np.empty_like(b)
+        # Con un blocco di termini noti la diagonale va applicata riga per riga
+        diag = engine.diag.astype(x.dtype, copy=False)
+        self._diag = diag if x.ndim == 1 else diag[:, None]
+        # Termine di rilassamento (1/omega - 1) D (None per Gauss-Seidel)
+        self._shift = None if omega == 1.0 else (1.0 / omega - 1.0) * self._diag
+
+        if variant == "backward":
+            self._Lx = engine.lower_product(x)
+        else:
+            self._Ux = engine.upper_product(x)
+
+    def sweep(self):
+        """Esegue uno sweep aggiornando x in place e ritorna il residuo b - A x."""
+        if self.variant == "forward":
+            return self._forward()
+        if self.variant == "backward":
+            return self._backward()
+        return self._symmetric()
+
+    def _relaxed_rhs(self, rhs, x_old):
+        """Aggiunge (1/omega - 1) D x_old al termine noto dello sweep rilassato."""
+        if self._shift is not None:
+            rhs += self._shift * x_old
+        return rhs
+
+    def _relaxed_residual(self, x_old):
+        """Aggiunge (1/omega - 1) D (x_new - x_old) al residuo ottenuto per differenza."""
+        if self._shift is not None:
+            self._r += self._shift * (self.x - x_old)
+
+    def _forward(self):
+        eng = self.engine
+        x_old = self.x.copy() if self._shift is not None else None
+        self.x[:] = eng.solve_lower(self._relaxed_rhs(self.b - self._Ux, x_old), self.omega)
+        Ux_new = eng.upper_product(self.x, out=self._spare)
+        np.subtract(self._Ux, Ux_new, out=self._r)
+        self._relaxed_residual(x_old)
+        self._Ux, self._spare = Ux_new, self._Ux
+        return self._r
+
+    def _backward(self):
+        eng = self.engine
+        x_old = self.x.copy() if self._shift is not None else None
+        self.x[:] = eng.solve_upper(self._relaxed_rhs(self.b - self._Lx, x_old), self.omega)
+        Lx_new = eng.lower_product(self.x, out=self._spare)
+        np.subtract(self._Lx, Lx_new, out=self._r)
+        self._relaxed_residual(x_old)
+        self._Lx, self._spare = Lx_new, self._Lx
+        return self._r
+
+    def _symmetric(self):
+        eng = self.engine
+        # Mezzo sweep forward: serve solo L x_half per la parte backward
+        x_half = eng.solve_lower(self._relaxed_rhs(self.b - self._Ux, self.x), self.omega)
+        Lx_half = eng.lower_product(x_half)
+
+        self.x[:] = eng.solve_upper(self._relaxed_rhs(self.b - Lx_half, x_half), self.omega)
+        Lx_new = eng.lower_product(self.x, out=self._spare)
+        np.subtract(Lx_half, Lx_new, out=self._r)
+        self._relaxed_residual(x_half)
+
+        # U x_new ricavato da A x_new = b - r, senza un altro prodotto
+        self._Ux = self.b - self._r - self._diag * self.x - Lx_new
+        return self._r
+
+
+class MulticolorSweepEngine:
+    """
+    Motore di sweep Gauss-Seidel multicolore.
+
+    Le righe sono divise in classi di colore senza accoppiamenti interni (vedi
+    utils.coloring): ogni classe è aggiornata in blocco con
+    x[c] = (b[c] - L_c x - (U x)[c]) / D[c], dove L_c e U contengono gli accoppiamenti
+    con i colori precedenti e successivi. È Gauss-Seidel sull'ordinamento per colori:
+    niente risoluzioni triangolari, solo prodotti matrice-vettore (eventualmente
+    multithread) e, come nello sweep forward, il residuo per differenza
+    r = U x_old - U x_new.
+    """
+
+    def __init__(self, A, colors, diag=None):
+        """
+        Parametri:
+        - A: matrice sparsa quadrata
+        - colors: colore di ogni riga (es. greedy_coloring(A))
+        - diag: diagonale di A già calcolata; se None viene ricavata da A
+        """
+        A = sp.csr_matrix(A)
+        self.A = A
+        self.diag = np.asarray(A.diagonal() if diag is None else diag, dtype=np.float64)
+        if np.any(self.diag == 0):
+            raise ValueError("La diagonale di A contiene almeno uno zero: lo sweep di Gauss-Seidel non è applicabile.")
+        self.colors = np.asarray(colors)
+        self.classes = color_classes(self.colors)
+
+        C = A.tocoo()
+        fuori = C.row != C.col
+        righe, colonne, valori = C.row[fuori], C.col[fuori], C.data[fuori]
+        cr, cc = self.colors[righe], self.colors[colonne]
+        if np.any(cr == cc):
+            raise ValueError("Colorazione non valida: due righe dello stesso colore sono accoppiate da A.")
+        prima = cc < cr
+        L = sp.csr_matrix((valori[prima], (righe[prima], colonne[prima])), shape=A.shape)
+        self.U = sp.csr_matrix((valori[~prima], (righe[~prima], colonne[~prima])), shape=A.shape)
+        # Righe di L di ciascun colore (n_c x n)
+        self.L_blocks = [L[idx] for idx in self.classes]
+        self._kernels = {}
+
+    @property
+    def n_colors(self) -> int:
+        return len(self.classes)
+
+    def lower_product(self, c: int, x, out=None):
+        """L_c x: accoppiamenti delle righe di colore c con i colori precedenti."""
+        return _cached_kernel(self._kernels, c, self.L_blocks[c])(x, out)
+
+    def upper_product(self, x, out=None):
+        """U x: accoppiamenti con i colori successivi (scritto in out se fornito)."""
+        return _cached_kernel(self._kernels, "U", self.U)(x, out)
+
+    def start(self, b, x=None, variant="multicolor", omega: float = 1.0):
+        """Inizializza una sequenza di sweep multicolore (stessa interfaccia di SweepEngine.start, senza rilassamento)."""
+        if variant != "multicolor":
+            raise ValueError(f"Variante di sweep non supportata dal motore multicolore: {variant!r}.")
+        if omega != 1.0:
+            raise ValueError("Il motore multicolore non supporta il rilassamento (omega != 1).")
+        if x is None:
+            x = np.zeros(np.shape(b), dtype=np.float64)
+        return MulticolorSweepRun(self, np.asarray(b, dtype=x.dtype), x)
+
+
+class MulticolorSweepRun:
+    """Stato di una sequenza di sweep multicolore (x in ordinamento originale, aggiornato in place)."""
+
+    def __init__(self, engine, b, x):
+        self.engine = engine
+        self.b = b
+        self.x = x
+        self.variant = "multicolor"
+        blocco = x.ndim > 1
+        self._b = [b[idx] for idx in engine.classes]
+        diag = engine.diag.astype(x.dtype, copy=False)
+        self._diag = [diag[idx][:, None] if blocco else diag[idx] for idx in engine.classes]
+        self._Ux = engine.upper_product(x)
+        self._spare = np.empty_like(b)
+        self._r = np.empty_like(b)
+        massimo = max((idx.size for idx in engine.classes), default=0)
+        self._t = np.empty((massimo,) + b.shape[1:], dtype=x.dtype)
+        self._g = np.empty_like(self._t)
+
+    def sweep(self):
+        """Aggiorna le classi di colore in ordine e ritorna il residuo b - A x."""
+        eng = self.engine
+        for c, idx in enumerate(eng.classes):
+            t, g = self._t[:idx.size], self._g[:idx.size]
+            eng.lower_product(c, self.x, out=t)
+            np.take(self._Ux, idx, axis=0, out=g)
+            t += g
+            np.subtract(self._b[c], t, out=t)
+            t /= self._diag[c]
+            self.x[idx] = t
+        Ux_new = eng.upper_product(self.x, out=self._spare)
+        np.subtract(self._Ux, Ux_new, out=self._r)
+        self._Ux, self._spare = Ux_new, self._Ux
+        return self._r
@@ -0,0 +1,316 @@
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.utils.convergence import DEFAULT_MAX_ITER
+from iterative_solver.test_matrices_folder import (
+    METODI,
+    METODI_OPZIONALI,
+    METODI_RILASSATI,
+    NOME_AMG,
+    NOME_AUTO,
+    NOME_BICGSTAB,
+    NOME_GMRES,
+    NOME_GS_MULTICOLORE,
+    Result,
+    _amg_setup,
+    _apply_prediction,
+    _build_preconditioner,
+    _histories,
+    _merge_results,
+    _multicolor_setup,
+    _prepare_system,
+    _relaxation_setup,
+    _print_method_results,
+    _print_multicolor_report,
+    _print_prediction_report,
+    _print_relaxation_report,
+    _print_skipped,
+    _print_stored,
+    _solve_method_on_tolerances,
+    _store_params,
+    _unpermute_esiti,
+    _with_precision,
+)
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.plot_results import plot_results
+from iterative_solver.utils.results_saver import results_saver
+from iterative_solver.utils.results_store import ResultsStore
+
+# Variabili d'ambiente lette dalle librerie BLAS/OpenMP all'import di NumPy
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# Matrici già agganciate dal processo worker (nome blocco -> (A, b, x_esatto, blocchi))
+_worker_systems: Dict[str, Tuple] = {}
+_worker_thread_limits = None
+
+
+@contextmanager
+def _thread_limits_env(threads: int):
+    """Imposta temporaneamente il numero di thread BLAS ereditato dai processi worker."""
+    precedenti = {var: os.environ.get(var) for var in _THREAD_ENV_VARS}
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        yield
+    finally:
+        for var, valore in precedenti.items():
+            if valore is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = valore
+
+
+def _init_worker(threads: int) -> None:
+    """Inizializzatore dei worker: limita i thread BLAS (anche tramite threadpoolctl, se installato)."""
+    global _worker_thread_limits
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    _worker_thread_limits = threadpool_limits(limits=threads)
+
+
+def _to_shared(arr: np.ndarray, blocchi: List[shared_memory.SharedMemory]) -> Tuple[str, tuple, str]:
+    """Copia arr in un blocco di memoria condivisa e ritorna (nome, forma, dtype)."""
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    blocchi.append(shm)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm.name, arr.shape, arr.dtype.str
+
+
+def _share_system(A, b, x_esatto) -> Tuple[dict, List[shared_memory.SharedMemory]]:
+    """Mette in memoria condivisa gli array CSR di A, b e x_esatto."""
+    A = A.tocsr()
+    blocchi: List[shared_memory.SharedMemory] = []
+    descrittore = {
+        "shape": A.shape,
+        "data": _to_shared(A.data, blocchi),
+        "indices": _to_shared(A.indices, blocchi),
+        "indptr": _to_shared(A.indptr, blocchi),
+        "b": _to_shared(b, blocchi),
+        "x_esatto": _to_shared(x_esatto, blocchi),
+    }
+    return descrittore, blocchi
+
+
+def _attach(spec, blocchi):
+    nome, shape, dtype = spec
+    try:
+        shm = shared_memory.SharedMemory(name=nome, track=False)
+    except TypeError:
+        # Python < 3.13: il resource tracker è condiviso con il processo padre
+        shm = shared_memory.SharedMemory(name=nome)
+    blocchi.append(shm)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _worker_system(descrittore: dict):
+    """Aggancia (una sola volta per worker) la matrice condivisa senza copiarla."""
+    chiave = descrittore["data"][0]
+    sistema = _worker_systems.get(chiave)
+    if sistema is None:
+        blocchi: List[shared_memory.SharedMemory] = []
+        data = _attach(descrittore["data"], blocchi)
+        indices = _attach(descrittore["indices"], blocchi)
+        indptr = _attach(descrittore["indptr"], blocchi)
+        A = sp.csr_matrix((data, indices, indptr), shape=descrittore["shape"], copy=False)
+        b = _attach(descrittore["b"], blocchi)
+        x_esatto = _attach(descrittore["x_esatto"], blocchi)
+        sistema = (A, b, x_esatto, blocchi)
+        _worker_systems[chiave] = sistema
+    return sistema[:3]
+
+
+def _run_job(descrittore: dict, nome: str, tolleranze: List[float], single_pass: bool, preconditioner,
+             record_history: bool = False, precision: str = "double"):
+    """Job eseguito nel worker: un metodo su una matrice, tutte le tolleranze."""
+    A, b, x_esatto = _worker_system(descrittore)
+    profile = get_matrix_profile(A)
+
+    setup_time = 0.0
+    if nome in METODI_OPZIONALI:
+        solver_fn = METODI_OPZIONALI[nome]
+        if nome == NOME_GS_MULTICOLORE:
+            setup_time = _multicolor_setup(profile)
+        elif nome == NOME_AMG:
+            setup_time = _amg_setup(profile, precision)
+        elif nome in METODI_RILASSATI:
+            setup_time = _relaxation_setup(profile, nome)
+    elif preconditioner is None:
+        solver_fn = METODI[nome]
+    else:
+        M = _build_preconditioner(preconditioner, profile, precision)
+        solver_fn = partial(conjugate_gradient, preconditioner=M)
+        setup_time = M.setup_time
+
+    return _solve_method_on_tolerances(
+        _with_precision(solver_fn, precision), A, b, x_esatto, tolleranze,
+        profile=profile, single_pass=single_pass, setup_time=setup_time,
+        record_history=record_history,
+    )
+
+
+def _store_job(archivio: ResultsStore, fingerprint: str, matrix_name: str, nome: str, parametri: str, future) -> None:
+    """Callback di completamento di un job: salva subito i suoi risultati nell'archivio."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    for _, risultato, _ in future.result():
+        archivio.put(fingerprint, matrix_name, nome, parametri, risultato)
+
+
+def run_matrices_parallel(
+    matrix_paths: List[str],
+    tolleranze: List[float],
+    workers: int,
+    single_pass: bool = False,
+    preconditioner: str = None,
+    threads_per_worker: int = 1,
+    use_cache: bool = False,
+    record_history: bool = False,
+    reorder: str = None,
+    multicolor: bool = False,
+    precision: str = "double",
+    store: str = None,
+    predict: bool = False,
+    krylov: bool = False,
+    multigrid: bool = False,
+    relaxation: bool = False
+) -> None:
+    """
+    Esegue i job (matrice, metodo) su un ProcessPoolExecutor.
+
+    - Le matrici sono passate ai worker tramite multiprocessing.shared_memory
+      (array CSR data/indices/indptr, b e x_esatto), non serializzate per ogni job.
+    - I risultati vengono raccolti nell'ordine seriale (matrici ordinate, metodi
+      nell'ordine di METODI), quindi stampe, CSV e grafici coincidono con l'esecuzione seriale.
+    - Ogni worker usa threads_per_worker thread BLAS, per non falsare i tempi per oversubscription.
+    - Con store (file SQLite, vedi utils.results_store) i risultati di ogni job sono salvati
+      appena il job termina e vengono inviati ai worker solo i job con tolleranze mancanti.
+    - Con predict la previsione della convergenza è calcolata nel processo principale e
+      le esecuzioni previste inutili non vengono inviate ai worker.
+    """
+    metodi: List[Tuple[str, object]] = [(nome, None) for nome in METODI]
+    if preconditioner is not None:
+        metodi.append((f"Gradiente coniugato ({preconditioner})", preconditioner))
+    if multicolor:
+        metodi.append((NOME_GS_MULTICOLORE, None))
+    if predict:
+        metodi.append((NOME_AUTO, None))
+    if krylov:
+        metodi.extend([(NOME_BICGSTAB, None), (NOME_GMRES, None)])
+    if multigrid:
+        metodi.append((NOME_AMG, None))
+    if relaxation:
+        metodi.extend((nome, None) for nome in METODI_RILASSATI)
+
+    archivio = ResultsStore(store) if store is not None else None
+    parametri = _store_params(single_pass, reorder, precision, predict)
+
+    matrici = []
+    try:
+        for path in matrix_paths:
+            matrix_name = os.path.splitext(os.path.basename(path))[0]
+            A, b, x_esatto, ordinamento = _prepare_system(path, use_cache=use_cache, reorder=reorder)
+            descrittore, blocchi = _share_system(A, b, x_esatto)
+            profile = get_matrix_profile(A)
+            # Numero di colori per il riepilogo del Gauss-Seidel multicolore
+            n_colori = profile.n_colors if multicolor else None
+            matrici.append((matrix_name, descrittore, blocchi, ordinamento, n_colori, profile))
+
+        contesto = mp.get_context("spawn")
+        with _thread_limits_env(threads_per_worker), ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=contesto,
+            initializer=_init_worker,
+            initargs=(threads_per_worker,),
+        ) as pool:
+            futures = {}
+            # Tolleranze saltate per la previsione: (matrice, metodo) -> {tolleranza: Result}
+            saltati = {}
+            for matrix_name, descrittore, _, _, _, profile in matrici:
+                fingerprint = profile.key
+                for nome, pc in metodi:
+                    mancanti = (tolleranze if archivio is None
+                                else archivio.missing(fingerprint, nome, tolleranze, parametri))
+                    if predict:
+                        mancanti, saltati[(matrix_name, nome)] = _apply_prediction(
+                            profile.convergence, nome, mancanti)
+                        if archivio is not None:
+                            for risultato in saltati[(matrix_name, nome)].values():
+                                archivio.put(fingerprint, matrix_name, nome, parametri, risultato)
+                    if not mancanti:
+                        continue
+                    future = pool.submit(
+                        _run_job, descrittore, nome, mancanti, single_pass, pc, record_history, precision
+                    )
+                    if archivio is not None:
+                        future.add_done_callback(
+                            partial(_store_job, archivio, fingerprint, matrix_name, nome, parametri)
+                        )
+                    futures[(matrix_name, nome)] = future
+
+            # Raccolta deterministica: stesso ordine dell'esecuzione seriale
+            for matrix_name, _, _, ordinamento, n_colori, profile in matrici:
+                fingerprint = profile.key
+                print(f"\n\n===== TEST MATRICE: {matrix_name} =====\n")
+                previsione = profile.convergence if predict else None
+                if previsione is not None:
+                    print(previsione.report(tolleranze, DEFAULT_MAX_ITER))
+                risultati: Dict[str, List[Result]] = {}
+                storie = {} if record_history else None
+                for nome, _ in metodi:
+                    future = futures.get((matrix_name, nome))
+                    saltati_metodo = saltati.get((matrix_name, nome), {})
+                    if previsione is not None:
+                        _print_skipped(previsione, nome, saltati_metodo)
+                    eseguiti: List[Result] = []
+                    if future is not None:
+                        esiti = future.result()
+                        eseguiti = _print_method_results(nome, _unpermute_esiti(esiti, ordinamento))
+                        if record_history:
+                            storie[nome] = _histories(esiti)
+                    risultati[nome] = _merge_results(tolleranze, eseguiti, saltati_metodo)
+                    if archivio is not None:
+                        # Il callback di salvataggio può non essere ancora terminato: i risultati
+                        # nuovi arrivano dal job, gli altri dall'archivio
+                        nuovi = {risultato[0]: risultato for risultato in risultati.get(nome, [])}
+                        if future is None and not saltati_metodo:
+                            _print_stored(nome, archivio.results(fingerprint, nome, tolleranze, parametri))
+                        completi = (nuovi.get(tol) or archivio.get(fingerprint, nome, tol, parametri)
+                                    for tol in tolleranze)
+                        risultati[nome] = [r for r in completi if r is not None]
+
+                if multicolor:
+                    _print_multicolor_report(n_colori, risultati)
+                previste = _print_prediction_report(previsione, risultati) if previsione is not None else None
+                # omega stimato (con lo stesso arrotondamento) anche nel processo principale
+                rilassati = _print_relaxation_report(profile, risultati) if relaxation else None
+
+                results_saver(risultati, matrix_name=matrix_name, histories=storie, predictions=previste,
+                              relaxation=rilassati)
+                plot_results(risultati, matrix_name=matrix_name)
+    finally:
+        for _, _, blocchi, _, _, _ in matrici:
+            for shm in blocchi:
+                shm.close()
+                shm.unlink()
+        if archivio is not None:
+            archivio.close()
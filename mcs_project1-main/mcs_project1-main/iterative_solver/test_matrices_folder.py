@@ -1,46 +1,403 @@
 import os
+import time
+from functools import partial
 from typing import Callable, Dict, List, Tuple
 
+from iterative_solver.iterative_methods.amg import amg
+from iterative_solver.iterative_methods.auto import auto
+from iterative_solver.iterative_methods.bicgstab import bicgstab
 from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
 from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gmres import DEFAULT_RESTART, gmres
 from iterative_solver.iterative_methods.jacobi import jacobi
 from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.preconditioners import make_preconditioner
+from iterative_solver.iterative_methods.sor import relaxation_parameter, sor, ssor
 
+from iterative_solver.utils.checkpoints import ToleranceCheckpoints
+from iterative_solver.utils.convergence import DEFAULT_MAX_ITER, ConvergencePrediction
 from iterative_solver.utils.matrix_loader import load_matrix
+from iterative_solver.utils.matrix_profile import MatrixProfile, get_matrix_profile
 from iterative_solver.utils.setup_variable import setup_variable
 from iterative_solver.utils.print_results import print_results
+from iterative_solver.utils.recorder import IterationRecorder
+from iterative_solver.utils.reordering import Reordering, reorder_matrix
 from iterative_solver.utils.results_saver import results_saver
+from iterative_solver.utils.results_store import ResultsStore, params_key
+from iterative_solver.utils.spmv import get_spmv_threads, spmv_threads
 from iterative_solver.utils.plot_results import plot_results
 
-# Tipo dei risultati per ogni run: (tol, iters, err_rel, t_calc, conv)
-Result = Tuple[float, int, float, float, bool]
+# Tipo dei risultati per ogni run: (tol, iters, err_rel, t_calc, conv, t_setup)
+Result = Tuple[float, int, float, float, bool, float]
 
 
-def _run_method_on_tolerances(
-    name: str,
+# Mappa nome->funzione per evitare ripetizioni
+METODI: Dict[str, Callable] = {
+    "Jacobi": jacobi,
+    "Gauss-Seidel": gauss_seidel,
+    "Gradiente": gradient,
+    "Gradiente coniugato": conjugate_gradient,
+}
+
+# Gauss-Seidel multicolore, aggiunto su richiesta (test_matrices_folder(multicolor=True))
+NOME_GS_MULTICOLORE = "Gauss-Seidel (multicolore)"
+# Metodo automatico (test_matrices_folder(predict=True)): il più rapido secondo la previsione
+NOME_AUTO = "Automatico"
+# Metodi di Krylov per sistemi non simmetrici (test_matrices_folder(krylov=True))
+NOME_BICGSTAB = "BiCGSTAB"
+NOME_GMRES = f"GMRES({DEFAULT_RESTART})"
+# Multigrid algebrico ad aggregazione levigata (test_matrices_folder(multigrid=True))
+NOME_AMG = "Multigrid algebrico"
+# SOR e SSOR con omega stimato per matrice (test_matrices_folder(relaxation=True))
+NOME_SOR = "SOR"
+NOME_SSOR = "SSOR"
+METODI_OPZIONALI: Dict[str, Callable] = {
+    NOME_GS_MULTICOLORE: partial(gauss_seidel, variant="multicolor"),
+    NOME_AUTO: auto,
+    NOME_BICGSTAB: bicgstab,
+    NOME_GMRES: gmres,
+    NOME_AMG: amg,
+    NOME_SOR: sor,
+    NOME_SSOR: ssor,
+}
+
+# Nome del metodo nei risultati -> metodo di iterative_methods.sor
+METODI_RILASSATI: Dict[str, str] = {NOME_SOR: "sor", NOME_SSOR: "ssor"}
+
+# Nome del metodo nei risultati -> nome nella previsione della convergenza (utils.convergence)
+METODI_PREVISTI: Dict[str, str] = {
+    "Jacobi": "jacobi",
+    "Gauss-Seidel": "gauss_seidel",
+    "Gradiente": "gradient",
+    "Gradiente coniugato": "conjugate_gradient",
+}
+
+
+def _solve_method_on_tolerances(
     solver_fn: Callable,
     A,
     b,
     x_esatto,
-    tolleranze: List[float]
-) -> List[Result]:
+    tolleranze: List[float],
+    profile: MatrixProfile = None,
+    single_pass: bool = False,
+    setup_time: float = 0.0,
+    record_history: bool = False,
+    on_result: Callable = None
+) -> List[Tuple]:
     """
-    Esegue un singolo metodo iterativo su tutte le tolleranze richieste,
-    stampa i risultati e ritorna la lista dei risultati.
+    Esegue un singolo metodo iterativo su tutte le tolleranze richieste, senza stampare.
+    Ritorna una lista di terne (x_approssimato, Result, IterationRecorder o None), una per tolleranza.
+
+    Con single_pass=True il metodo viene eseguito una sola volta fino alla
+    tolleranza più stretta, registrando un checkpoint per ogni tolleranza attraversata.
+    setup_time (es. fattorizzazione del precondizionatore) è riportato a parte
+    rispetto al tempo delle iterazioni.
+    Con record_history=True ogni esecuzione riceve un IterationRecorder (in single_pass
+    l'unico recorder è associato alla sola tolleranza più stretta).
+    on_result (se fornito) riceve ogni Result appena prodotto, ad esempio per salvarlo
+    subito nel ResultsStore.
     """
-    print(f"\n\n\nTEST {name}\n")
-    risultati: List[Result] = []
+    esiti = []
+
+    if single_pass:
+        checkpoints = ToleranceCheckpoints(tolleranze, x_esatto, keep_x=True)
+        recorder = IterationRecorder() if record_history else None
+        extra = {"recorder": recorder} if record_history else {}
+        final = solver_fn(A, b, x_esatto, checkpoints.tightest, profile=profile, checkpoints=checkpoints, **extra)
+        checkpoints.finish(*final)
+
+        for tol in tolleranze:
+            x_approx, iters, err_rel, t_calc, conv = checkpoints.result(tol)
+            rec = recorder if tol == checkpoints.tightest else None
+            esiti.append((x_approx, (tol, iters, err_rel, t_calc, conv, setup_time), rec))
+            if on_result is not None:
+                on_result(esiti[-1][1])
+        return esiti
 
     for tol in tolleranze:
+        recorder = IterationRecorder() if record_history else None
+        extra = {"recorder": recorder} if record_history else {}
+        x_approx, iters, err_rel, t_calc, conv = solver_fn(A, b, x_esatto, tol, profile=profile, **extra)
+        esiti.append((x_approx, (tol, iters, err_rel, t_calc, conv, setup_time), recorder))
+        if on_result is not None:
+            on_result(esiti[-1][1])
+
+    return esiti
+
+
+def _prepare_system(path: str, use_cache: bool = False, reorder: str = None):
+    """
+    Carica la matrice e prepara x_esatto e b.
+    Con reorder (es. 'rcm') il sistema viene permutato in modo coerente (A, b, x_esatto)
+    e viene restituito anche il Reordering per riportare le soluzioni nell'ordine originale.
+    Se la permutazione non riduce la banda si mantiene l'ordinamento del file.
+    """
+    A = load_matrix(path, use_cache=use_cache)
+    x_esatto, b = setup_variable(A)
+    if reorder is None:
+        return A, b, x_esatto, None
+
+    ordinamento = reorder_matrix(path, A, reorder, use_cache=use_cache)
+    if not ordinamento.pays_off:
+        print(f"{ordinamento.report()}: non conveniente, mantenuto l'ordinamento originale")
+        return A, b, x_esatto, None
+    print(ordinamento.report())
+    return ordinamento.permute_matrix(A), ordinamento.permute(b), ordinamento.permute(x_esatto), ordinamento
+
+
+def _with_precision(solver_fn: Callable, precision: str = "double") -> Callable:
+    """Il metodo nella precisione richiesta ('double' o 'mixed')."""
+    return solver_fn if precision == "double" else partial(solver_fn, precision=precision)
+
+
+def _build_preconditioner(preconditioner: str, profile: MatrixProfile, precision: str = "double"):
+    """Precondizionatore fattorizzato sulla matrice delle iterazioni (la copia float32 in precisione mista)."""
+    base = profile.single if precision == "mixed" else profile
+    return make_preconditioner(preconditioner, base.A, base)
+
+
+def _multicolor_setup(profile: MatrixProfile) -> float:
+    """Colorazione e motore multicolore costruiti (una volta) nel profilo; ritorna il tempo impiegato."""
+    start_time = time.time()
+    _ = profile.multicolor_engine
+    return time.time() - start_time
+
+
+def _amg_setup(profile: MatrixProfile, precision: str = "double") -> float:
+    """Gerarchia del multigrid costruita (una volta) nel profilo; ritorna il suo tempo di setup."""
+    return _build_preconditioner("amg", profile, precision).setup_time
+
+
+def _print_amg_report(profile: MatrixProfile, precision: str = "double") -> None:
+    """Livelli della gerarchia, tempo di setup e costo medio di un V-ciclo."""
+    print()
+    print(_build_preconditioner("amg", profile, precision).hierarchy.report())
+
+
+def _relaxation_setup(profile: MatrixProfile, name: str) -> float:
+    """omega di SOR/SSOR stimato (una volta) e salvato nel profilo; ritorna il tempo della stima."""
+    return relaxation_parameter(profile, METODI_RILASSATI[name]).setup_time
+
+
+def _print_relaxation_report(profile: MatrixProfile, risultati: Dict[str, List[Result]]) -> Dict:
+    """
+    omega scelto e iterazioni risparmiate rispetto a Gauss-Seidel (a parità di tolleranza,
+    se entrambi convergono). Ritorna metodo -> (omega, {tolleranza: iterazioni risparmiate}).
+    """
+    gauss_seidel = {tol: iters for tol, iters, _, _, conv, *_ in risultati.get("Gauss-Seidel", []) if conv}
+    rilassati = {}
+    print()
+    for nome, metodo in METODI_RILASSATI.items():
+        if nome not in risultati:
+            continue
+        rilassamento = relaxation_parameter(profile, metodo)
+        risparmi = {tol: gauss_seidel[tol] - iters for tol, iters, _, _, conv, *_ in risultati[nome]
+                    if conv and tol in gauss_seidel}
+        rilassati[nome] = (rilassamento.omega, risparmi)
+        dettagli = ", ".join(f"{tol:.0e}: {r:+d}" for tol, r in risparmi.items())
+        print(f"{nome}: omega = {rilassamento.omega:.3f} ({rilassamento.source}), "
+              f"iterazioni risparmiate rispetto a Gauss-Seidel ({dettagli or '-'})")
+    return rilassati
+
+
+def _print_multicolor_report(n_colors: int, risultati: Dict[str, List[Result]]) -> None:
+    """Numero di colori e iterazioni del Gauss-Seidel multicolore rispetto all'ordine naturale."""
+    print(f"\nGauss-Seidel multicolore: {n_colors} colori")
+    for naturale, multi in zip(risultati["Gauss-Seidel"], risultati[NOME_GS_MULTICOLORE]):
+        tol, it_nat, it_multi = naturale[0], naturale[1], multi[1]
+        rapporto = f"{it_multi / it_nat:.2f}x" if it_nat else "-"
+        print(f"- tolleranza {tol:.0e}: {it_multi} iterazioni contro {it_nat} in ordine naturale ({rapporto})")
+
+
+def _store_params(single_pass: bool, reorder: str, precision: str, predict: bool = False) -> str:
+    """Parametri di esecuzione che distinguono i risultati nel ResultsStore (oltre a metodo e tolleranza)."""
+    return params_key(single_pass=bool(single_pass), reorder=reorder, precision=precision, predict=bool(predict))
+
+
+def _predicted_iterations(previsione: ConvergencePrediction, name: str, tol: float):
+    """Iterazioni previste per il metodo (per Automatico quelle del metodo scelto); None se non previste."""
+    metodo = previsione.best(tol, DEFAULT_MAX_ITER) if name == NOME_AUTO else METODI_PREVISTI.get(name)
+    if metodo is None:
+        return None
+    return previsione[metodo].iterations(tol)
+
+
+def _apply_prediction(previsione: ConvergencePrediction, name: str, tolleranze: List[float]):
+    """
+    Separa le tolleranze da eseguire da quelle per cui il metodo è previsto divergente,
+    non applicabile oppure oltre il massimo di iterazioni.
+    Ritorna (tolleranze da eseguire, dict tolleranza -> Result dei run saltati).
+    """
+    metodo = METODI_PREVISTI.get(name)
+    if metodo is None:
+        return tolleranze, {}
+    da_eseguire, saltati = [], {}
+    for tol in tolleranze:
+        if previsione[metodo].skip_reason(tol, DEFAULT_MAX_ITER) is None:
+            da_eseguire.append(tol)
+        else:
+            saltati[tol] = (tol, 0, float("nan"), 0.0, False, 0.0)
+    return da_eseguire, saltati
+
+
+def _print_skipped(previsione: ConvergencePrediction, name: str, saltati: Dict[float, Result]) -> None:
+    """Stampa le tolleranze non eseguite per la previsione e il motivo."""
+    for tol in saltati:
+        motivo = previsione[METODI_PREVISTI[name]].skip_reason(tol, DEFAULT_MAX_ITER)
+        print(f"\n{name}, tolleranza {tol:.0e}: non eseguito, {motivo}")
+
+
+def _merge_results(tolleranze: List[float], eseguiti: List[Result], saltati: Dict[float, Result]) -> List[Result]:
+    """Risultati eseguiti e saltati nell'ordine delle tolleranze."""
+    per_tol = dict(saltati)
+    per_tol.update((risultato[0], risultato) for risultato in eseguiti)
+    return [per_tol[tol] for tol in tolleranze if tol in per_tol]
+
+
+def _print_prediction_report(previsione: ConvergencePrediction, risultati: Dict[str, List[Result]]) -> Dict:
+    """Iterazioni previste contro effettive per ogni metodo; ritorna dict metodo -> {tolleranza: previste}."""
+    print("\nIterazioni previste / effettive:")
+    previste: Dict[str, Dict[float, int]] = {}
+    for nome, lista in risultati.items():
+        previste[nome] = {}
+        righe = []
+        for tol, iters, _, _, conv, *_ in lista:
+            stima = _predicted_iterations(previsione, nome, tol)
+            previste[nome][tol] = stima
+            effettive = iters if conv else ("saltato" if iters == 0 else f"{iters} (non convergente)")
+            righe.append(f"{tol:.0e}: {stima if stima is not None else '-'} / {effettive}")
+        print(f"- {nome}: " + ", ".join(righe))
+    return previste
+
+
+def _print_stored(name: str, risultati: List[Result]) -> None:
+    """Riepilogo dei risultati di un metodo già presenti nel ResultsStore (non rieseguiti)."""
+    print(f"\n\n\nTEST {name}: risultati già presenti nell'archivio\n")
+    for tol, iters, err_rel, t_calc, conv, _ in risultati:
+        esito = "convergente" if conv else "NON convergente"
+        print(f"- tolleranza {tol:.0e}: {iters} iterazioni, errore relativo {err_rel:.2e}, "
+              f"{t_calc:.4f} s ({esito})")
+
+
+def _unpermute_esiti(esiti: List[Tuple], ordinamento: Reordering = None) -> List[Tuple]:
+    """Riporta le soluzioni degli esiti nell'ordinamento originale della matrice."""
+    if ordinamento is None:
+        return esiti
+    return [(ordinamento.unpermute(x) if x is not None else None, risultato, recorder)
+            for x, risultato, recorder in esiti]
+
+
+def _histories(esiti: List[Tuple]) -> List[Tuple]:
+    """Coppie (tolleranza, IterationRecorder) delle esecuzioni strumentate."""
+    return [(risultato[0], recorder) for _, risultato, recorder in esiti if recorder is not None]
+
+
+def _print_method_results(name: str, esiti: List[Tuple]) -> List[Result]:
+    """Stampa i risultati di un metodo (nell'ordine delle tolleranze) e ritorna la lista dei Result."""
+    print(f"\n\n\nTEST {name}\n")
+    risultati: List[Result] = []
+    for x_approx, risultato, _ in esiti:
+        tol, iters, err_rel, t_calc, conv = risultato[:5]
         print(f"Test con tolleranza: {tol}")
-        x_approx, iters, err_rel, t_calc, conv = solver_fn(A, b, x_esatto, tol)
         print_results(x_approx, iters, err_rel, t_calc, conv)
-        risultati.append((tol, iters, err_rel, t_calc, conv))
-
+        risultati.append(risultato)
     return risultati
 
 
-def test_matrices_folder(matrices_folder: str) -> None:
+def _run_method_on_tolerances(
+    name: str,
+    solver_fn: Callable,
+    A,
+    b,
+    x_esatto,
+    tolleranze: List[float],
+    profile: MatrixProfile = None,
+    single_pass: bool = False,
+    setup_time: float = 0.0,
+    histories: Dict[str, List[Tuple]] = None,
+    reordering: Reordering = None,
+    on_result: Callable = None
+) -> List[Result]:
+    """
+    Esegue un singolo metodo iterativo su tutte le tolleranze richieste,
+    stampa i risultati e ritorna la lista dei risultati.
+    Il profilo della matrice (se fornito) viene condiviso da tutte le chiamate.
+    Se histories è un dizionario, le esecuzioni sono strumentate e le coppie
+    (tolleranza, IterationRecorder) vengono salvate in histories[name].
+    Con reordering le soluzioni vengono riportate nell'ordinamento originale.
+    on_result riceve ogni Result appena prodotto.
+    """
+    esiti = _solve_method_on_tolerances(
+        solver_fn, A, b, x_esatto, tolleranze,
+        profile=profile, single_pass=single_pass, setup_time=setup_time,
+        record_history=histories is not None, on_result=on_result,
+    )
+    if histories is not None:
+        histories[name] = _histories(esiti)
+    return _print_method_results(name, _unpermute_esiti(esiti, reordering))
+
+
+def test_matrices_folder(
+    matrices_folder: str,
+    single_pass: bool = False,
+    preconditioner: str = None,
+    workers: int = None,
+    use_cache: bool = False,
+    record_history: bool = False,
+    reorder: str = None,
+    threads: int = None,
+    multicolor: bool = False,
+    precision: str = "double",
+    store: str = None,
+    predict: bool = False,
+    krylov: bool = False,
+    multigrid: bool = False,
+    relaxation: bool = False
+) -> None:
+    """
+    Esegue tutti i metodi iterativi su ogni matrice .mtx della cartella e salva risultati e grafici.
+    - single_pass: se True ogni metodo viene eseguito una sola volta per matrice
+      (fino alla tolleranza più stretta) con checkpoint sulle tolleranze intermedie.
+    - preconditioner: se indicato ('jacobi', 'ssor', 'ic0', 'amg') aggiunge il gradiente
+      coniugato precondizionato; il precondizionatore è fattorizzato una volta per matrice.
+    - workers: se > 1 le coppie (matrice, metodo) vengono eseguite in parallelo su un
+      pool di processi; CSV e grafici prodotti sono gli stessi dell'esecuzione seriale.
+    - use_cache: se True le matrici vengono lette dalla cache binaria CSR (vedi load_matrix).
+    - record_history: se True ogni esecuzione è strumentata con un IterationRecorder e
+      le storie del residuo (history.csv) e i contatori (instrumentation.csv) vengono
+      salvati accanto a output.csv.
+    - reorder: se indicato ('rcm') ogni sistema viene permutato per ridurre la banda
+      (località di A @ x e ordine degli sweep di Gauss-Seidel); la banda prima e dopo
+      viene stampata e la permutazione è applicata solo se la riduce. La permutazione
+      è salvata nella cache della matrice (use_cache) e le soluzioni sono riportate
+      nell'ordinamento originale.
+    - threads: thread del prodotto matrice-vettore usato da tutti i metodi (vedi
+      utils.spmv; default: impostazione corrente). Vale per l'esecuzione seriale.
+    - multicolor: se True aggiunge il Gauss-Seidel multicolore (classi di colore aggiornate
+      in blocco) e stampa il numero di colori e le iterazioni rispetto all'ordine naturale.
+    - precision: 'double' (default) oppure 'mixed': tutti i metodi iterano in float32 con
+      raffinamento iterativo in float64 (vedi utils.mixed_precision).
+    - store: file SQLite dei risultati (es. utils.results_store.DEFAULT_STORE). Ogni risultato
+      è salvato appena prodotto; le combinazioni (matrice, metodo, tolleranza, parametri) già
+      presenti non vengono rieseguite e output.csv e grafici sono rigenerati dall'archivio,
+      quindi un'esecuzione interrotta riprende da dove si era fermata. history.csv e
+      instrumentation.csv contengono solo le esecuzioni effettivamente svolte.
+    - predict: se True ogni matrice viene pre-analizzata (raggio spettrale delle matrici di
+      iterazione di Jacobi e Gauss-Seidel, condizionamento per gradiente e gradiente coniugato,
+      vedi utils.convergence): le esecuzioni previste divergenti, non applicabili od oltre il
+      massimo di iterazioni vengono saltate, si aggiunge il metodo Automatico (il più rapido
+      previsto) e le iterazioni previste sono stampate e salvate accanto a quelle effettive.
+    - krylov: se True aggiunge BiCGSTAB e GMRES con restart (non richiedono A simmetrica
+      definita positiva, né la diagonale dominante).
+    - multigrid: se True aggiunge il multigrid algebrico (V-cicli con smoother di Gauss-Seidel):
+      la gerarchia è costruita una volta per matrice, il suo costo va nel tempo di setup e,
+      nell'esecuzione seriale, viene stampato il riepilogo dei livelli con il costo medio di un V-ciclo.
+      Con preconditioner='amg' lo stesso V-ciclo precondiziona il gradiente coniugato.
+    - relaxation: se True aggiunge SOR e SSOR con omega quasi ottimo stimato una volta per
+      matrice (vedi iterative_methods.sor); omega e iterazioni risparmiate rispetto a
+      Gauss-Seidel sono stampati e salvati in output.csv.
+    """
     # Trova tutti i file .mtx nella cartella (ordinati per stabilità dell'output)
     matrix_files = sorted(
         f for f in os.listdir(matrices_folder) if f.lower().endswith(".mtx")
@@ -49,45 +406,146 @@ def test_matrices_folder(matrices_folder: str) -> None:
     # Diverse tolleranze per testare
     tolleranze = [1e-4, 1e-6, 1e-8, 1e-10]
 
-    # Mappa nome->funzione per evitare ripetizioni
-    metodi: Dict[str, Callable] = {
-        "Jacobi": jacobi,
-        "Gauss-Seidel": gauss_seidel,
-        "Gradiente": gradient,
-        "Gradiente coniugato": conjugate_gradient,
-    }
+    metodi: Dict[str, Callable] = dict(METODI)
+    nome_pcg = f"Gradiente coniugato ({preconditioner})"
+    if preconditioner is not None:
+        metodi[nome_pcg] = conjugate_gradient
+    if multicolor:
+        metodi[NOME_GS_MULTICOLORE] = METODI_OPZIONALI[NOME_GS_MULTICOLORE]
+    if predict:
+        metodi[NOME_AUTO] = METODI_OPZIONALI[NOME_AUTO]
+    if krylov:
+        metodi[NOME_BICGSTAB] = METODI_OPZIONALI[NOME_BICGSTAB]
+        metodi[NOME_GMRES] = METODI_OPZIONALI[NOME_GMRES]
+    if multigrid:
+        metodi[NOME_AMG] = METODI_OPZIONALI[NOME_AMG]
+    if relaxation:
+        metodi[NOME_SOR] = METODI_OPZIONALI[NOME_SOR]
+        metodi[NOME_SSOR] = METODI_OPZIONALI[NOME_SSOR]
 
     if not matrix_files:
         print(f"Nessun file .mtx trovato in: {matrices_folder}")
         return
 
-    # Cicla su ogni matrice trovata
-    for matrix_file in matrix_files:
-        matrix_name = os.path.splitext(matrix_file)[0]  # es: 'spa1' da 'spa1.mtx'
-        print(f"\n\n===== TEST MATRICE: {matrix_name} =====\n")
-
-        # Carica la matrice
-        A = load_matrix(os.path.join(matrices_folder, matrix_file))
-
-        # Prepara variabili
-        x_esatto, b = setup_variable(A)
-
-        # Dizionario per salvare i risultati
-        risultati: Dict[str, List[Result]] = {nome: [] for nome in metodi.keys()}
-
-        # Esecuzione test per ogni metodo su tutte le tolleranze
-        for nome, solver_fn in metodi.items():
-            risultati[nome] = _run_method_on_tolerances(
-                name=nome,
-                solver_fn=solver_fn,
-                A=A,
-                b=b,
-                x_esatto=x_esatto,
-                tolleranze=tolleranze,
+    if workers is not None and workers > 1:
+        from iterative_solver.parallel_runner import run_matrices_parallel
+        run_matrices_parallel(
+            [os.path.join(matrices_folder, f) for f in matrix_files],
+            tolleranze,
+            workers=workers,
+            single_pass=single_pass,
+            preconditioner=preconditioner,
+            use_cache=use_cache,
+            record_history=record_history,
+            reorder=reorder,
+            multicolor=multicolor,
+            precision=precision,
+            store=store,
+            predict=predict,
+            krylov=krylov,
+            multigrid=multigrid,
+            relaxation=relaxation,
+        )
+        return
+
+    archivio = ResultsStore(store) if store is not None else None
+    parametri = _store_params(single_pass, reorder, precision, predict)
+
+    with spmv_threads(get_spmv_threads() if threads is None else threads):
+        # Cicla su ogni matrice trovata
+        for matrix_file in matrix_files:
+            matrix_name = os.path.splitext(matrix_file)[0]  # es: 'spa1' da 'spa1.mtx'
+            print(f"\n\n===== TEST MATRICE: {matrix_name} =====\n")
+
+            # Carica la matrice e prepara le variabili (eventualmente riordinate)
+            A, b, x_esatto, ordinamento = _prepare_system(
+                os.path.join(matrices_folder, matrix_file), use_cache=use_cache, reorder=reorder,
             )
 
-        # === Salva i risultati specifici di questa matrice ===
-        results_saver(risultati, matrix_name=matrix_name)
+            # Analisi della matrice calcolata una sola volta e condivisa da tutti i solutori
+            profile = get_matrix_profile(A)
+            # Verifica SPD a livelli (condivisa da gradiente e gradiente coniugato)
+            print(profile.spd_certificate.report())
+
+            # Tolleranze ancora da calcolare per ogni metodo (tutte, senza archivio)
+            if archivio is None:
+                mancanti: Dict[str, List[float]] = {nome: tolleranze for nome in metodi.keys()}
+            else:
+                mancanti = {nome: archivio.missing(profile.key, nome, tolleranze, parametri) for nome in metodi.keys()}
+
+            # Precondizionatore fattorizzato una volta e riusato su tutte le tolleranze
+            solutori: Dict[str, Callable] = {nome: _with_precision(fn, precision) for nome, fn in metodi.items()}
+            setup_times: Dict[str, float] = {nome: 0.0 for nome in metodi.keys()}
+            if preconditioner is not None and mancanti[nome_pcg]:
+                M = _build_preconditioner(preconditioner, profile, precision)
+                solutori[nome_pcg] = _with_precision(partial(conjugate_gradient, preconditioner=M), precision)
+                setup_times[nome_pcg] = M.setup_time
+            if multicolor and mancanti[NOME_GS_MULTICOLORE]:
+                setup_times[NOME_GS_MULTICOLORE] = _multicolor_setup(profile)
+            if multigrid and mancanti[NOME_AMG]:
+                setup_times[NOME_AMG] = _amg_setup(profile, precision)
+            for nome in METODI_RILASSATI:
+                if nome in metodi and mancanti[nome]:
+                    setup_times[nome] = _relaxation_setup(profile, nome)
+
+            # Pre-analisi della convergenza (una volta per matrice, salvata nel profilo)
+            previsione = profile.convergence if predict else None
+            if previsione is not None:
+                print(previsione.report(tolleranze, DEFAULT_MAX_ITER))
+
+            # Dizionario per salvare i risultati
+            risultati: Dict[str, List[Result]] = {nome: [] for nome in metodi.keys()}
+            storie: Dict[str, List[Tuple]] = {} if record_history else None
+
+            # Esecuzione test per ogni metodo su tutte le tolleranze (ancora mancanti)
+            for nome, solver_fn in solutori.items():
+                salva = None
+                if archivio is not None:
+                    salva = partial(archivio.put, profile.key, matrix_name, nome, parametri)
+                da_eseguire, saltati = mancanti[nome], {}
+                if previsione is not None:
+                    da_eseguire, saltati = _apply_prediction(previsione, nome, mancanti[nome])
+                    _print_skipped(previsione, nome, saltati)
+                    if salva is not None:
+                        for risultato in saltati.values():
+                            salva(risultato)
+                eseguiti: List[Result] = []
+                if da_eseguire:
+                    eseguiti = _run_method_on_tolerances(
+                        name=nome,
+                        solver_fn=solver_fn,
+                        A=A,
+                        b=b,
+                        x_esatto=x_esatto,
+                        tolleranze=da_eseguire,
+                        profile=profile,
+                        single_pass=single_pass,
+                        setup_time=setup_times[nome],
+                        histories=storie,
+                        reordering=ordinamento,
+                        on_result=salva,
+                    )
+                risultati[nome] = _merge_results(mancanti[nome], eseguiti, saltati)
+                if archivio is not None:
+                    # Risultati completi (nuovi e già presenti) nell'ordine delle tolleranze
+                    if not mancanti[nome]:
+                        _print_stored(nome, archivio.results(profile.key, nome, tolleranze, parametri))
+                    risultati[nome] = archivio.results(profile.key, nome, tolleranze, parametri)
+
+            if multicolor:
+                _print_multicolor_report(profile.n_colors, risultati)
+            if multigrid and mancanti[NOME_AMG]:
+                _print_amg_report(profile, precision)
+            previste = _print_prediction_report(previsione, risultati) if previsione is not None else None
+            rilassati = _print_relaxation_report(profile, risultati) if relaxation else None
+
+            # === Salva i risultati specifici di questa matrice ===
+            results_saver(risultati, matrix_name=matrix_name, histories=storie, predictions=previste,
+                          relaxation=rilassati)
+
+            # === Genera i grafici specifici di questa matrice ===
+            plot_results(risultati, matrix_name=matrix_name)
 
-        # === Genera i grafici specifici di questa matrice ===
-        plot_results(risultati, matrix_name=matrix_name)
+    if archivio is not None:
+        print(f"\nArchivio dei risultati: {archivio.path} ({len(archivio)} risultati)")
+        archivio.close()
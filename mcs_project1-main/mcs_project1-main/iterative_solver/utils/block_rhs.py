@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+
+
+def is_block(b) -> bool:
+    """True se b è un blocco di termini noti (n, k) anziché un singolo vettore."""
+    return np.ndim(b) == 2
+
+
+def column_norms(M) -> np.ndarray:
+    """Norme euclidee delle colonne di M."""
+    return np.sqrt(np.einsum("ij,ij->j", M, M))
+
+
+def column_dots(U, V) -> np.ndarray:
+    """Prodotti scalari colonna per colonna: out[j] = U[:, j] · V[:, j]."""
+    return np.einsum("ij,ij->j", U, V)
+
+
+def block_errors(X, X_exact) -> np.ndarray:
+    """Errore relativo per colonna (assoluto sulle colonne con soluzione esatta nulla)."""
+    diff = column_norms(X - X_exact)
+    nx = column_norms(X_exact)
+    out = diff.copy()
+    nz = nx > 0
+    out[nz] = diff[nz] / nx[nz]
+    return out
+
+
+def check_block(B, X_exact):
+    """Verifica le dimensioni di un blocco di termini noti e delle soluzioni esatte."""
+    B = np.asarray(B, dtype=np.float64)
+    X_exact = np.asarray(X_exact, dtype=np.float64)
+    if X_exact.shape != B.shape:
+        raise ValueError(f"Dimensioni incoerenti: B è {B.shape} ma x_exact è {X_exact.shape}.")
+    return B, X_exact
+
+
+def solve_columns(solve, B, X_exact, X0=None):
+    """
+    Risolve un blocco di termini noti colonna per colonna con solve(b, x_exact, x0),
+    per i metodi senza un ciclo a blocchi dedicato.
+    Ritorna (X, iterazioni[k], errore_relativo[k], tempo, convergenza[k]).
+    """
+    B, X_exact = check_block(B, X_exact)
+    _, k = B.shape
+    X = np.zeros_like(B)
+    iterazioni = np.zeros(k, dtype=int)
+    convergenza = np.zeros(k, dtype=bool)
+    start_time = time.time()
+    for j in range(k):
+        x0 = None if X0 is None else np.asarray(X0)[:, j]
+        x, iterazioni[j], _, _, convergenza[j] = solve(B[:, j], X_exact[:, j], x0)
+        X[:, j] = x
+    return X, iterazioni, block_errors(X, X_exact), time.time() - start_time, convergenza
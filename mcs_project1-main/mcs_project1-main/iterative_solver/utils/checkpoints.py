@@ -0,0 +1,83 @@
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class ToleranceCheckpoints:
+    """
+    Checkpoint di un'unica esecuzione di un metodo iterativo su più tolleranze.
+
+    Il metodo viene lanciato una sola volta con la tolleranza più stretta; ogni
+    volta che il residuo relativo scende sotto una delle tolleranze richieste
+    vengono registrati iterazioni, tempo trascorso, errore relativo e
+    (se keep_x=True) una copia della soluzione corrente.
+    """
+
+    def __init__(self, tolerances, x_exact=None, keep_x: bool = False):
+        """
+        Parametri:
+        - tolerances: lista delle tolleranze richieste
+        - x_exact: soluzione esatta (per l'errore relativo); può essere None
+        - keep_x: se True salva una copia di x ad ogni checkpoint
+        """
+        self.tolerances = list(tolerances)
+        # Dalla più larga alla più stretta: vengono attraversate in quest'ordine
+        self._pending = sorted(set(self.tolerances), reverse=True)
+        self.x_exact = x_exact
+        self.keep_x = keep_x
+        self._nx = np.linalg.norm(x_exact) if x_exact is not None else 0.0
+        self._records: Dict[float, Tuple] = {}
+
+    @property
+    def tightest(self) -> float:
+        """Tolleranza con cui eseguire il metodo."""
+        return min(self.tolerances)
+
+    def _err_rel(self, x):
+        if self.x_exact is None:
+            return None
+        if self._nx > 0:
+            return np.linalg.norm(x - self.x_exact) / self._nx
+        return np.linalg.norm(x - self.x_exact)
+
+    def crosses(self, res_rel: float) -> bool:
+        """True se res_rel attraversa una tolleranza ancora in attesa (per metodi che formano x solo su richiesta)."""
+        return bool(self._pending) and res_rel <= self._pending[0]
+
+    def observe(self, iterations: int, res_rel: float, x, start_time: float) -> None:
+        """
+        Da chiamare ad ogni nuova valutazione del residuo relativo.
+        Costa un solo confronto finché non viene attraversata una tolleranza.
+        """
+        if not self._pending or res_rel > self._pending[0]:
+            return
+        elapsed = time.time() - start_time
+        err = self._err_rel(x)
+        snapshot = x.copy() if self.keep_x else None
+        while self._pending and res_rel <= self._pending[0]:
+            tol = self._pending.pop(0)
+            self._records[tol] = (iterations, err, elapsed, True, snapshot)
+
+    def finish(self, x, iterations: int, err_rel, elapsed: float, converged: bool) -> None:
+        """
+        Completa i checkpoint con il risultato finale del metodo: le tolleranze
+        mai attraversate ricevono i valori finali (convergenza = converged).
+        """
+        snapshot = x.copy() if self.keep_x else None
+        for tol in self._pending:
+            self._records[tol] = (iterations, err_rel, elapsed, converged, snapshot)
+        self._pending = []
+
+    def result(self, tol) -> Tuple:
+        """Ritorna (x, iterazioni, errore_relativo, tempo, convergenza) per la tolleranza tol."""
+        iterations, err, elapsed, conv, snapshot = self._records[tol]
+        return snapshot, iterations, err, elapsed, conv
+
+    def results(self) -> List[Tuple[float, int, float, float, bool]]:
+        """Lista di tuple (tol, iterazioni, errore_relativo, tempo, convergenza) nell'ordine richiesto."""
+        out = []
+        for tol in self.tolerances:
+            _, iterations, err, elapsed, conv = self.result(tol)
+            out.append((tol, iterations, err, elapsed, conv))
+        return out
@@ -0,0 +1,48 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def adjacency_pattern(A):
+    """Struttura (simmetrizzata, senza diagonale) del grafo di adiacenza di A, in formato CSR."""
+    A = sp.csr_matrix(A)
+    P = sp.csr_matrix((np.ones(A.nnz, dtype=np.int8), A.indices, A.indptr), shape=A.shape)
+    P = (P + P.T).tocsr()
+    P.setdiag(0)
+    P.eliminate_zeros()
+    return P
+
+
+def greedy_coloring(A) -> np.ndarray:
+    """
+    Colorazione greedy (first-fit, in ordine naturale) del grafo di adiacenza di A.
+
+    Righe dello stesso colore non sono mai accoppiate da A (né da A^T), quindi
+    possono essere aggiornate insieme in uno sweep di Gauss-Seidel.
+    Ritorna colors[i] in 0..n_colori-1.
+    """
+    P = adjacency_pattern(A)
+    n = P.shape[0]
+    indptr, indices = P.indptr.tolist(), P.indices.tolist()
+    colors = [-1] * n
+    # mark[c] == i se il colore c è già usato da un vicino della riga i
+    mark = [-1] * (int(np.max(np.diff(P.indptr), initial=0)) + 2)
+    for i in range(n):
+        for j in indices[indptr[i]:indptr[i + 1]]:
+            c = colors[j]
+            if c >= 0:
+                mark[c] = i
+        c = 0
+        while mark[c] == i:
+            c += 1
+        colors[i] = c
+    return np.asarray(colors, dtype=np.int64)
+
+
+def color_classes(colors) -> list:
+    """Indici (ordinati) delle righe di ciascun colore."""
+    colors = np.asarray(colors)
+    if colors.size == 0:
+        return []
+    ordine = np.argsort(colors, kind="stable")
+    confini = np.searchsorted(colors[ordine], np.arange(int(colors.max()) + 2))
+    return [ordine[s:e] for s, e in zip(confini[:-1], confini[1:])]
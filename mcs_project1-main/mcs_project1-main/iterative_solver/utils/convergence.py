@@ -0,0 +1,194 @@
+import math
+import time
+
+import numpy as np
+import scipy.sparse.linalg as spla
+
+from iterative_solver.utils.matrix_profile import _jacobi_spectrum
+from iterative_solver.utils.spmv import spmv_kernel
+
+# Massimo numero di iterazioni dei metodi (default di jacobi, gauss_seidel, gradient, conjugate_gradient)
+DEFAULT_MAX_ITER = 20000
+
+# Metodi per cui viene fatta la previsione, nell'ordine di preferenza a parità di costo
+PREDICTED_METHODS = ("conjugate_gradient", "gauss_seidel", "jacobi", "gradient")
+
+# Tolleranza di ARPACK sugli autovalori estremi: basta la seconda cifra significativa
+_EIG_TOL = 1e-3
+_EIG_MAXITER = 300
+# Prodotti (o sweep) usati per misurare il costo di un'iterazione
+_TIMING_REPEATS = 3
+
+
+class MethodPrediction:
+    """
+    Previsione della convergenza di un metodo su una matrice.
+
+    rate è il fattore di riduzione del residuo per iterazione: raggio spettrale della
+    matrice di iterazione per Jacobi e Gauss-Seidel, (k-1)/(k+1) per il gradiente e
+    (sqrt(k)-1)/(sqrt(k)+1) per il gradiente coniugato (k = numero di condizionamento).
+    Per gradiente e gradiente coniugato la stima è un limite superiore (asintotico);
+    reason è valorizzato se il metodo non è applicabile alla matrice.
+    """
+
+    def __init__(self, method: str, rate: float = None, time_per_iter: float = None, reason: str = None,
+                 constant: float = 1.0):
+        self.method = method
+        self.rate = rate
+        self.time_per_iter = time_per_iter
+        self.reason = reason
+        # Costante del limite: residuo_k <= constant * rate^k
+        self.constant = constant
+
+    @property
+    def applicable(self) -> bool:
+        return self.reason is None
+
+    @property
+    def diverges(self) -> bool:
+        return self.rate is not None and self.rate >= 1.0
+
+    def iterations(self, tol: float):
+        """Iterazioni previste per ridurre il residuo relativo sotto tol (None se non converge o non stimabile)."""
+        if not self.applicable or self.rate is None or self.diverges:
+            return None
+        if self.rate <= 0.0:
+            return 1
+        return max(1, math.ceil(math.log(tol / self.constant) / math.log(self.rate)))
+
+    def expected_time(self, tol: float):
+        iterazioni = self.iterations(tol)
+        if iterazioni is None or self.time_per_iter is None:
+            return None
+        return iterazioni * self.time_per_iter
+
+    def skip_reason(self, tol: float, max_iter: int = DEFAULT_MAX_ITER):
+        """Motivo per cui conviene non eseguire il metodo a tolleranza tol (None se va eseguito)."""
+        if not self.applicable:
+            return f"non applicabile ({self.reason})"
+        if self.diverges:
+            return f"previsto divergente (fattore di riduzione stimato {self.rate:.4f} >= 1)"
+        iterazioni = self.iterations(tol)
+        if iterazioni is not None and iterazioni > max_iter:
+            return f"previste {iterazioni} iterazioni, oltre il massimo di {max_iter}"
+        return None
+
+
+class ConvergencePrediction:
+    """Previsioni di tutti i metodi su una matrice (vedi predict_convergence)."""
+
+    def __init__(self, methods: dict, setup_time: float = 0.0):
+        self.methods = methods
+        self.setup_time = setup_time
+
+    def __getitem__(self, method: str) -> MethodPrediction:
+        return self.methods[method]
+
+    def __contains__(self, method: str) -> bool:
+        return method in self.methods
+
+    def best(self, tol: float, max_iter: int = DEFAULT_MAX_ITER):
+        """Metodo con il minor tempo previsto a tolleranza tol (None se nessuno è previsto convergente)."""
+        candidati = []
+        for ordine, nome in enumerate(PREDICTED_METHODS):
+            previsione = self.methods.get(nome)
+            if previsione is None or previsione.skip_reason(tol, max_iter) is not None:
+                continue
+            tempo = previsione.expected_time(tol)
+            candidati.append((tempo if tempo is not None else math.inf, ordine, nome))
+        return min(candidati)[2] if candidati else None
+
+    def report(self, tolleranze, max_iter: int = DEFAULT_MAX_ITER) -> str:
+        righe = [f"Previsione della convergenza (stima in {self.setup_time:.4f} s):"]
+        for nome in PREDICTED_METHODS:
+            previsione = self.methods.get(nome)
+            if previsione is None:
+                continue
+            if not previsione.applicable:
+                righe.append(f"- {nome}: non applicabile ({previsione.reason})")
+                continue
+            fattore = f"{previsione.rate:.6f}" if previsione.rate is not None else "n.d."
+            stime = []
+            for tol in tolleranze:
+                iterazioni = previsione.iterations(tol)
+                stime.append(f"{tol:.0e}: {iterazioni if iterazioni is not None else '-'}")
+            righe.append(f"- {nome}: fattore {fattore}, iterazioni previste ({', '.join(stime)})")
+        for tol in tolleranze:
+            righe.append(f"- metodo più rapido previsto a {tol:.0e}: {self.best(tol, max_iter) or 'nessuno'}")
+        return "\n".join(righe)
+
+
+def _spectral_radius(apply, n: int):
+    """Raggio spettrale di v -> apply(v) (modulo dell'autovalore dominante, Arnoldi di ARPACK)."""
+    if n < 3:
+        G = np.column_stack([apply(e) for e in np.eye(n)])
+        return float(np.max(np.abs(np.linalg.eigvals(G)))) if n else 0.0
+    op = spla.LinearOperator((n, n), matvec=apply, dtype=np.float64)
+    try:
+        w = spla.eigs(op, k=1, which="LM", tol=_EIG_TOL, maxiter=_EIG_MAXITER, return_eigenvectors=False)
+    except spla.ArpackNoConvergence as exc:
+        if len(exc.eigenvalues) == 0:
+            return None
+        w = exc.eigenvalues
+    return float(np.abs(w[0]))
+
+
+def _time_per_call(fn, v) -> float:
+    fn(v)
+    start_time = time.perf_counter()
+    for _ in range(_TIMING_REPEATS):
+        fn(v)
+    return (time.perf_counter() - start_time) / _TIMING_REPEATS
+
+
+def predict_convergence(profile) -> ConvergencePrediction:
+    """
+    Pre-analisi della matrice del profilo: fattore di riduzione per iterazione di
+    jacobi, gauss_seidel, gradient e conjugate_gradient e costo misurato di un'iterazione.
+
+    - Jacobi e Gauss-Seidel: raggio spettrale di I - D^{-1} A e di I - (D + L)^{-1} A
+      con poche iterazioni di Arnoldi (ARPACK), applicando la matrice di iterazione
+      tramite un prodotto o uno sweep con termine noto nullo.
+    - Gradiente e gradiente coniugato (solo A SPD): numero di condizionamento da
+      lambda_min e lambda_max di A stimati con Lanczos.
+    """
+    start_time = time.time()
+    A, n = profile.A, profile.n
+    matvec = spmv_kernel(A, profile)
+    v = np.random.default_rng(0).standard_normal(n)
+    t_matvec = _time_per_call(matvec, v)
+    previsioni = {}
+
+    if profile.has_zero_diagonal:
+        motivo = "diagonale con elementi nulli"
+        previsioni["jacobi"] = MethodPrediction("jacobi", reason=motivo)
+        previsioni["gauss_seidel"] = MethodPrediction("gauss_seidel", reason=motivo)
+    else:
+        inv_diag = profile.inv_diag
+        rho_j = _spectral_radius(lambda x: x - inv_diag * matvec(x), n)
+        previsioni["jacobi"] = MethodPrediction("jacobi", rho_j, t_matvec)
+
+        engine = profile.sweep_engine
+        zeros = np.zeros(n)
+
+        def sweep(x):
+            run = engine.start(zeros, np.array(x, dtype=np.float64))
+            run.sweep()
+            return run.x
+
+        rho_gs = _spectral_radius(sweep, n)
+        previsioni["gauss_seidel"] = MethodPrediction("gauss_seidel", rho_gs, _time_per_call(sweep, v))
+
+    if profile.is_spd:
+        lmin, lmax = _jacobi_spectrum(A, np.ones(n), margin=0.0)
+        kappa = lmax / lmin if lmin > 0 else math.inf
+        rate_g = (kappa - 1.0) / (kappa + 1.0)
+        rate_cg = (math.sqrt(kappa) - 1.0) / (math.sqrt(kappa) + 1.0)
+        previsioni["gradient"] = MethodPrediction("gradient", rate_g, t_matvec)
+        previsioni["conjugate_gradient"] = MethodPrediction("conjugate_gradient", rate_cg, t_matvec, constant=2.0)
+    else:
+        motivo = "A non simmetrica definita positiva"
+        previsioni["gradient"] = MethodPrediction("gradient", reason=motivo)
+        previsioni["conjugate_gradient"] = MethodPrediction("conjugate_gradient", reason=motivo)
+
+    return ConvergencePrediction(previsioni, setup_time=time.time() - start_time)
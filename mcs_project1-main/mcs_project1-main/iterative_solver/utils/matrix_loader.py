@@ -1,17 +1,193 @@
+import hashlib
+import json
+import os
+
+import numpy as np
 from scipy.io import mmread
 from scipy.sparse import csr_matrix
 
-def load_matrix(filepath):
+from iterative_solver.utils.mtx_reader import read_mtx_csr, supports_streaming, write_mtx_csr
+from iterative_solver.utils.out_of_core import MemmapCSR
+
+# Versione del formato della cache binaria: se cambia, le cache esistenti vengono ricostruite
+CACHE_VERSION = 1
+_CACHE_ARRAYS = ("data", "indices", "indptr")
+
+
+def _cache_dir(filepath):
+    """Cartella sidecar con gli array CSR già convertiti (es. 'vem1.mtx.csrcache')."""
+    return filepath + ".csrcache"
+
+
+def _file_digest(filepath, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_key(filepath, cache_key):
+    """Chiave di validità della cache: dimensione e mtime del file, oppure hash del contenuto."""
+    st = os.stat(filepath)
+    if cache_key == "hash":
+        return {"digest": _file_digest(filepath)}
+    if cache_key == "stat":
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    raise ValueError(f"cache_key sconosciuta: {cache_key!r}. Valori ammessi: 'stat', 'hash'.")
+
+
+def _valid_meta(filepath, cache_key):
+    """Metadati della cache binaria se esiste ed è aggiornata rispetto al file sorgente, altrimenti None."""
+    try:
+        with open(os.path.join(_cache_dir(filepath), "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_VERSION or meta.get("source") != _source_key(filepath, cache_key):
+        return None
+    return meta
+
+
+def _perm_path(filepath, method):
+    return os.path.join(_cache_dir(filepath), f"perm_{method}.npy")
+
+
+def load_cached_permutation(filepath, method, cache_key="stat"):
+    """Permutazione di riordinamento salvata accanto alla matrice in cache, oppure None."""
+    if _valid_meta(filepath, cache_key) is None:
+        return None
+    try:
+        return np.load(_perm_path(filepath, method))
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_permutation(filepath, method, perm, cache_key="stat"):
+    """Salva la permutazione nella cache della matrice (solo se la cache della matrice è valida)."""
+    if _valid_meta(filepath, cache_key) is None:
+        return
+    path = _perm_path(filepath, method)
+    try:
+        np.save(path + ".tmp.npy", np.asarray(perm))
+        os.replace(path + ".tmp.npy", path)
+    except OSError:
+        pass
+
+
+def _load_cached(filepath, cache_key):
+    """Ritorna la matrice dalla cache (array memory-mapped, nessuna copia) oppure None se assente/obsoleta."""
+    cache_dir = _cache_dir(filepath)
+    meta = _valid_meta(filepath, cache_key)
+    if meta is None:
+        return None
+
+    try:
+        arrays = [np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in _CACHE_ARRAYS]
+    except (OSError, ValueError):
+        return None
+    data, indices, indptr = arrays
+    return csr_matrix((data, indices, indptr), shape=tuple(meta["shape"]), copy=False)
+
+
+def _invalidate_cache(cache_dir):
+    """Rimuove meta.json (cache non valida durante la scrittura) e le permutazioni della matrice precedente."""
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    for name in os.listdir(cache_dir):
+        if name.startswith("perm_"):
+            os.remove(os.path.join(cache_dir, name))
+
+
+def _write_meta(filepath, cache_key, shape, dtype):
+    meta = {
+        "version": CACHE_VERSION,
+        "source": _source_key(filepath, cache_key),
+        "shape": list(shape),
+        "dtype": np.dtype(dtype).str,
+    }
+    meta_path = os.path.join(_cache_dir(filepath), "meta.json")
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+def _save_cache(filepath, A, cache_key):
+    """Scrive gli array CSR in formato .npy; meta.json viene scritto per ultimo (cache valida solo se completa)."""
+    cache_dir = _cache_dir(filepath)
+    try:
+        _invalidate_cache(cache_dir)
+        for name in _CACHE_ARRAYS:
+            tmp = os.path.join(cache_dir, f"{name}.tmp.npy")
+            np.save(tmp, getattr(A, name))
+            os.replace(tmp, os.path.join(cache_dir, f"{name}.npy"))
+        _write_meta(filepath, cache_key, A.shape, A.dtype)
+    except OSError:
+        # Cartella non scrivibile: la cache è solo un'ottimizzazione
+        pass
+
+
+def _load_out_of_core(filepath, cache_key):
+    """
+    MemmapCSR sugli array della cache (stesso formato di use_cache). Se la cache manca o
+    è obsoleta il file .mtx viene convertito con write_mtx_csr senza caricarlo in memoria
+    (formati non gestiti dal lettore a blocchi: lettura con mmread e salvataggio della CSR).
+    """
+    cache_dir = _cache_dir(filepath)
+    if _valid_meta(filepath, cache_key) is None:
+        _invalidate_cache(cache_dir)
+        if supports_streaming(filepath):
+            shape, _ = write_mtx_csr(filepath, cache_dir)
+            _write_meta(filepath, cache_key, shape, np.float64)
+        else:
+            A = csr_matrix(mmread(filepath))
+            A.sum_duplicates()
+            A.sort_indices()
+            _save_cache(filepath, A, cache_key)
+    return MemmapCSR(cache_dir)
+
+
+def load_matrix(filepath, use_cache=False, cache_key="stat", streaming=False, out_of_core=False):
     """
     Carica una matrice dal file .mtx e la restituisce in formato sparso CSR.
 
     Parametri:
     - filepath (str): percorso del file .mtx
+    - use_cache (bool): se True salva/legge gli array CSR in una cache binaria
+      accanto al file ('<file>.csrcache/'); i caricamenti successivi fanno
+      memory-map degli array senza rileggere il testo Matrix Market.
+    - cache_key (str): 'stat' (dimensione + mtime del file) oppure 'hash'
+      (hash del contenuto) per invalidare la cache quando il file cambia.
+    - streaming (bool): se True usa il lettore a blocchi read_mtx_csr, che costruisce
+      la CSR direttamente con memoria di picco ~1x la matrice finale
+      (solo formato 'coordinate'; negli altri casi si usa mmread).
+    - out_of_core (bool): se True converte il file (una volta, nella cartella della cache)
+      e ritorna una MemmapCSR, la matrice su disco con prodotto in streaming (vedi
+      utils.out_of_core) per matrici più grandi della memoria.
 
     Ritorna:
-    - A (csr_matrix): matrice sparsa in formato CSR
+    - A (csr_matrix): matrice sparsa in formato CSR (MemmapCSR con out_of_core=True)
     """
-    A = mmread(filepath)  # Legge la matrice (sparse)
-    if not isinstance(A, csr_matrix):
-        A = csr_matrix(A)  # Converte in CSR se non lo è già
+    if out_of_core:
+        return _load_out_of_core(filepath, cache_key)
+    if use_cache:
+        A = _load_cached(filepath, cache_key)
+        if A is not None:
+            return A
+
+    A = None
+    if streaming and supports_streaming(filepath):
+        A = read_mtx_csr(filepath)
+    if A is None:  # Formato non gestito dal lettore a blocchi: fallback su mmread
+        A = mmread(filepath)  # Legge la matrice (sparse)
+        if not isinstance(A, csr_matrix):
+            A = csr_matrix(A)  # Converte in CSR se non lo è già
+
+    if use_cache:
+        # Forma canonica (indici ordinati, senza duplicati): gli array in cache sono di sola lettura
+        A.sum_duplicates()
+        A.sort_indices()
+        _save_cache(filepath, A, cache_key)
     return A
@@ -0,0 +1,313 @@
+import hashlib
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# Numero massimo di profili mantenuti in memoria (politica LRU)
+PROFILE_CACHE_SIZE = 8
+# Margine relativo con cui sono allargati gli estremi stimati dello spettro di D^{-1} A
+JACOBI_SPECTRUM_MARGIN = 0.02
+
+_profile_cache: "OrderedDict[str, MatrixProfile]" = OrderedDict()
+
+
+def matrix_fingerprint(A) -> str:
+    """
+    Calcola un'impronta del contenuto della matrice (forma, dtype, struttura e valori).
+    Due matrici con lo stesso contenuto hanno la stessa impronta.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((A.shape, str(A.dtype))).encode())
+    if sp.issparse(A):
+        A = A.tocsr()
+        for arr in (A.indptr, A.indices, A.data):
+            h.update(np.ascontiguousarray(arr).view(np.uint8))
+    else:
+        h.update(np.ascontiguousarray(A).view(np.uint8))
+    return h.hexdigest()
+
+
+def _jacobi_spectrum(A, diag, margin: float = JACOBI_SPECTRUM_MARGIN):
+    """
+    Stima [lambda_min, lambda_max] di D^{-1} A per A simmetrica con diagonale positiva
+    (A matrice oppure LinearOperator).
+
+    Lavora sulla matrice simmetrica S = D^{-1/2} A D^{-1/2} (stesso spettro di D^{-1} A):
+    lambda_max con Lanczos (eigsh 'LA'), lambda_min come lambda_max - max autovalore
+    di (lambda_max I - S), che converge molto meglio di eigsh(which='SA').
+    Gli estremi vengono allargati del margine relativo indicato.
+    """
+    d_half = 1.0 / np.sqrt(diag)
+    if sp.issparse(A) or isinstance(A, np.ndarray):
+        S = sp.diags(d_half) @ A @ sp.diags(d_half)
+    else:
+        # Operatore non assemblato: S applicata come D^{-1/2} (A (D^{-1/2} v))
+        S = spla.LinearOperator(A.shape, matvec=lambda v: d_half * (A @ (d_half * v)), dtype=np.float64)
+    n = A.shape[0]
+    if n < 3:
+        S = S.toarray() if sp.issparse(S) else S @ np.eye(n)
+        w = np.linalg.eigvalsh(np.asarray(S))
+        lmin, lmax = float(w[0]), float(w[-1])
+    else:
+        lmax = float(spla.eigsh(S, k=1, which='LA', tol=1e-3, return_eigenvectors=False)[0])
+        shifted = spla.LinearOperator(S.shape, matvec=lambda v: lmax * v - S @ v, dtype=np.float64)
+        mu = float(spla.eigsh(shifted, k=1, which='LA', tol=1e-3, return_eigenvectors=False)[0])
+        lmin = lmax - mu
+    return lmin * (1.0 - margin), lmax * (1.0 + margin)
+
+
+class MatrixProfile:
+    """
+    Analisi di una matrice condivisa da tutti i metodi iterativi e da tutte le tolleranze.
+
+    Le proprietà sono calcolate alla prima richiesta e poi memorizzate, così
+    simmetria, definita positività, dominanza diagonale e splitting D/L/U
+    vengono derivati una sola volta per matrice.
+    """
+
+    SYMMETRY_ATOL = 1e-12
+    DOMINANCE_ATOL = 1e-15
+
+    def __init__(self, A, key: str = None):
+        if sp.issparse(A) and not sp.isspmatrix_csr(A):
+            A = A.tocsr()
+        self.A = A
+        self.key = key if key is not None else matrix_fingerprint(A)
+        self.shape = A.shape
+        self.n = A.shape[0]
+        # Precondizionatori già fattorizzati per questa matrice (nome -> oggetto)
+        self.preconditioners = {}
+        # Parametri di rilassamento già stimati per SOR/SSOR (variante -> Relaxation)
+        self.relaxation = {}
+        # Kernel SpMV già partizionati per questa matrice (numero di thread -> SpMVKernel)
+        self.spmv_kernels = {}
+
+    # --- Diagonale ---
+    @cached_property
+    def diag(self) -> np.ndarray:
+        return np.asarray(self.A.diagonal(), dtype=np.float64)
+
+    @cached_property
+    def inv_diag(self) -> np.ndarray:
+        """Inversa della diagonale (0 dove la diagonale è nulla)."""
+        inv = np.zeros_like(self.diag)
+        nz = self.diag != 0
+        inv[nz] = 1.0 / self.diag[nz]
+        return inv
+
+    @cached_property
+    def zero_diagonal_rows(self) -> np.ndarray:
+        return np.where(self.diag == 0)[0]
+
+    @property
+    def has_zero_diagonal(self) -> bool:
+        return self.zero_diagonal_rows.size > 0
+
+    # --- Statistiche nnz ---
+    @cached_property
+    def nnz(self) -> int:
+        return int(self.A.nnz) if sp.issparse(self.A) else int(np.count_nonzero(self.A))
+
+    @cached_property
+    def nnz_per_row(self) -> np.ndarray:
+        if sp.issparse(self.A):
+            return np.diff(self.A.indptr)
+        return np.count_nonzero(self.A, axis=1)
+
+    @cached_property
+    def nnz_stats(self) -> dict:
+        per_row = self.nnz_per_row
+        return {
+            "nnz": self.nnz,
+            "density": self.nnz / float(self.shape[0] * self.shape[1]),
+            "min_row": int(per_row.min()) if per_row.size else 0,
+            "max_row": int(per_row.max()) if per_row.size else 0,
+            "mean_row": float(per_row.mean()) if per_row.size else 0.0,
+        }
+
+    # --- Simmetria e definita positività ---
+    @cached_property
+    def symmetry_defect(self) -> float:
+        """max |A - A^T| (0 se la matrice è esattamente simmetrica)."""
+        if sp.issparse(self.A):
+            diff = (self.A - self.A.T).tocoo()
+            return float(np.max(np.abs(diff.data))) if diff.nnz > 0 else 0.0
+        return float(np.max(np.abs(self.A - self.A.T))) if self.A.size else 0.0
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.symmetry_defect <= self.SYMMETRY_ATOL
+
+    @cached_property
+    def spd_certificate(self):
+        """Verifica a livelli di "A simmetrica definita positiva" (vedi utils.spd_certificate)."""
+        from iterative_solver.utils.spd_certificate import certify_spd
+        return certify_spd(self)
+
+    @property
+    def is_positive_definite(self) -> bool:
+        return self.spd_certificate.is_spd
+
+    @property
+    def is_spd(self) -> bool:
+        return self.is_symmetric and self.is_positive_definite
+
+    # --- Dominanza diagonale (per righe) ---
+    @cached_property
+    def offdiag_row_sums(self) -> np.ndarray:
+        """Somma per riga dei moduli degli elementi extra-diagonali."""
+        row_sums = np.asarray(abs(self.A).sum(axis=1)).ravel()
+        return row_sums - np.abs(self.diag)
+
+    @property
+    def is_diagonally_dominant(self) -> bool:
+        """Dominanza diagonale debole per righe."""
+        return bool(np.all(np.abs(self.diag) >= self.offdiag_row_sums - self.DOMINANCE_ATOL))
+
+    @property
+    def has_strictly_dominant_row(self) -> bool:
+        return bool(np.any(np.abs(self.diag) > self.offdiag_row_sums + self.DOMINANCE_ATOL))
+
+    # --- Spettro della matrice di iterazione di Jacobi ---
+    @cached_property
+    def jacobi_extremes(self):
+        """
+        Estremi (lambda_min, lambda_max) stimati dello spettro di D^{-1} A, senza margine.
+        Richiede A simmetrica con diagonale positiva (spettro reale).
+        """
+        if not self.is_symmetric or np.any(self.diag <= 0):
+            raise ValueError("La stima dello spettro di D^-1 A richiede A simmetrica con diagonale positiva.")
+        return _jacobi_spectrum(self.A, self.diag, margin=0.0)
+
+    @cached_property
+    def jacobi_spectrum(self):
+        """
+        Estremi di jacobi_extremes allargati del margine JACOBI_SPECTRUM_MARGIN
+        (intervallo che contiene lo spettro, per Chebyshev e lo smoother del multigrid).
+        """
+        lmin, lmax = self.jacobi_extremes
+        return lmin * (1.0 - JACOBI_SPECTRUM_MARGIN), lmax * (1.0 + JACOBI_SPECTRUM_MARGIN)
+
+    # --- Splitting A = D + L + U ---
+    @cached_property
+    def L(self):
+        """Parte strettamente triangolare inferiore (CSR)."""
+        return sp.tril(self.A, k=-1, format="csr")
+
+    @cached_property
+    def U(self):
+        """Parte strettamente triangolare superiore (CSR)."""
+        return sp.triu(self.A, k=1, format="csr")
+
+    @cached_property
+    def off_diagonal(self):
+        """L + U: A con la diagonale rimossa (CSR)."""
+        return (self.L + self.U).tocsr()
+
+    @cached_property
+    def sweep_engine(self):
+        """Motore di sweep Gauss-Seidel con le fattorizzazioni triangolari riusabili."""
+        from iterative_solver.iterative_methods.sweep_engine import SweepEngine
+        return SweepEngine(self.A, diag=self.diag, L=self.L, U=self.U)
+
+    # --- Colorazione del grafo (Gauss-Seidel multicolore) ---
+    @cached_property
+    def coloring(self) -> np.ndarray:
+        """Colore di ogni riga (colorazione greedy del grafo di adiacenza di A)."""
+        from iterative_solver.utils.coloring import greedy_coloring
+        return greedy_coloring(self.A)
+
+    @property
+    def n_colors(self) -> int:
+        return int(self.coloring.max()) + 1 if self.coloring.size else 0
+
+    @cached_property
+    def multicolor_engine(self):
+        """Motore di sweep Gauss-Seidel multicolore basato su coloring."""
+        from iterative_solver.iterative_methods.sweep_engine import MulticolorSweepEngine
+        return MulticolorSweepEngine(self.A, self.coloring, diag=self.diag)
+
+    # --- Previsione della convergenza ---
+    @cached_property
+    def convergence(self):
+        """Fattori di riduzione stimati e iterazioni previste dei metodi (vedi utils.convergence)."""
+        from iterative_solver.utils.convergence import predict_convergence
+        return predict_convergence(self)
+
+    # --- Precisione mista ---
+    @cached_property
+    def single(self) -> "SinglePrecisionProfile":
+        """Profilo della copia float32 di A (iterazioni interne della precisione mista)."""
+        return SinglePrecisionProfile(self)
+
+
+class SinglePrecisionProfile(MatrixProfile):
+    """
+    Profilo della copia float32 di una matrice.
+
+    Splitting, fattorizzazioni e kernel sono costruiti sui dati float32, mentre
+    simmetria, definita positività, dominanza diagonale, spettro e colorazione
+    sono quelli (calcolati una volta) del profilo in doppia precisione.
+    """
+
+    def __init__(self, parent: MatrixProfile):
+        super().__init__(parent.A.astype(np.float32), key=parent.key + ":float32")
+        self.parent = parent
+
+    @property
+    def symmetry_defect(self) -> float:
+        return self.parent.symmetry_defect
+
+    @property
+    def spd_certificate(self):
+        return self.parent.spd_certificate
+
+    @property
+    def is_diagonally_dominant(self) -> bool:
+        return self.parent.is_diagonally_dominant
+
+    @property
+    def has_strictly_dominant_row(self) -> bool:
+        return self.parent.has_strictly_dominant_row
+
+    @property
+    def jacobi_extremes(self):
+        return self.parent.jacobi_extremes
+
+    @property
+    def jacobi_spectrum(self):
+        return self.parent.jacobi_spectrum
+
+    @property
+    def coloring(self) -> np.ndarray:
+        return self.parent.coloring
+
+    @property
+    def single(self) -> "SinglePrecisionProfile":
+        return self
+
+
+def get_matrix_profile(A) -> MatrixProfile:
+    """
+    Ritorna il profilo di A, riusando quello in cache se la matrice ha lo stesso contenuto.
+    La cache mantiene al più PROFILE_CACHE_SIZE profili (eviction LRU).
+    """
+    key = matrix_fingerprint(A)
+    profile = _profile_cache.get(key)
+    if profile is not None:
+        _profile_cache.move_to_end(key)
+        return profile
+
+    profile = MatrixProfile(A, key=key)
+    _profile_cache[key] = profile
+    while len(_profile_cache) > PROFILE_CACHE_SIZE:
+        _profile_cache.popitem(last=False)
+    return profile
+
+
+def clear_profile_cache() -> None:
+    """Svuota la cache dei profili."""
+    _profile_cache.clear()
@@ -0,0 +1,115 @@
+import time
+
+import numpy as np
+
+from iterative_solver.utils.block_rhs import is_block
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.operators import is_operator
+from iterative_solver.utils.spmv import spmv_kernel
+from iterative_solver.utils.warm_start import initial_guess
+
+PRECISIONS = ("double", "mixed")
+
+# Riduzione relativa del residuo chiesta a ogni correzione in float32
+# (ben sopra l'epsilon di macchina float32, circa 6e-8)
+INNER_TOL = 1e-4
+
+# Una correzione che non riduce il residuo almeno di questo fattore indica stagnazione
+_STAGNATION = 0.9
+
+
+def working_dtype(A, b):
+    """Tipo dei vettori di lavoro: float32 solo se A e b sono entrambi float32, altrimenti float64."""
+    if getattr(A, "dtype", None) == np.float32 and np.asarray(b).dtype == np.float32:
+        return np.float32
+    return np.float64
+
+
+def check_precision(precision: str) -> None:
+    if precision not in PRECISIONS:
+        raise ValueError(f"Precisione sconosciuta: {precision!r}. Valori ammessi: {list(PRECISIONS)}.")
+
+
+def mixed_precision_solve(solver, method: str, A, b, x_true, tol, max_iter, profile=None,
+                          checkpoints=None, recorder=None, setup_start=None, inner_tol: float = INNER_TOL, x0=None):
+    """
+    Raffinamento iterativo in precisione mista.
+
+    Ogni correzione A d = r viene risolta da solver sulla copia float32 di A
+    (profile.single) con vettori di lavoro float32; il residuo r = b - A x e
+    l'aggiornamento di x sono calcolati in float64, quindi le tolleranze fino a
+    1e-10 restano raggiungibili.
+
+    Parametri:
+    - solver: metodo iterativo (A, b, x_true, tol, max_iter, profile=...) per le correzioni
+    - method: nome del metodo (per IterationRecorder)
+    - A, b, x_true, tol, max_iter: come per il metodo; max_iter limita le iterazioni interne totali
+    - profile: MatrixProfile di A in doppia precisione (se None viene preso dalla cache dei profili)
+    - checkpoints, recorder: aggiornati ad ogni correzione (residuo in float64)
+    - inner_tol: riduzione relativa del residuo chiesta ad ogni correzione
+    - x0: punto iniziale (default: zeri)
+
+    Ritorna (x, iterazioni interne totali, errore relativo, tempo, convergenza).
+    """
+    if is_operator(A) or is_block(b):
+        raise ValueError("La precisione mista richiede una matrice esplicita e un solo termine noto.")
+    if profile is None:
+        profile = get_matrix_profile(A)
+    single = profile.single
+    A = profile.A
+    matvec = spmv_kernel(A, profile)
+    b = np.asarray(b, dtype=np.float64).reshape(-1)
+    x = initial_guess(x0, b)
+    r = b.copy() if x0 is None else b - matvec(x)
+    nb = np.linalg.norm(b)
+    if recorder is not None:
+        recorder.begin(method, max_iter, setup_start if setup_start is not None else time.perf_counter())
+        recorder.count(dot=1, alloc=3)  # norma di b, x, r
+        if x0 is not None:
+            recorder.count(spmv=1, dot=1, alloc=1)
+    start_time = time.time()
+
+    iterazioni = 0
+    if nb == 0:
+        x.fill(0.0)
+        res_rel = 0.0
+    else:
+        res_rel = 1.0 if x0 is None else np.linalg.norm(r) / nb
+    if checkpoints is not None:
+        checkpoints.observe(0, res_rel, x, start_time)
+    if recorder is not None:
+        recorder.record(0, res_rel)
+
+    while res_rel >= tol and iterazioni < max_iter:
+        # Correzione in float32 sul residuo normalizzato (nessun underflow per residui piccoli)
+        norm_r = np.linalg.norm(r)
+        r32 = (r / norm_r).astype(np.float32)
+        # Non serve risolvere la correzione più del necessario per l'ultima tolleranza
+        tol_interna = min(max(inner_tol, 0.5 * tol / res_rel), 0.5)
+        # x_true fittizio: l'errore della correzione non viene usato
+        d, it, _, _, _ = solver(single.A, r32, r32, tol_interna, max_iter - iterazioni, profile=single)
+        it = int(it)
+        iterazioni += it
+        if it == 0:
+            break
+        x += norm_r * d.astype(np.float64)
+
+        matvec(x, out=r)
+        np.subtract(b, r, out=r)
+        res_nuovo = np.linalg.norm(r) / nb
+        if recorder is not None:
+            recorder.count(spmv=1, dot=2, alloc=3)
+        if checkpoints is not None:
+            checkpoints.observe(iterazioni, res_nuovo, x, start_time)
+        interrotto = recorder is not None and recorder.record(iterazioni, res_nuovo)
+        stagnazione = res_nuovo > _STAGNATION * res_rel
+        res_rel = res_nuovo
+        if interrotto or stagnazione or not np.isfinite(res_rel):
+            break
+
+    tempo = time.time() - start_time
+    err_rel = None
+    if x_true is not None:
+        nx = np.linalg.norm(x_true)
+        err_rel = np.linalg.norm(x - x_true) / nx if nx > 0 else np.linalg.norm(x - x_true)
+    return x, iterazioni, err_rel, tempo, bool(res_rel < tol)
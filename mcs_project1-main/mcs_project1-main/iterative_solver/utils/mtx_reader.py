@@ -0,0 +1,228 @@
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Dimensione (in byte) dei blocchi di testo letti dal corpo del file
+DEFAULT_CHUNK_BYTES = 1 << 22
+
+_FIELDS = ("real", "integer", "pattern")
+_SYMMETRIES = ("general", "symmetric", "skew-symmetric")
+
+
+def _banner(f):
+    """Legge la prima riga di un file Matrix Market; ritorna (formato, campo, simmetria)."""
+    banner = f.readline().decode("ascii", errors="replace").strip().lower().split()
+    if len(banner) != 5 or banner[0] != "%%matrixmarket" or banner[1] != "matrix":
+        raise ValueError("Intestazione Matrix Market non valida.")
+    return tuple(banner[2:])
+
+
+def supports_streaming(filepath) -> bool:
+    """True se il formato del file è gestito dal lettore a blocchi ('coordinate', campo e simmetria supportati)."""
+    with open(filepath, "rb") as f:
+        fmt, field, symmetry = _banner(f)
+    return fmt == "coordinate" and field in _FIELDS and symmetry in _SYMMETRIES
+
+
+def _read_header(f):
+    """
+    Legge banner, commenti e riga delle dimensioni di un file Matrix Market.
+    Ritorna (nrows, ncols, nnz_file, field, symmetry).
+    """
+    fmt, field, symmetry = _banner(f)
+    if fmt != "coordinate":
+        raise ValueError(f"Il lettore a blocchi supporta solo il formato 'coordinate' (trovato {fmt!r}).")
+    if field not in _FIELDS:
+        raise ValueError(f"Campo Matrix Market non supportato: {field!r}.")
+    if symmetry not in _SYMMETRIES:
+        raise ValueError(f"Simmetria Matrix Market non supportata: {symmetry!r}.")
+
+    line = f.readline()
+    while line.startswith(b"%") or not line.strip():
+        if not line:
+            raise ValueError("File Matrix Market senza riga delle dimensioni.")
+        line = f.readline()
+    nrows, ncols, nnz = (int(v) for v in line.split())
+    return nrows, ncols, nnz, field, symmetry
+
+
+def _iter_entries(filepath, chunk_bytes):
+    """
+    Scorre il corpo del file a blocchi di circa chunk_bytes byte (tagliati a fine riga)
+    e per ogni blocco restituisce (righe, colonne, valori) 0-based come array NumPy.
+    """
+    with open(filepath, "rb") as f:
+        _, _, _, field, _ = _read_header(f)
+        width = 2 if field == "pattern" else 3
+        resto = b""
+        while True:
+            blocco = f.read(chunk_bytes)
+            if not blocco and not resto:
+                break
+            blocco = resto + blocco
+            if blocco and not blocco.endswith(b"\n") and len(blocco) > len(resto):
+                taglio = blocco.rfind(b"\n") + 1
+                blocco, resto = blocco[:taglio], blocco[taglio:]
+            else:
+                resto = b""
+            if not blocco.strip():
+                continue
+            numeri = np.fromstring(blocco, sep=" ")
+            if numeri.size % width != 0:
+                raise ValueError("Corpo del file Matrix Market malformato.")
+            numeri = numeri.reshape(-1, width)
+            righe = numeri[:, 0].astype(np.int64) - 1
+            colonne = numeri[:, 1].astype(np.int64) - 1
+            valori = np.ones(len(numeri)) if field == "pattern" else numeri[:, 2].copy()
+            yield righe, colonne, valori
+
+
+def _expand_symmetric(righe, colonne, valori, symmetry):
+    """Aggiunge le entrate speculari (fuori diagonale) per i formati simmetrici."""
+    if symmetry == "general":
+        return righe, colonne, valori
+    fuori = righe != colonne
+    segno = -1.0 if symmetry == "skew-symmetric" else 1.0
+    return (
+        np.concatenate((righe, colonne[fuori])),
+        np.concatenate((colonne, righe[fuori])),
+        np.concatenate((valori, segno * valori[fuori])),
+    )
+
+
+def _fill_csr(filepath, chunk_bytes, allocate):
+    """
+    Due passate sul file: conteggio degli elementi per riga (indptr) e riempimento di
+    indices/data, allocati con allocate(nome, dimensione, dtype) (in memoria o su disco).
+    Ritorna (indptr, indices, data, forma) con gli elementi di ogni riga nell'ordine del file.
+    """
+    with open(filepath, "rb") as f:
+        nrows, ncols, nnz_file, _, symmetry = _read_header(f)
+
+    # --- Passata 1: conteggio degli elementi per riga ---
+    counts = np.zeros(nrows, dtype=np.int64)
+    letti = 0
+    for righe, colonne, valori in _iter_entries(filepath, chunk_bytes):
+        letti += righe.size
+        righe, colonne, valori = _expand_symmetric(righe, colonne, valori, symmetry)
+        if righe.size and (righe.min() < 0 or righe.max() >= nrows or colonne.min() < 0 or colonne.max() >= ncols):
+            raise ValueError("Indici fuori dalle dimensioni dichiarate nel file Matrix Market.")
+        counts += np.bincount(righe, minlength=nrows)
+    if letti != nnz_file:
+        raise ValueError(f"Il file dichiara {nnz_file} elementi ma ne contiene {letti}.")
+
+    nnz = int(counts.sum())
+    index_dtype = np.int32 if max(nnz, nrows, ncols) < np.iinfo(np.int32).max else np.int64
+    indptr = allocate("indptr", nrows + 1, index_dtype)
+    indptr[0] = 0
+    np.cumsum(counts, out=indptr[1:])
+    del counts
+    indices = allocate("indices", nnz, index_dtype)
+    data = allocate("data", nnz, np.float64)
+
+    # --- Passata 2: riempimento ---
+    prossimo = indptr[:-1].astype(np.int64)  # prima posizione libera di ogni riga
+    for righe, colonne, valori in _iter_entries(filepath, chunk_bytes):
+        righe, colonne, valori = _expand_symmetric(righe, colonne, valori, symmetry)
+        ordine = np.argsort(righe, kind="stable")
+        righe_ord = righe[ordine]
+        # Rango di ogni elemento all'interno della propria riga nel blocco
+        inizio_gruppo = np.searchsorted(righe_ord, righe_ord, side="left")
+        rango = np.arange(righe_ord.size) - inizio_gruppo
+        pos = prossimo[righe_ord] + rango
+        indices[pos] = colonne[ordine]
+        data[pos] = valori[ordine]
+        prossimo += np.bincount(righe, minlength=nrows)
+    return indptr, indices, data, (nrows, ncols)
+
+
+def read_mtx_csr(filepath, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Legge un file Matrix Market 'coordinate' costruendo direttamente la matrice CSR.
+
+    Il corpo viene analizzato a blocchi di dimensione fissa con parsing vettoriale,
+    in due passate: la prima conta gli elementi per riga (indptr), la seconda
+    riempie indices/data preallocati. I formati symmetric/skew-symmetric vengono
+    espansi durante il riempimento, senza passare per una matrice COO completa:
+    la memoria di picco è circa quella della CSR finale più un blocco.
+
+    Parametri:
+    - filepath (str): percorso del file .mtx
+    - chunk_bytes (int): dimensione dei blocchi letti dal corpo del file
+
+    Ritorna:
+    - A (csr_matrix): matrice sparsa in formato CSR (indici ordinati, duplicati sommati)
+    """
+    indptr, indices, data, shape = _fill_csr(filepath, chunk_bytes, lambda name, size, dtype: np.empty(size, dtype))
+    A = csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    A.sum_duplicates()
+    A.sort_indices()
+    return A
+
+
+def _copy_prefix(path, size, block=DEFAULT_CHUNK_BYTES):
+    """Riscrive il file .npy in path tenendo solo i primi size elementi (copia a blocchi)."""
+    sorgente = np.load(path, mmap_mode="r")
+    tmp = path + ".tmp.npy"
+    try:
+        dest = np.lib.format.open_memmap(tmp, mode="w+", dtype=sorgente.dtype, shape=(size,))
+        passo = max(1, block // sorgente.itemsize)
+        for i in range(0, size, passo):
+            fine = min(i + passo, size)
+            dest[i:fine] = sorgente[i:fine]
+        dest.flush()
+        del dest, sorgente
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_mtx_csr(filepath, dest_dir, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Converte un file Matrix Market 'coordinate' negli array CSR indptr/indices/data
+    salvati come file .npy in dest_dir, senza mai tenere la matrice in memoria.
+
+    Le due passate di read_mtx_csr scrivono direttamente in file memory-mapped; una
+    terza passata per blocchi di righe (circa chunk_bytes byte) ordina gli indici di
+    colonna e somma i duplicati, compattando gli array sul posto. La memoria di picco
+    è O(n) per i contatori di riga più un blocco.
+
+    Ritorna:
+    - (forma, numero di elementi non nulli)
+    """
+    def su_disco(name, size, dtype):
+        return np.lib.format.open_memmap(os.path.join(dest_dir, f"{name}.npy"), mode="w+", dtype=dtype,
+                                         shape=(size,))
+
+    indptr, indices, data, shape = _fill_csr(filepath, chunk_bytes, su_disco)
+
+    # --- Passata 3: forma canonica per blocchi di righe, compattazione sul posto ---
+    # I blocchi sono letti in memoria prima di essere riscritti e la posizione di
+    # scrittura non supera mai quella di lettura: nessun blocco successivo viene toccato.
+    per_blocco = max(1, chunk_bytes // (data.itemsize + indices.itemsize))
+    nrows = shape[0]
+    scritti = 0
+    r0, s = 0, 0  # s: inizio originale della riga r0 (indptr[r0] è già stato riscritto)
+    while r0 < nrows:
+        r1 = int(np.searchsorted(indptr, s + per_blocco, side="right")) - 1
+        r1 = min(max(r1, r0 + 1), nrows)
+        e = int(indptr[r1])
+        puntatori = np.concatenate(([s], indptr[r0 + 1:r1 + 1])) - s
+        blocco = csr_matrix((np.array(data[s:e]), np.array(indices[s:e]), puntatori), shape=(r1 - r0, shape[1]))
+        blocco.sum_duplicates()  # ordina anche gli indici di colonna
+        indices[scritti:scritti + blocco.nnz] = blocco.indices
+        data[scritti:scritti + blocco.nnz] = blocco.data
+        indptr[r0 + 1:r1 + 1] = blocco.indptr[1:] + scritti
+        scritti += blocco.nnz
+        r0, s = r1, e
+    for arr in (indptr, indices, data):
+        arr.flush()
+    nnz = len(indices)
+    del indptr, indices, data
+    if scritti < nnz:
+        # Duplicati sommati: gli array vengono accorciati al numero effettivo di elementi
+        for name in ("indices", "data"):
+            _copy_prefix(os.path.join(dest_dir, f"{name}.npy"), scritti)
+    return shape, scritti
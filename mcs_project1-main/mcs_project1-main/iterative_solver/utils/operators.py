@@ -0,0 +1,66 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# Tolleranza relativa del test di simmetria su vettori casuali
+SYMMETRY_PROBE_RTOL = 1e-10
+
+
+def is_operator(A) -> bool:
+    """True se A non è una matrice esplicita (sparsa o densa) ma un LinearOperator o una funzione matvec."""
+    return not (sp.issparse(A) or isinstance(A, np.ndarray))
+
+
+def as_linear_operator(A, n: int) -> spla.LinearOperator:
+    """
+    Normalizza A in un LinearOperator n x n.
+
+    Parametri:
+    - A: LinearOperator oppure funzione v -> A v
+    - n: dimensione del sistema (di solito len(b))
+    """
+    if isinstance(A, spla.LinearOperator):
+        if A.shape != (n, n):
+            raise ValueError(f"Dimensioni incoerenti: l'operatore è {A.shape} ma il sistema ha n={n}.")
+        return A
+    if callable(A):
+        return spla.LinearOperator((n, n), matvec=A, dtype=np.float64)
+    raise TypeError("A deve essere una matrice (sparsa o densa), un LinearOperator o una funzione matvec.")
+
+
+def _probes(n: int, probes: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((probes, n))
+
+
+def probe_symmetry_defect(A, n: int, probes: int = 2, seed: int = 0) -> float:
+    """
+    Difetto di simmetria stimato senza assemblare A: per coppie di vettori casuali u, v
+    max |u·Av - v·Au| / (||u|| ||Av|| + ||v|| ||Au||) (0 per un operatore simmetrico).
+    Costa 2 * probes prodotti operatore-vettore.
+    """
+    U = _probes(n, probes, seed)
+    V = _probes(n, probes, seed + 1)
+    difetto = 0.0
+    for u, v in zip(U, V):
+        Au, Av = A @ u, A @ v
+        scala = np.linalg.norm(u) * np.linalg.norm(Av) + np.linalg.norm(v) * np.linalg.norm(Au)
+        if scala > 0:
+            difetto = max(difetto, abs(u @ Av - v @ Au) / scala)
+    return float(difetto)
+
+
+def probe_positive(A, n: int, probes: int = 2, seed: int = 0) -> bool:
+    """
+    Condizione necessaria di definita positività: v·Av > 0 su vettori casuali.
+    Non è una certificazione; i metodi controllano comunque d·Ad > 0 durante le iterazioni.
+    """
+    return all(float(v @ (A @ v)) > 0.0 for v in _probes(n, probes, seed + 2))
+
+
+def check_spd_operator(A, n: int, method: str) -> None:
+    """Controlli "operator-only" per i metodi che richiedono A SPD (gradiente, CG)."""
+    if probe_symmetry_defect(A, n) > SYMMETRY_PROBE_RTOL:
+        raise ValueError(f"Operator A is not symmetric, {method} failed.")
+    if not probe_positive(A, n):
+        raise ValueError(f"Operator A is not positive-definite, {method} failed.")
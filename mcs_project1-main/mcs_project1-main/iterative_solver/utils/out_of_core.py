@@ -0,0 +1,188 @@
+import json
+import math
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from iterative_solver.utils.spmv import _sparsetools, nnz_balanced_rows, spmv_kernel
+
+# Byte di indices + data letti per blocco di righe dal prodotto in streaming
+DEFAULT_BLOCK_BYTES = 1 << 26
+
+
+def _advise_sequential(arr) -> None:
+    """Suggerisce al sistema operativo una lettura sequenziale (readahead aggressivo) del memmap."""
+    mappa = getattr(arr, "_mmap", None)
+    if mappa is None and isinstance(getattr(arr, "base", None), mmap.mmap):
+        mappa = arr.base
+    if mappa is not None and hasattr(mappa, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        try:
+            mappa.madvise(mmap.MADV_SEQUENTIAL)
+        except (OSError, ValueError):
+            pass
+
+
+class MemmapCSR(spla.LinearOperator):
+    """
+    Matrice CSR su disco: indptr, indices e data sono array numpy.memmap (file .npy
+    nella cartella della cache di load_matrix, vedi matrix_loader) e non vengono mai
+    caricati interamente in memoria.
+
+    Il prodotto A @ x legge la matrice per blocchi di righe consecutivi (circa
+    block_bytes byte ciascuno) con il kernel CSR compilato di SciPy; con readahead il
+    blocco successivo viene letto da un thread mentre si calcola quello corrente.
+    È un LinearOperator: gradiente e gradiente coniugato lo usano come operatore non
+    assemblato, Jacobi prende la diagonale da diagonal(). Byte letti e tempo dei
+    prodotti sono accumulati per la banda in GB/s (throughput).
+    """
+
+    def __init__(self, path: str, block_bytes: int = DEFAULT_BLOCK_BYTES, readahead: bool = True):
+        """
+        Parametri:
+        - path: cartella con indptr.npy, indices.npy, data.npy e meta.json
+        - block_bytes: byte di indices + data per blocco di righe
+        - readahead: se True il blocco successivo è letto in parallelo al calcolo
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.path = path
+        self.indptr, self.indices, self.data = (
+            np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ("indptr", "indices", "data")
+        )
+        if self.indptr.dtype != self.indices.dtype:
+            raise ValueError("indptr e indices devono avere lo stesso tipo intero.")
+        super().__init__(self.data.dtype, tuple(meta["shape"]))
+        self.nnz = int(self.indptr[-1])
+        for arr in (self.indptr, self.indices, self.data):
+            _advise_sequential(arr)
+
+        per_nnz = self.data.itemsize + self.indices.itemsize
+        parts = max(1, math.ceil(self.nnz * per_nnz / block_bytes))
+        confini = nnz_balanced_rows(self.indptr, parts)
+        self.blocks = list(zip(confini[:-1].tolist(), confini[1:].tolist()))
+        self.readahead = readahead
+        self._pool = None
+        self._diag = None
+        # Byte letti e tempo complessivo dei prodotti in streaming
+        self.products = 0
+        self.bytes_read = 0
+        self.stream_time = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Byte della matrice letti da un prodotto (indptr + indices + data)."""
+        return self.nnz * (self.data.itemsize + self.indices.itemsize) + self.indptr.nbytes
+
+    def _load(self, block):
+        """Copia in memoria il blocco di righe [r0, r1) (lettura sequenziale dai memmap)."""
+        r0, r1 = block
+        s, e = int(self.indptr[r0]), int(self.indptr[r1])
+        indptr = np.array(self.indptr[r0:r1 + 1]) - self.indptr.dtype.type(s)
+        return r0, r1, indptr, np.array(self.indices[s:e]), np.array(self.data[s:e])
+
+    def _stream(self, visit):
+        """Chiama visit(r0, r1, indptr, indices, data) su tutti i blocchi, in ordine."""
+        if not self.readahead or len(self.blocks) == 1:
+            for block in self.blocks:
+                visit(*self._load(block))
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readahead")
+        futuro = self._pool.submit(self._load, self.blocks[0])
+        for i in range(len(self.blocks)):
+            blocco = futuro.result()
+            if i + 1 < len(self.blocks):
+                futuro = self._pool.submit(self._load, self.blocks[i + 1])
+            visit(*blocco)
+
+    def _product(self, x):
+        x = np.ascontiguousarray(x, dtype=self.dtype)
+        out = np.zeros((self.shape[0],) + x.shape[1:], dtype=self.dtype)
+        n_col = self.shape[1]
+
+        def visit(r0, r1, indptr, indices, data):
+            if _sparsetools is None:
+                out[r0:r1] = sp.csr_matrix((data, indices, indptr), shape=(r1 - r0, n_col)) @ x
+            # I kernel di SciPy accumulano: y += A x
+            elif x.ndim == 1:
+                _sparsetools.csr_matvec(r1 - r0, n_col, indptr, indices, data, x, out[r0:r1])
+            else:
+                _sparsetools.csr_matvecs(r1 - r0, n_col, x.shape[1], indptr, indices, data,
+                                         x.ravel(), out[r0:r1].ravel())
+
+        start_time = time.perf_counter()
+        self._stream(visit)
+        self.stream_time += time.perf_counter() - start_time
+        self.bytes_read += self.nbytes
+        self.products += 1
+        return out
+
+    def _matvec(self, x):
+        return self._product(np.ravel(x))
+
+    def _matmat(self, X):
+        return self._product(X)
+
+    def diagonal(self) -> np.ndarray:
+        """Diagonale di A (calcolata con una passata in streaming alla prima richiesta)."""
+        if self._diag is None:
+            diag = np.zeros(min(self.shape), dtype=self.dtype)
+
+            def visit(r0, r1, indptr, indices, data):
+                # Elementi (i, i) delle righe r0..r1-1: diagonale r0 del blocco
+                d = sp.csr_matrix((data, indices, indptr), shape=(r1 - r0, self.shape[1])).diagonal(k=r0)
+                diag[r0:r0 + d.size] = d
+
+            self._stream(visit)
+            self._diag = diag
+        return self._diag
+
+    @property
+    def throughput(self):
+        """Banda media dei prodotti in streaming [GB/s] (None prima del primo prodotto)."""
+        return self.bytes_read / self.stream_time / 1e9 if self.stream_time > 0 else None
+
+    def report(self) -> str:
+        righe = [f"CSR su disco {self.shape[0]}x{self.shape[1]}, nnz = {self.nnz}, "
+                 f"{self.nbytes / 1e9:.3f} GB in {len(self.blocks)} blocchi di righe"]
+        if self.products:
+            righe.append(f"- {self.products} prodotti in streaming, {self.stream_time / self.products:.4f} s "
+                         f"per prodotto, banda {self.throughput:.2f} GB/s")
+        return "\n".join(righe)
+
+    def close(self) -> None:
+        """Chiude il thread di readahead (gli array memory-mapped si chiudono con l'oggetto)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def matrix_bytes(A) -> int:
+    """Byte letti da un prodotto A @ x su una matrice CSR (in memoria o MemmapCSR)."""
+    if isinstance(A, MemmapCSR):
+        return A.nbytes
+    return A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+
+
+def spmv_throughput(A, repeats: int = 5) -> float:
+    """
+    Banda [GB/s] del prodotto matrice-vettore su A: csr_matrix in memoria (kernel SpMV
+    dei metodi iterativi) oppure MemmapCSR (streaming da disco). Media su repeats prodotti,
+    dopo uno di riscaldamento.
+    """
+    if isinstance(A, MemmapCSR):
+        matvec = A.matvec
+    else:
+        matvec = spmv_kernel(A if sp.isspmatrix_csr(A) else sp.csr_matrix(A))
+    x = np.ones(A.shape[1])
+    matvec(x)
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        matvec(x)
+    tempo = (time.perf_counter() - start_time) / repeats
+    return matrix_bytes(A) / tempo / 1e9
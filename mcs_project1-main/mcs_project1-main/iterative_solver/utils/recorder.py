@@ -0,0 +1,141 @@
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class IterationRecorder:
+    """
+    Strumentazione opzionale di un metodo iterativo.
+
+    Per ogni iterazione registra residuo relativo e istante (perf_counter) in array
+    NumPy preallocati; conta prodotti matrice-vettore (spmv), risoluzioni triangolari
+    (solve), prodotti scalari e norme (dot) e vettori allocati (alloc), e separa il
+    tempo di setup (controlli, analisi della matrice) da quello delle iterazioni.
+
+    Un metodo che riceve recorder=None non paga nulla oltre a un confronto con None.
+    """
+
+    def __init__(self, callback: Optional[Callable] = None, every: int = 1, capacity: int = 1024):
+        """
+        Parametri:
+        - callback: funzione callback(recorder, k, res_rel) chiamata ogni `every` iterazioni;
+          se restituisce True il metodo si interrompe (risultato non convergente)
+        - every: frequenza (in iterazioni) della callback
+        - capacity: dimensione iniziale degli array (estesi a max_iter + 1 in begin)
+        """
+        if every < 1:
+            raise ValueError(f"every deve essere >= 1; trovato every={every}.")
+        self.callback = callback
+        self.every = every
+        self._residuals = np.empty(capacity)
+        self._times = np.empty(capacity)
+        self._reset()
+
+    def _reset(self):
+        self.method = None
+        self.setup_time = 0.0
+        self.aborted = False
+        self._count = 0
+        self._t0 = None
+        self._per_iter = np.zeros(4, dtype=np.int64)
+        self._extra = np.zeros(4, dtype=np.int64)
+
+    # --- Interfaccia usata dai metodi iterativi ---
+
+    def begin(self, method: str, max_iter: int, setup_start: float,
+              spmv: int = 0, solve: int = 0, dot: int = 0, alloc: int = 0):
+        """
+        Inizio delle iterazioni: registra il tempo di setup (da setup_start, perf_counter),
+        prealloca max_iter + 1 posizioni e fissa i costi di ogni iterazione.
+        """
+        now = time.perf_counter()
+        self._reset()
+        self.method = method
+        self.setup_time = now - setup_start
+        self._t0 = now
+        if self._residuals.size < max_iter + 1:
+            self._residuals = np.empty(max_iter + 1)
+            self._times = np.empty(max_iter + 1)
+        self._per_iter[:] = (spmv, solve, dot, alloc)
+
+    def count(self, spmv: int = 0, solve: int = 0, dot: int = 0, alloc: int = 0):
+        """Operazioni fuori dal costo fisso per iterazione (residuo iniziale, ricalcoli periodici...)."""
+        self._extra += (spmv, solve, dot, alloc)
+
+    def record(self, k: int, res_rel: float) -> bool:
+        """
+        Registra il residuo relativo dell'iterata k (k = 0 è il punto iniziale).
+        Ritorna True se la callback chiede di interrompere il metodo.
+        """
+        i = self._count
+        if i == self._residuals.size:
+            self._residuals = np.resize(self._residuals, 2 * i)
+            self._times = np.resize(self._times, 2 * i)
+        self._residuals[i] = res_rel
+        self._times[i] = time.perf_counter() - self._t0
+        self._count = i + 1
+        if self.callback is not None and k % self.every == 0:
+            if self.callback(self, k, res_rel):
+                self.aborted = True
+                return True
+        return False
+
+    # --- Lettura dei risultati ---
+
+    @property
+    def iterations(self) -> int:
+        """Numero di iterazioni registrate (escluso il punto iniziale)."""
+        return max(self._count - 1, 0)
+
+    @property
+    def residuals(self) -> np.ndarray:
+        return self._residuals[:self._count]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Istanti (s) dall'inizio delle iterazioni."""
+        return self._times[:self._count]
+
+    def _counters(self):
+        return self._extra + self._per_iter * self.iterations
+
+    @property
+    def spmv(self) -> int:
+        return int(self._counters()[0])
+
+    @property
+    def solve(self) -> int:
+        return int(self._counters()[1])
+
+    @property
+    def dot(self) -> int:
+        return int(self._counters()[2])
+
+    @property
+    def alloc(self) -> int:
+        return int(self._counters()[3])
+
+    def summary(self) -> dict:
+        """Riepilogo dei contatori e dei tempi dell'ultima esecuzione."""
+        tempo = float(self._times[self._count - 1]) if self._count else 0.0
+        return {
+            "method": self.method,
+            "iterations": self.iterations,
+            "setup_time": self.setup_time,
+            "iteration_time": tempo,
+            "time_per_iter": tempo / self.iterations if self.iterations else None,
+            "spmv": self.spmv,
+            "solve": self.solve,
+            "dot": self.dot,
+            "alloc": self.alloc,
+            "aborted": self.aborted,
+        }
+
+    def __getstate__(self):
+        # Solo la parte registrata degli array (es. per i risultati dei worker paralleli)
+        state = self.__dict__.copy()
+        state["_residuals"] = self.residuals.copy()
+        state["_times"] = self.times.copy()
+        state["callback"] = None
+        return state
@@ -0,0 +1,111 @@
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+from iterative_solver.utils.matrix_loader import load_cached_permutation, save_cached_permutation
+
+REORDERINGS = ("rcm",)
+
+
+def bandwidth(A) -> int:
+    """Banda di A: max |i - j| sugli elementi non nulli (0 per una matrice diagonale)."""
+    A = sp.coo_matrix(A)
+    if A.nnz == 0:
+        return 0
+    return int(np.max(np.abs(A.row.astype(np.int64) - A.col.astype(np.int64))))
+
+
+def rcm_permutation(A) -> np.ndarray:
+    """Permutazione reverse Cuthill-McKee sul grafo (simmetrizzato) di A."""
+    A = sp.csr_matrix(A)
+    simmetrica = (A != A.T).nnz == 0
+    return np.asarray(reverse_cuthill_mckee(A, symmetric_mode=simmetrica), dtype=np.int64)
+
+
+class Reordering:
+    """
+    Permutazione simmetrica P A P^T di un sistema lineare.
+
+    perm[i] è l'indice originale della riga i del sistema permutato:
+    A_p = A[perm][:, perm], b_p = b[perm], e la soluzione originale si
+    ottiene con unpermute(x_p).
+    """
+
+    def __init__(self, perm, method: str = "rcm", bandwidth_before: int = None, bandwidth_after: int = None,
+                 setup_time: float = 0.0, cached: bool = False):
+        self.perm = np.asarray(perm, dtype=np.int64)
+        self.inv_perm = np.empty_like(self.perm)
+        self.inv_perm[self.perm] = np.arange(self.perm.size)
+        self.method = method
+        self.bandwidth_before = bandwidth_before
+        self.bandwidth_after = bandwidth_after
+        self.setup_time = setup_time
+        self.cached = cached
+
+    def permute_matrix(self, A):
+        """P A P^T in formato CSR."""
+        return sp.csr_matrix(A)[self.perm][:, self.perm].tocsr()
+
+    def permute(self, v):
+        """Vettore (o blocco (n, k)) nell'ordinamento permutato."""
+        return np.asarray(v)[self.perm]
+
+    def unpermute(self, v):
+        """Riporta un vettore (o blocco) permutato nell'ordinamento originale."""
+        return np.asarray(v)[self.inv_perm]
+
+    @property
+    def pays_off(self) -> bool:
+        """True se la permutazione riduce la banda."""
+        return self.bandwidth_after < self.bandwidth_before
+
+    def report(self) -> str:
+        origine = "dalla cache" if self.cached else f"in {self.setup_time:.4f} s"
+        return (f"Riordinamento {self.method.upper()} ({origine}): "
+                f"banda {self.bandwidth_before} -> {self.bandwidth_after}")
+
+
+def compute_reordering(A, method: str = "rcm") -> Reordering:
+    """Calcola la permutazione indicata e la banda di A prima e dopo."""
+    if method not in REORDERINGS:
+        raise ValueError(f"Riordinamento sconosciuto: {method!r}. Valori ammessi: {list(REORDERINGS)}.")
+    start_time = time.time()
+    perm = rcm_permutation(A)
+    ordinamento = Reordering(perm, method, setup_time=time.time() - start_time)
+    _fill_bandwidths(ordinamento, A)
+    return ordinamento
+
+
+def _fill_bandwidths(ordinamento: Reordering, A):
+    A = sp.coo_matrix(A)
+    ordinamento.bandwidth_before = bandwidth(A)
+    if A.nnz:
+        righe = ordinamento.inv_perm[A.row]
+        colonne = ordinamento.inv_perm[A.col]
+        ordinamento.bandwidth_after = int(np.max(np.abs(righe - colonne)))
+    else:
+        ordinamento.bandwidth_after = 0
+
+
+def reorder_matrix(filepath: str, A, method: str = "rcm", use_cache: bool = False, cache_key: str = "stat") -> Reordering:
+    """
+    Permutazione di riordinamento per la matrice letta da filepath.
+
+    Con use_cache=True la permutazione viene letta/salvata nella cache binaria
+    della matrice ('<file>.csrcache/', vedi load_matrix) e invalidata insieme ad essa.
+    """
+    if method not in REORDERINGS:
+        raise ValueError(f"Riordinamento sconosciuto: {method!r}. Valori ammessi: {list(REORDERINGS)}.")
+    if use_cache:
+        perm = load_cached_permutation(filepath, method, cache_key)
+        if perm is not None and perm.size == A.shape[0]:
+            ordinamento = Reordering(perm, method, cached=True)
+            _fill_bandwidths(ordinamento, A)
+            return ordinamento
+
+    ordinamento = compute_reordering(A, method)
+    if use_cache:
+        save_cached_permutation(filepath, method, ordinamento.perm, cache_key)
+    return ordinamento
@@ -1,14 +1,22 @@
 import os
 import csv
 
-def results_saver(risultati_per_metodo, matrix_name):
+def results_saver(risultati_per_metodo, matrix_name, histories=None, predictions=None, relaxation=None):
     """
     Salva i risultati in un file CSV ben formattato, in una cartella specifica per ogni matrice.
 
     Parametri:
     - risultati_per_metodo: dict, con chiavi = metodo, valori = lista tuple
-      Ogni tupla: (tolleranza, iterazioni, errore_relativo, tempo_calcolo, convergenza)
+      Ogni tupla: (tolleranza, iterazioni, errore_relativo, tempo_calcolo, convergenza[, tempo_setup])
+      Il tempo di setup (es. fattorizzazione del precondizionatore) è separato da quello delle iterazioni.
     - matrix_name: nome della matrice (es: 'spa1')
+    - histories: dict opzionale metodo -> lista di (tolleranza, IterationRecorder);
+      se presente salva anche history.csv (residuo e tempo per iterazione) e
+      instrumentation.csv (tempo di setup e contatori per esecuzione)
+    - predictions: dict opzionale metodo -> {tolleranza: iterazioni previste}; se presente
+      aggiunge la colonna "Iterazioni Previste" (vedi utils.convergence)
+    - relaxation: dict opzionale metodo -> (omega, {tolleranza: iterazioni risparmiate rispetto
+      a Gauss-Seidel}); se presente aggiunge le colonne "Omega" e "Iterazioni Risparmiate"
     """
 
     # Cartella di destinazione: results/{matrix_name}_results/
@@ -22,21 +30,78 @@ def results_saver(risultati_per_metodo, matrix_name):
         writer = csv.writer(csvfile)
 
         # Intestazione
-        writer.writerow(["Metodo", "Tolleranza", "Iterazioni", "Errore Relativo", "Tempo di Calcolo (s)", "Convergenza"])
+        intestazione = ["Metodo", "Tolleranza", "Iterazioni", "Errore Relativo", "Tempo di Calcolo (s)", "Convergenza", "Tempo di Setup (s)"]
+        if predictions is not None:
+            intestazione.append("Iterazioni Previste")
+        if relaxation is not None:
+            intestazione += ["Omega", "Iterazioni Risparmiate"]
+        writer.writerow(intestazione)
 
         # Riga per riga
         for metodo, risultati in risultati_per_metodo.items():
             for risultato in risultati:
-                tol, iterazioni, err_rel, tempo, conv = risultato
+                tol, iterazioni, err_rel, tempo, conv = risultato[:5]
+                t_setup = risultato[5] if len(risultato) > 5 else 0.0
 
                 # Formattazione più "umana"
-                writer.writerow([
+                riga = [
                     metodo,
                     f"{tol:.0e}",              # Es: 1e-06
                     iterazioni,
                     f"{err_rel:.2e}",          # Errore relativo scientifica con 2 cifre
                     f"{tempo:.4f}",            # Tempo con 4 decimali
-                    "True" if conv else "False"      # Convergenza più leggibile
-                ])
+                    "True" if conv else "False",     # Convergenza più leggibile
+                    f"{t_setup:.4f}"           # Setup separato dalle iterazioni
+                ]
+                if predictions is not None:
+                    previste = predictions.get(metodo, {}).get(tol)
+                    riga.append(previste if previste is not None else "")
+                if relaxation is not None:
+                    omega, risparmi = relaxation.get(metodo, (None, {}))
+                    risparmiate = risparmi.get(tol)
+                    riga += [f"{omega:.3f}" if omega is not None else "",
+                             risparmiate if risparmiate is not None else ""]
+                writer.writerow(riga)
 
     print(f"Risultati salvati correttamente in {filename}")
+
+    if histories:
+        _save_histories(histories, results_dir)
+
+
+def _save_histories(histories, results_dir):
+    """Esporta le storie registrate dagli IterationRecorder accanto a output.csv."""
+    history_file = os.path.join(results_dir, "history.csv")
+    with open(history_file, mode='w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Metodo", "Tolleranza", "Iterazione", "Residuo Relativo", "Tempo (s)"])
+        for metodo, storie in histories.items():
+            for tol, recorder in storie:
+                for k, (res, t) in enumerate(zip(recorder.residuals.tolist(), recorder.times.tolist())):
+                    writer.writerow([metodo, f"{tol:.0e}", k, f"{res:.6e}", f"{t:.6f}"])
+
+    counters_file = os.path.join(results_dir, "instrumentation.csv")
+    with open(counters_file, mode='w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Metodo", "Tolleranza", "Iterazioni", "Tempo di Setup (s)", "Tempo Iterazioni (s)",
+                         "Tempo per Iterazione (s)", "SpMV", "Risoluzioni Triangolari", "Prodotti Scalari",
+                         "Allocazioni", "Interrotto"])
+        for metodo, storie in histories.items():
+            for tol, recorder in storie:
+                r = recorder.summary()
+                per_iter = r["time_per_iter"]
+                writer.writerow([
+                    metodo,
+                    f"{tol:.0e}",
+                    r["iterations"],
+                    f"{r['setup_time']:.6f}",
+                    f"{r['iteration_time']:.6f}",
+                    f"{per_iter:.3e}" if per_iter is not None else "",
+                    r["spmv"],
+                    r["solve"],
+                    r["dot"],
+                    r["alloc"],
+                    "True" if r["aborted"] else "False",
+                ])
+
+    print(f"Storie delle iterazioni salvate in {history_file} e {counters_file}")
@@ -0,0 +1,107 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Database predefinito, accanto alle cartelle dei risultati per matrice
+DEFAULT_STORE = os.path.join("results", "results.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT NOT NULL,
+    matrix      TEXT NOT NULL,
+    method      TEXT NOT NULL,
+    tol         REAL NOT NULL,
+    params      TEXT NOT NULL,
+    iterations  INTEGER,
+    rel_error   REAL,
+    time        REAL,
+    converged   INTEGER,
+    setup_time  REAL,
+    created     REAL,
+    PRIMARY KEY (fingerprint, method, tol, params)
+)
+"""
+
+
+def params_key(**params) -> str:
+    """Chiave canonica (JSON ordinato) dei parametri di esecuzione che influenzano i risultati."""
+    return json.dumps(params, sort_keys=True)
+
+
+class ResultsStore:
+    """
+    Archivio SQLite dei risultati: una riga per (impronta della matrice, metodo, tolleranza, parametri).
+
+    Ogni risultato viene scritto (con commit) appena prodotto, quindi un'esecuzione
+    interrotta perde al più il run in corso; rieseguendo, le combinazioni già presenti
+    vengono saltate e output.csv e grafici sono rigenerati dall'archivio.
+    Le scritture sono protette da un lock (il runner parallelo salva dai callback dei job).
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        """
+        Parametri:
+        - path: file SQLite (creato se non esiste)
+        """
+        cartella = os.path.dirname(path)
+        if cartella:
+            os.makedirs(cartella, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, fingerprint: str, method: str, tol: float, params: str):
+        """Result (tol, iterazioni, errore relativo, tempo, convergenza, tempo di setup) oppure None."""
+        with self._lock:
+            riga = self._conn.execute(
+                "SELECT tol, iterations, rel_error, time, converged, setup_time FROM results "
+                "WHERE fingerprint = ? AND method = ? AND tol = ? AND params = ?",
+                (fingerprint, method, float(tol), params),
+            ).fetchone()
+        if riga is None:
+            return None
+        tol, iterazioni, err_rel, tempo, conv, t_setup = riga
+        # SQLite salva NaN (esecuzioni saltate) come NULL
+        err_rel = float("nan") if err_rel is None else err_rel
+        return tol, iterazioni, err_rel, tempo, bool(conv), t_setup
+
+    def missing(self, fingerprint: str, method: str, tolleranze, params: str) -> list:
+        """Tolleranze (nell'ordine dato) per cui il metodo non ha ancora un risultato."""
+        return [tol for tol in tolleranze if self.get(fingerprint, method, tol, params) is None]
+
+    def results(self, fingerprint: str, method: str, tolleranze, params: str) -> list:
+        """Risultati memorizzati del metodo, nell'ordine delle tolleranze (le mancanti sono omesse)."""
+        risultati = (self.get(fingerprint, method, tol, params) for tol in tolleranze)
+        return [r for r in risultati if r is not None]
+
+    def put(self, fingerprint: str, matrix_name: str, method: str, params: str, risultato) -> None:
+        """Memorizza (sovrascrivendo) un Result e lo rende subito persistente."""
+        tol, iterazioni, err_rel, tempo, conv = risultato[:5]
+        t_setup = risultato[5] if len(risultato) > 5 else 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint, matrix_name, method, float(tol), params, int(iterazioni),
+                 None if err_rel is None else float(err_rel), float(tempo), int(bool(conv)),
+                 float(t_setup), time.time()),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
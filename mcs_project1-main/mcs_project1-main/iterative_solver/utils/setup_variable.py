@@ -1,7 +1,7 @@
 import numpy as np
 import scipy.sparse as sp
 
-def setup_variable(A):
+def setup_variable(A, n_rhs=None, seed=0):
     """
     Genera il vettore x_esatto (tutti 1) e calcola b = A * x_esatto.
     Funziona sia con matrici dense che sparse.
@@ -9,15 +9,24 @@ def setup_variable(A):
     Parametri:
     ----------
     A : matrice (densa o sparsa)
+    n_rhs : se indicato, genera un blocco di n_rhs soluzioni esatte (n, n_rhs):
+            la prima colonna è il vettore di 1, le altre sono casuali (riproducibili con seed)
+    seed : seme del generatore per le colonne casuali
 
     Ritorna:
-    - x_esatto : vettore di 1
-    - b : vettore calcolato come A @ x_esatto
+    - x_esatto : vettore di 1 (oppure blocco (n, n_rhs))
+    - b : vettore calcolato come A @ x_esatto (oppure blocco B = A @ X_esatto)
     """
     size = A.shape[0]
-    x_esatto = np.ones(size)
+    if n_rhs is None:
+        x_esatto = np.ones(size)
+    else:
+        rng = np.random.default_rng(seed)
+        x_esatto = np.empty((size, n_rhs))
+        x_esatto[:, 0] = 1.0
+        x_esatto[:, 1:] = rng.standard_normal((size, n_rhs - 1))
 
     # Usa @ che funziona sia per sparse che dense
     b = A @ x_esatto
 
-    return x_esatto, b
\ No newline at end of file
+    return x_esatto, b
@@ -0,0 +1,172 @@
+import time
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import connected_components, reverse_cuthill_mckee
+
+try:
+    from sksparse.cholmod import CholmodNotPositiveDefiniteError, cholesky as cholmod_cholesky
+except ImportError:  # scikit-sparse non installato: fattorizzazione con SuperLU
+    cholmod_cholesky = None
+
+# Budget della fattorizzazione: costo stimato (flop) al più FACTORIZATION_FLOP_RATIO * nnz,
+# cioè qualche centinaio di prodotti matrice-vettore come la stima di Lanczos; oltre si
+# passa direttamente a Lanczos (SuperLU non ha uscita anticipata sul primo pivot negativo)
+FACTORIZATION_FLOP_RATIO = 1000
+
+# Livelli della certificazione, dal più economico
+SPD_TIERS = ("simmetria", "diagonale", "dominanza diagonale", "fattorizzazione", "lanczos")
+
+
+class SPDCertificate:
+    """
+    Esito della verifica "A simmetrica definita positiva".
+    - is_spd: verdetto
+    - tier: livello che ha deciso (vedi SPD_TIERS)
+    - evidence: motivazione (margine di Gershgorin, pivot, autovalore stimato, ...)
+    - certified: True se il verdetto è una prova, False se è una stima (Lanczos)
+    - time: tempo della verifica [s]
+    """
+
+    def __init__(self, is_spd: bool, tier: str, evidence: str, certified: bool = True, time: float = 0.0):
+        self.is_spd = is_spd
+        self.tier = tier
+        self.evidence = evidence
+        self.certified = certified
+        self.time = time
+
+    def __bool__(self) -> bool:
+        return self.is_spd
+
+    def __repr__(self) -> str:
+        return f"SPDCertificate({self.is_spd}, {self.tier}, {self.evidence!r})"
+
+    def report(self) -> str:
+        esito = "SPD" if self.is_spd else "non SPD"
+        tipo = "" if self.certified else ", stima"
+        return f"Verifica SPD: {esito} ({self.tier}{tipo}: {self.evidence}; {self.time:.4f} s)"
+
+
+def _dominance(profile):
+    """Livello 'dominanza diagonale' (diagonale positiva già verificata): prova oppure None."""
+    margine = profile.diag - profile.offdiag_row_sums
+    m = float(margine.min())
+    if m > profile.DOMINANCE_ATOL:
+        # Dischi di Gershgorin tutti nel semiasse positivo
+        return f"dominanza diagonale stretta, margine di Gershgorin minimo {m:.3e}"
+    if profile.is_diagonally_dominant and profile.has_strictly_dominant_row:
+        # Irriducibilmente diagonalmente dominante => non singolare (Taussky), autovalori >= 0 per Gershgorin
+        n_comp = connected_components(sp.csr_matrix(profile.A), directed=False, return_labels=False)
+        if n_comp == 1:
+            return "dominanza diagonale debole con una riga stretta e grafo connesso (irriducibile)"
+    return None
+
+
+def factorization_cost(A) -> float:
+    """
+    Stima per eccesso dei flop di una fattorizzazione di Cholesky di A simmetrica:
+    n^3 / 3 se densa, altrimenti sum_i w_i^2 con w_i l'ampiezza dell'inviluppo della
+    riga i nell'ordinamento di Cuthill-McKee inverso (il riempimento resta nell'inviluppo).
+    Costo O(nnz).
+    """
+    n = A.shape[0]
+    if not sp.issparse(A):
+        return n ** 3 / 3.0
+    perm = reverse_cuthill_mckee(sp.csr_matrix(A), symmetric_mode=True)
+    B = sp.csr_matrix(A)[perm][:, perm]
+    righe = np.arange(n)
+    prima = np.full(n, n, dtype=np.int64)
+    piene = np.diff(B.indptr) > 0
+    prima[piene] = np.minimum.reduceat(B.indices, B.indptr[:-1][piene])
+    ampiezza = (righe - np.minimum(prima, righe)).astype(np.float64)
+    return float(np.sum(ampiezza ** 2))
+
+
+def _factorization(A):
+    """
+    Livello 'fattorizzazione': (verdetto, motivazione) oppure None se non conclusiva.
+    Per Sylvester A simmetrica è definita positiva se e solo se tutti i pivot della
+    fattorizzazione L D L^T senza pivoting (con permutazione simmetrica) sono positivi.
+    """
+    nnz = A.nnz if sp.issparse(A) else A.size
+    if factorization_cost(A) > FACTORIZATION_FLOP_RATIO * nnz:
+        return None
+    if not sp.issparse(A):
+        try:
+            np.linalg.cholesky(A)  # LAPACK si ferma al primo pivot non positivo
+            return True, "fattorizzazione di Cholesky completata"
+        except np.linalg.LinAlgError:
+            return False, "Cholesky fallita: pivot non positivo"
+    if cholmod_cholesky is not None:
+        try:
+            cholmod_cholesky(A.tocsc())  # CHOLMOD si ferma al primo pivot non positivo
+            return True, "fattorizzazione di Cholesky (CHOLMOD) completata"
+        except CholmodNotPositiveDefiniteError:
+            return False, "Cholesky (CHOLMOD) fallita: pivot non positivo"
+    try:
+        # SuperLU in modalità simmetrica con pivot sulla diagonale: U contiene i pivot di L D L^T
+        lu = spla.splu(A.tocsc(), permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                       options=dict(SymmetricMode=True))
+    except RuntimeError:
+        return False, "pivot nullo nella fattorizzazione L D L^T (minore principale singolare)"
+    if not np.array_equal(lu.perm_r, lu.perm_c):
+        return None  # SuperLU ha scambiato righe: i pivot non sono quelli di L D L^T
+    pivot = lu.U.diagonal()
+    i = int(np.argmin(pivot))
+    if pivot[i] > 0:
+        return True, f"L D L^T completata, pivot minimo {pivot[i]:.3e}"
+    return False, f"pivot non positivo {pivot[i]:.3e} nella fattorizzazione L D L^T"
+
+
+def _lanczos(profile):
+    """Livello 'lanczos': segno dell'autovalore minimo stimato di D^{-1/2} A D^{-1/2} (congruente ad A)."""
+    try:
+        lmin, lmax = profile.jacobi_extremes
+    except (spla.ArpackError, spla.ArpackNoConvergence) as e:
+        warnings.warn(f"Verifica SPD: stima di Lanczos non riuscita ({e}), matrice considerata non SPD.",
+                      RuntimeWarning, stacklevel=2)
+        return False, f"stima di Lanczos non riuscita ({e})"
+    return lmin > 0, f"autovalore minimo stimato di D^-1/2 A D^-1/2: {lmin:.3e} (massimo {lmax:.3e})"
+
+
+def certify_spd(profile, factorize: bool = True) -> SPDCertificate:
+    """
+    Verifica a livelli che la matrice del profilo sia simmetrica definita positiva.
+    Ogni livello si ferma appena decide, dal più economico:
+    1. simmetria (|A - A^T| dal profilo)
+    2. diagonale: a_ii <= 0 per qualche i esclude la definita positività
+    3. dominanza diagonale (Gershgorin, oppure debole e irriducibile): condizione sufficiente
+    4. fattorizzazione di Cholesky / L D L^T: Cholesky densa (LAPACK), CHOLMOD se
+       scikit-sparse è installato, altrimenti SuperLU in modalità simmetrica; solo se
+       factorization_cost(A) <= FACTORIZATION_FLOP_RATIO * nnz
+    5. stima di Lanczos dell'autovalore minimo (non è una prova: certified=False)
+
+    Parametri:
+    - profile: MatrixProfile della matrice
+    - factorize: se False salta il livello 4
+
+    Ritorna: SPDCertificate con verdetto, livello, motivazione e tempo impiegato.
+    """
+    start_time = time.time()
+
+    def esito(is_spd, tier, evidence, certified=True):
+        return SPDCertificate(bool(is_spd), tier, evidence, certified, time.time() - start_time)
+
+    if not profile.is_symmetric:
+        return esito(False, "simmetria", f"max |A - A^T| = {profile.symmetry_defect:.3e}")
+    if profile.n == 0:
+        return esito(True, "diagonale", "matrice vuota")
+    i = int(np.argmin(profile.diag))
+    if profile.diag[i] <= 0:
+        return esito(False, "diagonale", f"elemento diagonale non positivo a_ii = {profile.diag[i]:.3e} (riga {i})")
+    prova = _dominance(profile)
+    if prova is not None:
+        return esito(True, "dominanza diagonale", prova)
+    if factorize:
+        verdetto = _factorization(profile.A)
+        if verdetto is not None:
+            return esito(verdetto[0], "fattorizzazione", verdetto[1])
+    is_spd, motivo = _lanczos(profile)
+    return esito(is_spd, "lanczos", motivo, certified=False)
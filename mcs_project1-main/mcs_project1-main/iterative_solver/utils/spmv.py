@@ -0,0 +1,163 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    # Kernel CSR compilati di SciPy (rilasciano il GIL durante il calcolo)
+    from scipy.sparse import _sparsetools
+except ImportError:  # pragma: no cover - versioni di SciPy senza il modulo privato
+    _sparsetools = None
+
+# Numero minimo di elementi non nulli per blocco: sotto questa soglia il costo di
+# sincronizzazione dei thread supera il guadagno
+MIN_NNZ_PER_CHUNK = 100_000
+
+_settings = {"threads": int(os.environ.get("ITERATIVE_SOLVER_SPMV_THREADS", "1"))}
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_spmv_threads() -> int:
+    """Numero di thread usati dal prodotto matrice-vettore dei metodi iterativi."""
+    return _settings["threads"]
+
+
+def set_spmv_threads(threads) -> None:
+    """
+    Imposta il numero di thread del prodotto matrice-vettore (1 = kernel seriale di SciPy,
+    'auto' = numero di core disponibili). Vale per tutti i metodi iterativi.
+    """
+    if threads == "auto":
+        threads = os.cpu_count() or 1
+    threads = int(threads)
+    if threads < 1:
+        raise ValueError(f"Il numero di thread deve essere >= 1; trovato {threads}.")
+    _settings["threads"] = threads
+
+
+@contextmanager
+def spmv_threads(threads):
+    """Context manager: usa temporaneamente threads thread per il prodotto matrice-vettore."""
+    precedente = get_spmv_threads()
+    set_spmv_threads(threads)
+    try:
+        yield
+    finally:
+        _settings["threads"] = precedente
+
+
+def _thread_pool(threads: int) -> ThreadPoolExecutor:
+    """Pool di thread persistente (uno per numero di thread), riusato da tutti i kernel."""
+    with _pools_lock:
+        pool = _pools.get(threads)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="spmv")
+            _pools[threads] = pool
+    return pool
+
+
+def nnz_balanced_rows(indptr, parts: int) -> np.ndarray:
+    """Confini di riga di parts blocchi con circa lo stesso numero di elementi non nulli."""
+    nnz = int(indptr[-1])
+    targets = np.linspace(0, nnz, parts + 1)
+    confini = np.searchsorted(indptr, targets, side="left")
+    confini[0], confini[-1] = 0, len(indptr) - 1
+    return np.unique(confini)
+
+
+class SpMVKernel:
+    """
+    Prodotto y = A x su matrici CSR, eventualmente multithread.
+
+    Le righe di A sono divise in blocchi con lo stesso numero di non nulli; ogni
+    blocco è calcolato dal kernel compilato di SciPy (che rilascia il GIL) su un
+    pool di thread persistente e scrive direttamente nella sua porzione di out.
+    Con un solo thread il risultato coincide esattamente con A @ x. Il prodotto è
+    calcolato nel tipo di A (float64, oppure float32 per la precisione mista).
+    Per altre matrici (non CSR, dense, LinearOperator) si usa A @ x.
+    """
+
+    def __init__(self, A, threads: int = 1, min_nnz_per_chunk: int = MIN_NNZ_PER_CHUNK):
+        self.A = A
+        self.shape = A.shape
+        self.threads = threads
+        self._chunks = None
+        self.dtype = A.dtype
+        compilato = (_sparsetools is not None and sp.isspmatrix_csr(A) and A.dtype in (np.float32, np.float64)
+                     and A.has_canonical_format)
+        if not compilato:
+            return
+
+        parts = max(1, min(threads, A.nnz // max(min_nnz_per_chunk, 1)))
+        confini = nnz_balanced_rows(A.indptr, parts)
+        self._chunks = []
+        for r0, r1 in zip(confini[:-1], confini[1:]):
+            s, e = A.indptr[r0], A.indptr[r1]
+            indptr = (A.indptr[r0:r1 + 1] - s).astype(A.indices.dtype)
+            self._chunks.append((int(r0), int(r1), indptr, A.indices[s:e], A.data[s:e]))
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._chunks) if self._chunks is not None else 1
+
+    def _run(self, chunk, x, out):
+        r0, r1, indptr, indices, data = chunk
+        y = out[r0:r1]
+        y.fill(0.0)  # i kernel di SciPy accumulano: y += A x
+        if x.ndim == 1:
+            _sparsetools.csr_matvec(r1 - r0, self.shape[1], indptr, indices, data, x, y)
+        else:
+            _sparsetools.csr_matvecs(r1 - r0, self.shape[1], x.shape[1], indptr, indices, data,
+                                     x.ravel(), y.ravel())
+
+    def __call__(self, x, out=None):
+        """Ritorna A @ x; se out è fornito (del tipo di A, C-contiguo) il risultato è scritto lì."""
+        if self._chunks is None:
+            y = self.A @ x
+            if out is None:
+                return y
+            out[...] = y
+            return out
+
+        x = np.ascontiguousarray(x, dtype=self.dtype)
+        if out is None or out.dtype != self.dtype or not out.flags.c_contiguous:
+            risultato = out
+            out = np.empty((self.shape[0],) + x.shape[1:], dtype=self.dtype)
+        else:
+            risultato = None
+
+        if len(self._chunks) == 1:
+            self._run(self._chunks[0], x, out)
+        else:
+            pool = _thread_pool(self.threads)
+            for f in [pool.submit(self._run, c, x, out) for c in self._chunks]:
+                f.result()
+
+        if risultato is not None:
+            risultato[...] = out
+            return risultato
+        return out
+
+    def __matmul__(self, x):
+        return self(x)
+
+
+def spmv_kernel(A, profile=None, threads: int = None) -> SpMVKernel:
+    """
+    Kernel del prodotto matrice-vettore da usare nei cicli dei metodi iterativi.
+
+    Il numero di thread è quello impostato con set_spmv_threads (se threads è None).
+    Con un profilo il kernel viene costruito una volta per matrice e numero di thread.
+    """
+    threads = get_spmv_threads() if threads is None else threads
+    if profile is None or profile.A is not A:
+        return SpMVKernel(A, threads)
+    kernel = profile.spmv_kernels.get(threads)
+    if kernel is None:
+        kernel = SpMVKernel(A, threads)
+        profile.spmv_kernels[threads] = kernel
+    return kernel
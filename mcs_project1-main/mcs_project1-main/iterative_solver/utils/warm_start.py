@@ -0,0 +1,160 @@
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from iterative_solver.utils.matrix_profile import matrix_fingerprint
+
+STRATEGIES = ("projection", "nearest")
+
+
+def initial_guess(x0, b, dtype=np.float64) -> np.ndarray:
+    """Copia di x0 nel tipo dei vettori di lavoro (zeri se x0 è None)."""
+    if x0 is None:
+        return np.zeros(np.shape(b), dtype=dtype)
+    x = np.array(x0, dtype=dtype)
+    if x.shape != np.shape(b):
+        raise ValueError(f"Dimensioni incoerenti: x0 ha forma {x.shape} ma b ha forma {np.shape(b)}.")
+    return x
+
+
+class SolutionCache:
+    """
+    Cache delle soluzioni per sequenze di sistemi con la stessa matrice.
+
+    Per ogni matrice (chiave: impronta del contenuto, oppure una chiave scelta
+    dall'utente per raggruppare matrici leggermente perturbate) conserva le ultime
+    coppie (b, x) e propone il punto iniziale x0:
+    - 'nearest': alpha * x_i della coppia con b_i più vicino a b (alpha minimizza ||b - alpha b_i||);
+    - 'projection': X c con c che minimizza ||b - B c|| sullo span dei b_i memorizzati
+      (poiché A X = B, è il residuo minimo ottenibile sullo span delle soluzioni).
+
+    La memoria è limitata: al più max_pairs coppie per matrice (le più vecchie
+    escono per prime) e max_bytes in totale, con eviction LRU delle matrici usate
+    meno di recente.
+    """
+
+    def __init__(self, max_pairs: int = 8, max_bytes: int = 256 * 2**20, strategy: str = "projection"):
+        """
+        Parametri:
+        - max_pairs: coppie (b, x) conservate per ogni matrice
+        - max_bytes: memoria massima occupata da tutte le coppie
+        - strategy: 'projection' (default) oppure 'nearest'
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Strategia sconosciuta: {strategy!r}. Valori ammessi: {list(STRATEGIES)}.")
+        if max_pairs < 1:
+            raise ValueError(f"max_pairs deve essere >= 1; trovato {max_pairs}.")
+        self.max_pairs = max_pairs
+        self.max_bytes = max_bytes
+        self.strategy = strategy
+        self.nbytes = 0
+        # chiave -> deque di coppie (b, x), in ordine LRU
+        self._entries = OrderedDict()
+        # (chiave, tolleranza) -> iterazioni dell'ultima risoluzione partita da zero
+        self._cold = {}
+        self.stats = {"solves": 0, "warm": 0, "compared": 0, "saved_iterations": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return sum(len(coppie) for coppie in self._entries.values())
+
+    @staticmethod
+    def key(A) -> str:
+        return matrix_fingerprint(A)
+
+    # --- Punto iniziale ---
+
+    def initial_guess(self, A, b, key: str = None):
+        """Punto iniziale per A x = b dalle soluzioni memorizzate (None se non ce ne sono)."""
+        key = self.key(A) if key is None else key
+        coppie = self._entries.get(key)
+        b = np.asarray(b, dtype=np.float64)
+        if not coppie or b.ndim != 1:
+            return None
+        self._entries.move_to_end(key)
+
+        if self.strategy == "nearest":
+            migliore, x0 = np.inf, None
+            for bi, xi in coppie:
+                bb = float(bi @ bi)
+                alpha = float(b @ bi) / bb if bb > 0 else 0.0
+                distanza = np.linalg.norm(b - alpha * bi)
+                if distanza < migliore:
+                    migliore, x0 = distanza, alpha * xi
+            return x0
+
+        B = np.column_stack([bi for bi, _ in coppie])
+        X = np.column_stack([xi for _, xi in coppie])
+        c = np.linalg.lstsq(B, b, rcond=None)[0]
+        return X @ c
+
+    # --- Memorizzazione ---
+
+    def store(self, A, b, x, key: str = None) -> None:
+        """Memorizza la coppia (b, x) per la matrice A (copie in float64)."""
+        key = self.key(A) if key is None else key
+        b = np.array(b, dtype=np.float64)
+        x = np.array(x, dtype=np.float64)
+        if b.ndim != 1:
+            return
+        coppie = self._entries.get(key)
+        if coppie is None:
+            coppie = self._entries[key] = deque()
+        self._entries.move_to_end(key)
+        if len(coppie) == self.max_pairs:
+            vecchia_b, vecchia_x = coppie.popleft()
+            self.nbytes -= vecchia_b.nbytes + vecchia_x.nbytes
+        coppie.append((b, x))
+        self.nbytes += b.nbytes + x.nbytes
+        self._evict(key)
+
+    def _evict(self, protetta: str) -> None:
+        """Elimina le matrici usate meno di recente finché la memoria rientra in max_bytes."""
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == protetta:
+                self._entries.move_to_end(key)
+                continue
+            for b, x in self._entries.pop(key):
+                self.nbytes -= b.nbytes + x.nbytes
+            self._cold = {k: v for k, v in self._cold.items() if k[0] != key}
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._cold.clear()
+        self.nbytes = 0
+
+    # --- Risoluzione con warm start ---
+
+    def solve(self, solver, A, b, x_true, tol, key: str = None, **kwargs):
+        """
+        Risolve A x = b con solver (jacobi, gauss_seidel, gradient, conjugate_gradient)
+        partendo dal punto iniziale proposto dalla cache, e memorizza la soluzione se converge.
+
+        Le iterazioni risparmiate sono misurate rispetto all'ultima risoluzione partita da
+        zero con la stessa matrice e la stessa tolleranza (vedi report()).
+        Ritorna la tupla del metodo (x, iterazioni, errore relativo, tempo, convergenza).
+        """
+        key = self.key(A) if key is None else key
+        x0 = self.initial_guess(A, b, key)
+        risultato = solver(A, b, x_true, tol, x0=x0, **kwargs)
+        x, iterazioni, convergenza = risultato[0], int(risultato[1]), risultato[4]
+
+        self.stats["solves"] += 1
+        if x0 is None:
+            self._cold[(key, tol)] = iterazioni
+        else:
+            self.stats["warm"] += 1
+            riferimento = self._cold.get((key, tol))
+            if riferimento is not None:
+                self.stats["compared"] += 1
+                self.stats["saved_iterations"] += riferimento - iterazioni
+        if convergenza:
+            self.store(A, b, x, key)
+        return risultato
+
+    def report(self) -> str:
+        s = self.stats
+        return (f"Warm start ({self.strategy}): {s['warm']}/{s['solves']} risoluzioni con punto iniziale dalla cache, "
+                f"{s['saved_iterations']} iterazioni risparmiate su {s['compared']} confronti con la risoluzione "
+                f"da zero; {len(self)} coppie in cache ({self.nbytes / 2**20:.1f} MiB), {s['evictions']} eviction")
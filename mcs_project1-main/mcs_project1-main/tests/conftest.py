@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.utils.matrix_profile import clear_profile_cache
+
+
+@pytest.fixture(autouse=True)
+def _profili_puliti():
+    """Ogni test parte con la cache dei profili vuota."""
+    clear_profile_cache()
+    yield
+    clear_profile_cache()
+
+
+def tridiagonal(n: int, diag: float = 4.0, off: float = -1.0) -> sp.csr_matrix:
+    """Matrice tridiagonale simmetrica (SPD e diagonalmente dominante per diag > 2 |off|)."""
+    return sp.diags([off, diag, off], [-1, 0, 1], shape=(n, n), format="csr", dtype=np.float64)
+
+
+def nonsymmetric(n: int, seed: int = 0) -> sp.csr_matrix:
+    """Matrice sparsa non simmetrica e diagonalmente dominante."""
+    rng = np.random.default_rng(seed)
+    R = sp.random(n, n, density=0.1, random_state=rng, format="csr")
+    return (R + sp.diags(np.asarray(abs(R).sum(axis=1)).ravel() + 1.0)).tocsr()
+
+
+def residual(A, b, x) -> float:
+    """Residuo relativo vero ||b - A x|| / ||b||."""
+    return float(np.linalg.norm(b - A @ x) / np.linalg.norm(b))
+
+
+# Elementi duplicati (2, 1), riga vuota (3) e commenti
+MTX_BODY = "2 1 1.5\n1 1 4\n2 1 0.5\n2 2 4\n4 4 3\n4 2 -1\n"
+
+
+def write_mtx(tmp_path, nome: str, testo: str) -> str:
+    """Scrive testo nel file tmp_path/nome e ne ritorna il percorso."""
+    path = tmp_path / nome
+    path.write_text(testo)
+    return str(path)
+
+
+@pytest.fixture(params=["general", "symmetric", "skew-symmetric", "pattern"])
+def mtx(request, tmp_path):
+    """File Matrix Market 4x4 'coordinate' in ognuno dei formati gestiti dal lettore a blocchi."""
+    simmetria = "general" if request.param == "pattern" else request.param
+    campo = "pattern" if request.param == "pattern" else "real"
+    corpo = MTX_BODY
+    if request.param == "pattern":
+        corpo = "".join(" ".join(riga.split()[:2]) + "\n" for riga in MTX_BODY.splitlines())
+    if request.param == "skew-symmetric":
+        # Solo elementi strettamente inferiori
+        corpo = "2 1 1.5\n2 1 0.5\n4 2 -1\n3 1 2\n"
+    righe = len(corpo.splitlines())
+    testo = f"%%MatrixMarket matrix coordinate {campo} {simmetria}\n% commento\n4 4 {righe}\n{corpo}"
+    return write_mtx(tmp_path, f"{request.param}.mtx", testo)
+
+
+@pytest.fixture
+def spd():
+    """Sistema SPD (Poisson 2D 12x12 più identità) con soluzione esatta nota: (A, b, x_true)."""
+    A = poisson_2d(12) + sp.identity(144)
+    x_true = np.linspace(1.0, 2.0, 144)
+    return A.tocsr(), A @ x_true, x_true
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import scipy.sparse.linalg as spla
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.iterative_methods.amg import amg, amg_preconditioner
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.multigrid import AMGHierarchy, aggregate, strength_of_connection
+from iterative_solver.utils.matrix_profile import MatrixProfile, get_matrix_profile
+from tests.conftest import residual, tridiagonal
+
+TOL = 1e-10
+
+
+@pytest.fixture
+def poisson():
+    A = poisson_2d(32)
+    x_true = np.linspace(-1.0, 1.0, A.shape[0])
+    return A, A @ x_true, x_true
+
+
+def test_aggregazione_copre_i_nodi_accoppiati():
+    A = poisson_2d(10)
+    S = strength_of_connection(A, A.diagonal(), 0.08)
+    assert abs(S - S.T).max() == 0 and S.diagonal().sum() == 0
+    aggregati = aggregate(S)
+    assert np.all(aggregati >= 0)
+    # Ogni aggregato è non vuoto e molto più piccolo della griglia
+    dimensioni = np.bincount(aggregati)
+    assert np.all(dimensioni > 0) and dimensioni.size < A.shape[0] // 3
+
+
+def test_gerarchia(poisson):
+    A, _, _ = poisson
+    gerarchia = AMGHierarchy(MatrixProfile(A))
+    assert gerarchia.n_levels >= 2 and gerarchia.levels[-1].n <= 100
+    dimensioni = [lv.n for lv in gerarchia.levels]
+    assert dimensioni == sorted(dimensioni, reverse=True)
+    assert 1.0 < gerarchia.operator_complexity < 2.0 and 1.0 < gerarchia.grid_complexity < 1.5
+    # Operatore grossolano di Galerkin R A P
+    fine, grossolano = gerarchia.levels[0], gerarchia.levels[1]
+    np.testing.assert_allclose((fine.R @ A @ fine.P).toarray(), grossolano.A.toarray(), atol=1e-12)
+    assert "livello 0" in gerarchia.report()
+    with pytest.raises(ValueError, match="Smoother"):
+        AMGHierarchy(MatrixProfile(A), smoother="sor")
+
+
+@pytest.mark.parametrize("smoother", ["gauss_seidel", "jacobi"])
+def test_v_ciclo_riduce_il_residuo(poisson, smoother):
+    A, b, _ = poisson
+    gerarchia = AMGHierarchy(MatrixProfile(A), smoother=smoother)
+    x = np.zeros_like(b)
+    precedente = np.linalg.norm(b)
+    for _ in range(5):
+        gerarchia.cycle(b, x)
+        attuale = np.linalg.norm(b - A @ x)
+        assert attuale < 0.5 * precedente
+        precedente = attuale
+    assert gerarchia.cycles == 5 and gerarchia.mean_cycle_time > 0
+
+
+@pytest.mark.parametrize("smoother", ["gauss_seidel", "jacobi"])
+def test_amg_come_soluzione_diretta(poisson, smoother):
+    A, b, x_true = poisson
+    x, it, _, _, conv = amg(A, b, x_true, TOL, smoother=smoother)
+    assert conv and residual(A, b, x) < TOL
+    np.testing.assert_allclose(x, spla.spsolve(A.tocsc(), b), rtol=1e-7, atol=1e-8)
+    # Iterazioni quasi indipendenti dalla dimensione
+    A_grande = poisson_2d(64)
+    b_grande = A_grande @ np.ones(A_grande.shape[0])
+    assert amg(A_grande, b_grande, np.ones(A_grande.shape[0]), TOL, smoother=smoother)[1] <= 2 * it
+
+
+def test_precondizionatore_amg(poisson):
+    A, b, x_true = poisson
+    profilo = get_matrix_profile(A)
+    M = amg_preconditioner(A, profilo)
+    assert amg_preconditioner(A, profilo) is M  # gerarchia costruita una volta per matrice
+    x, it, _, _, conv = conjugate_gradient(A, b, x_true, TOL, preconditioner=M)
+    assert conv and residual(A, b, x) < TOL
+    assert it < conjugate_gradient(A, b, x_true, TOL)[1] / 3
+
+
+def test_matrice_piccola_un_solo_livello():
+    A = tridiagonal(50)
+    gerarchia = AMGHierarchy(MatrixProfile(A))
+    assert gerarchia.n_levels == 1
+    _, it, _, _, conv = amg(A, A @ np.ones(50), np.ones(50), TOL)
+    assert conv and it == 1
@@ -0,0 +1,56 @@
+import copy
+
+import numpy as np
+import pytest
+
+from iterative_solver.benchmark.generators import (
+    diag_dominant,
+    make_matrix,
+    poisson_2d,
+    poisson_2d_operator,
+    poisson_3d,
+    random_spd,
+)
+from iterative_solver.benchmark.runner import compare_to_baseline, run_benchmark
+
+
+def test_poisson_operatore_come_matrice():
+    A = poisson_2d(7)
+    op, diag = poisson_2d_operator(7)
+    v = np.random.default_rng(0).standard_normal(49)
+    np.testing.assert_allclose(op @ v, A @ v)
+    np.testing.assert_array_equal(diag, A.diagonal())
+    assert poisson_3d(4).shape == (64, 64) and poisson_3d(4).diagonal()[0] == 6.0
+
+
+@pytest.mark.parametrize("n", [40, 200])
+def test_spd_casuale_con_condizionamento(n):
+    A = random_spd(n, cond=100.0, seed=1)
+    autovalori = np.linalg.eigvalsh(A.toarray())
+    assert abs(A - A.T).max() == 0
+    assert autovalori[0] == pytest.approx(1.0, rel=1e-6)
+    assert autovalori[-1] == pytest.approx(100.0, rel=1e-6)
+
+
+def test_diagonale_dominante():
+    A = diag_dominant(100, margin=0.1, seed=2)
+    fuori = np.asarray(abs(A).sum(axis=1)).ravel() - abs(A.diagonal())
+    assert np.all(A.diagonal() > fuori)
+    with pytest.raises(ValueError, match="Famiglia"):
+        make_matrix("boh", 10)
+
+
+def test_suite_e_confronto_con_baseline():
+    risultati = run_benchmark(families=["poisson2d"], sizes=[64], methods=["spmv", "jacobi", "conjugate_gradient"],
+                              warmup=0, repeats=1, verbose=False)
+    assert [r["method"] for r in risultati["results"]] == ["spmv", "jacobi", "conjugate_gradient"]
+    assert all(r["converged"] for r in risultati["results"][1:])
+    assert compare_to_baseline(risultati, risultati) == []
+
+    # Baseline con meno iterazioni e tempi migliori: regressioni segnalate
+    baseline = copy.deepcopy(risultati)
+    jacobi_base = baseline["results"][1]
+    jacobi_base["iterations"] -= 1
+    jacobi_base["time_per_iter"] /= 10
+    metriche = {r["metric"] for r in compare_to_baseline(risultati, baseline)}
+    assert metriche == {"iterations", "time_per_iter"}
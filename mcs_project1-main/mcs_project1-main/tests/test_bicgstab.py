@@ -0,0 +1,46 @@
+import warnings
+
+import numpy as np
+import pytest
+import scipy.sparse.linalg as spla
+
+from iterative_solver.iterative_methods.bicgstab import bicgstab
+from tests.conftest import nonsymmetric, residual
+
+
+def test_converge_su_matrice_non_simmetrica():
+    A = nonsymmetric(200)
+    x_true = np.ones(200)
+    b = A @ x_true
+    x, it, _, _, conv = bicgstab(A, b, x_true, 1e-10)
+    assert conv and it > 0
+    assert residual(A, b, x) < 1e-10
+    np.testing.assert_allclose(x, spla.spsolve(A.tocsc(), b), rtol=1e-8)
+
+
+def test_precondizionato_jacobi():
+    A = nonsymmetric(200, seed=1)
+    b = A @ np.arange(200.0)
+    x, _, _, _, conv = bicgstab(A, b, np.arange(200.0), 1e-10, preconditioner="jacobi")
+    assert conv and residual(A, b, x) < 1e-10
+
+
+@pytest.mark.parametrize("A, b", [
+    # r_hat · A p = 0 al primo passo (rotazione di 90 gradi)
+    (np.array([[0.0, 1.0], [-1.0, 0.0]]), np.array([1.0, 0.0])),
+])
+def test_breakdown_warning_senza_eccezioni(A, b):
+    with pytest.warns(RuntimeWarning, match="breakdown") as avvisi:
+        x, _, _, _, conv = bicgstab(A, b, np.linalg.solve(A, b), 1e-8)
+    # Il warning indica la riga del chiamante, non l'interno del metodo
+    assert avvisi[0].filename == __file__
+    assert not conv
+    assert np.all(np.isfinite(x))
+
+
+def test_b_nullo():
+    A = nonsymmetric(20)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        x, it, _, _, conv = bicgstab(A, np.zeros(20), np.zeros(20), 1e-8)
+    assert conv and it == 0 and not np.any(x)
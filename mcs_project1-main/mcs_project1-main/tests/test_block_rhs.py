@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from iterative_solver.iterative_methods.bicgstab import bicgstab
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.block_rhs import block_errors, check_block, solve_columns
+from tests.conftest import nonsymmetric, residual
+
+TOL = 1e-10
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, conjugate_gradient], ids=lambda f: f.__name__)
+def test_blocco_di_termini_noti(solver, spd):
+    A, _, _ = spd
+    X_true = np.random.default_rng(0).standard_normal((144, 3))
+    B = A @ X_true
+    X, it, _, _, conv = solver(A, B, X_true, TOL)
+    assert np.all(conv) and np.shape(it) == (3,)
+    for j in range(3):
+        assert residual(A, B[:, j], X[:, j]) < TOL
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, conjugate_gradient], ids=lambda f: f.__name__)
+def test_colonne_come_soluzioni_singole(solver, spd):
+    # Ogni colonna del blocco si ferma dopo le stesse iterazioni del vettore singolo
+    A, b, x_true = spd
+    X, it, err, _, _ = solver(A, np.column_stack((b, 2 * b)), np.column_stack((x_true, 2 * x_true)), TOL)
+    x, it_singolo, err_singolo, _, _ = solver(A, b, x_true, TOL)
+    assert list(it) == [it_singolo, it_singolo]
+    np.testing.assert_allclose(X[:, 0], x, rtol=1e-10)
+    np.testing.assert_allclose(err[0], err_singolo, rtol=1e-6)
+
+
+def test_soluzione_colonna_per_colonna():
+    A = nonsymmetric(60)
+    X_true = np.column_stack((np.ones(60), np.arange(60.0)))
+    B = A @ X_true
+    X, it, err, _, conv = solve_columns(lambda b, x, x0: bicgstab(A, b, x, TOL, x0=x0), B, X_true)
+    assert np.all(conv) and it.shape == (2,) and err.shape == (2,)
+    for j in range(2):
+        assert residual(A, B[:, j], X[:, j]) < TOL
+
+
+def test_errori_per_colonna():
+    X_exact = np.array([[1.0, 0.0], [0.0, 0.0]])
+    X = np.array([[1.5, 0.0], [0.0, 0.25]])
+    # Relativo sulla prima colonna, assoluto sulla seconda (soluzione esatta nulla)
+    np.testing.assert_allclose(block_errors(X, X_exact), [0.5, 0.25])
+    with pytest.raises(ValueError, match="Dimensioni"):
+        check_block(np.ones((3, 2)), np.ones((3, 1)))
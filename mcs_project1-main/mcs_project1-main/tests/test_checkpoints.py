@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.test_matrices_folder import _solve_method_on_tolerances
+from iterative_solver.utils.checkpoints import ToleranceCheckpoints
+from tests.conftest import residual
+
+TOLLERANZE = [1e-4, 1e-6, 1e-8]
+
+
+@pytest.fixture
+def spd():
+    A = poisson_2d(12).tocsr()
+    x_true = np.linspace(1.0, 2.0, 144)
+    return A, A @ x_true, x_true
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, gradient, conjugate_gradient], ids=lambda f: f.__name__)
+def test_checkpoint_coerenti_con_esecuzioni_separate(solver, spd):
+    A, b, x_true = spd
+    checkpoints = ToleranceCheckpoints(TOLLERANZE, x_true)
+    solver(A, b, x_true, checkpoints.tightest, checkpoints=checkpoints)
+    for tol, it, _, _, conv in checkpoints.results():
+        assert conv and it == solver(A, b, x_true, tol)[1]
+
+
+def test_esecuzione_singola_su_tutte_le_tolleranze(spd):
+    A, b, x_true = spd
+    esiti = _solve_method_on_tolerances(conjugate_gradient, A, b, x_true, TOLLERANZE, single_pass=True)
+    assert [r[0] for _, r, _ in esiti] == TOLLERANZE
+    for x, (tol, _, _, _, conv, _), _ in esiti:
+        # Copia della soluzione al momento dell'attraversamento della tolleranza
+        assert conv and residual(A, b, x) <= tol
+
+
+def test_tolleranze_non_raggiunte():
+    checkpoints = ToleranceCheckpoints([1e-2, 1e-6], keep_x=True)
+    checkpoints.observe(3, 5e-3, np.ones(2), 0.0)
+    checkpoints.finish(np.zeros(2), 10, None, 1.0, False)
+    x, it, _, _, conv = checkpoints.result(1e-2)
+    assert it == 3 and conv and np.all(x == 1.0)
+    x, it, _, _, conv = checkpoints.result(1e-6)
+    assert it == 10 and not conv and np.all(x == 0.0)
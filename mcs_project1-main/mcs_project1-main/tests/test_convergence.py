@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pytest
+import scipy.io
+
+from iterative_solver.iterative_methods.auto import AUTO_METHODS, auto, auto_method_name
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.test_matrices_folder import NOME_AUTO, test_matrices_folder as run_folder
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from tests.conftest import residual, tridiagonal
+
+
+def test_fattori_di_riduzione_di_jacobi_e_gauss_seidel():
+    n = 60
+    previsione = get_matrix_profile(tridiagonal(n, diag=2.05)).convergence
+    # Tridiagonale (-1, d, -1): rho(Jacobi) = 2 cos(pi / (n + 1)) / d, rho(Gauss-Seidel) = rho(Jacobi)^2
+    rho_j = 2 * math.cos(math.pi / (n + 1)) / 2.05
+    assert previsione["jacobi"].rate == pytest.approx(rho_j, rel=1e-3)
+    assert previsione["gauss_seidel"].rate == pytest.approx(rho_j ** 2, rel=1e-3)
+    assert previsione["conjugate_gradient"].rate < previsione["gradient"].rate < 1.0
+
+
+def test_gradiente_coniugato_entro_la_previsione():
+    A = tridiagonal(200, diag=2.2)
+    b = A @ np.ones(200)
+    previsione = get_matrix_profile(A).convergence["conjugate_gradient"]
+    for tol in (1e-4, 1e-8):
+        assert conjugate_gradient(A, b, np.ones(200), tol)[1] <= previsione.iterations(tol)
+
+
+def test_metodi_divergenti_e_non_applicabili_saltati():
+    # Diagonale non dominante e A indefinita: Jacobi diverge, gradienti non applicabili
+    previsione = get_matrix_profile(tridiagonal(30, diag=1.0)).convergence
+    assert previsione["jacobi"].diverges
+    assert "divergente" in previsione["jacobi"].skip_reason(1e-6)
+    assert not previsione["conjugate_gradient"].applicable
+    assert previsione["conjugate_gradient"].iterations(1e-6) is None
+    assert previsione.best(1e-6) is None
+
+
+def test_auto_usa_il_metodo_previsto():
+    A = tridiagonal(100)
+    b = A @ np.ones(100)
+    nome = auto_method_name(A, 1e-8)
+    assert nome in AUTO_METHODS
+    x, it, _, _, conv = auto(A, b, np.ones(100), 1e-8)
+    assert conv and residual(A, b, x) < 1e-8
+    assert it == AUTO_METHODS[nome](A, b, np.ones(100), 1e-8)[1]
+
+
+def test_auto_precisione_mista():
+    A = tridiagonal(100)
+    b = A @ np.ones(100)
+    x, _, _, _, conv = auto(A, b, np.ones(100), 1e-10, precision="mixed")
+    assert conv and x.dtype == np.float64 and residual(A, b, x) < 1e-10
+
+
+def test_auto_senza_metodi_convergenti():
+    A = tridiagonal(30, diag=1.0)
+    with pytest.raises(ValueError, match="convergente"):
+        auto(A, A @ np.ones(30), np.ones(30), 1e-6)
+
+
+def test_cartella_con_previsione_e_precisione_mista(tmp_path, monkeypatch):
+    cartella = tmp_path / "matrici"
+    cartella.mkdir()
+    scipy.io.mmwrite(str(cartella / "tri.mtx"), tridiagonal(40), symmetry="symmetric")
+    monkeypatch.chdir(tmp_path)  # results/ viene creata nella cartella corrente
+    run_folder(str(cartella), predict=True, precision="mixed")
+    with open(tmp_path / "results" / "tri_results" / "output.csv") as f:
+        righe = [riga for riga in f if riga.startswith(NOME_AUTO)]
+    assert len(righe) == 4
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from iterative_solver.iterative_methods.gmres import gmres
+from iterative_solver.utils.recorder import IterationRecorder
+from tests.conftest import nonsymmetric, residual
+
+TOL = 1e-10
+
+
+def test_gmres_non_simmetrica():
+    A = nonsymmetric(100, seed=2)
+    b = A @ np.ones(100)
+    x, _, _, _, conv = gmres(A, b, np.ones(100), TOL)
+    assert conv and residual(A, b, x) < TOL
+
+
+def test_senza_restart_converge_in_al_piu_n_passi():
+    # Base completa (m = n): GMRES è esatto in al più n iterazioni
+    A = nonsymmetric(40, seed=5)
+    b = A @ np.arange(40.0)
+    x, it, _, _, conv = gmres(A, b, np.arange(40.0), TOL, restart=40)
+    assert conv and it <= 40 and residual(A, b, x) < TOL
+
+
+@pytest.mark.parametrize("restart", [5, 20])
+def test_restart_e_residuo_monitorato(restart):
+    A = nonsymmetric(150, seed=6)
+    b = A @ np.ones(150)
+    rec = IterationRecorder()
+    x, it, _, _, conv = gmres(A, b, np.ones(150), TOL, restart=restart, recorder=rec)
+    assert conv and rec.iterations == it
+    # Il residuo stimato con le rotazioni di Givens coincide con quello vero a fine ciclo
+    assert rec.residuals[-1] == pytest.approx(residual(A, b, x), rel=1e-4)
+    assert np.all(np.diff(rec.residuals) <= 1e-14)  # GMRES minimizza il residuo: mai in aumento
+
+
+def test_precondizionatore_riduce_le_iterazioni():
+    A = nonsymmetric(200, seed=7)
+    b = A @ np.ones(200)
+    _, it, _, _, _ = gmres(A, b, np.ones(200), TOL, restart=10)
+    x, it_pre, _, _, conv = gmres(A, b, np.ones(200), TOL, restart=10, preconditioner="jacobi")
+    assert conv and residual(A, b, x) < TOL and it_pre <= it
+    with pytest.raises(ValueError, match="restart"):
+        gmres(A, b, np.ones(200), TOL, restart=0)
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+import scipy.io
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.matrix_loader import load_matrix
+from iterative_solver.utils.mtx_reader import write_mtx_csr
+from iterative_solver.utils.out_of_core import MemmapCSR, spmv_throughput
+from tests.conftest import MTX_BODY, residual, write_mtx
+
+
+def test_memmap_csr_come_matrice_in_memoria(mtx):
+    M = load_matrix(mtx, out_of_core=True)
+    assert isinstance(M, MemmapCSR)
+    assert not any(name.endswith(".tmp.npy") for name in os.listdir(M.path))
+    A = scipy.io.mmread(mtx).tocsr()
+    x = np.arange(1.0, 5.0)
+    np.testing.assert_allclose(M @ x, A @ x)
+    np.testing.assert_allclose(M @ np.eye(4), A.toarray())
+    np.testing.assert_allclose(M.diagonal(), A.diagonal())
+    # Stesso formato della cache binaria
+    np.testing.assert_array_equal(load_matrix(mtx, use_cache=True).toarray(), A.toarray())
+
+
+@pytest.mark.parametrize("chunk_bytes", [7, 1 << 20])
+def test_conversione_su_disco_con_duplicati(tmp_path, chunk_bytes):
+    testo = f"%%MatrixMarket matrix coordinate real general\n4 4 6\n{MTX_BODY}"
+    path = write_mtx(tmp_path, "dup.mtx", testo)
+    dest = tmp_path / "csr"
+    dest.mkdir()
+    shape, nnz = write_mtx_csr(path, str(dest), chunk_bytes=chunk_bytes)
+    atteso = scipy.io.mmread(path).tocsr()
+    atteso.sum_duplicates()
+    assert shape == (4, 4) and nnz == atteso.nnz == 5
+    # Array accorciati al numero di elementi dopo la somma dei duplicati, nessun file temporaneo
+    assert sorted(os.listdir(dest)) == ["data.npy", "indices.npy", "indptr.npy"]
+    arrays = {name: np.load(dest / f"{name}.npy") for name in ("data", "indices", "indptr")}
+    np.testing.assert_array_equal(arrays["indptr"], atteso.indptr)
+    np.testing.assert_array_equal(arrays["indices"], atteso.indices)
+    np.testing.assert_array_equal(arrays["data"], atteso.data)
+
+
+def test_matrice_su_disco_formato_array(tmp_path):
+    # Formato non gestito dal lettore a blocchi: conversione con mmread
+    path = str(tmp_path / "densa.mtx")
+    scipy.io.mmwrite(path, np.array([[4.0, -1.0], [-1.0, 4.0]]))
+    M = load_matrix(path, out_of_core=True)
+    np.testing.assert_allclose(M @ np.ones(2), [3.0, 3.0])
+
+
+def test_solutori_su_matrice_su_disco(tmp_path):
+    n = 300
+    A = sp.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(n, n), format="csr")
+    path = str(tmp_path / "tri.mtx")
+    scipy.io.mmwrite(path, A, symmetry="symmetric")
+    # Blocchi piccoli: il prodotto attraversa molti blocchi con readahead
+    M = MemmapCSR(load_matrix(path, out_of_core=True).path, block_bytes=512)
+    assert len(M.blocks) > 5
+    x_true = np.ones(n)
+    b = A @ x_true
+    for solver in (jacobi, conjugate_gradient):
+        x, it, _, _, conv = solver(M, b, x_true, 1e-10)
+        assert conv and residual(A, b, x) < 1e-10
+        assert it == solver(A, b, x_true, 1e-10)[1]
+    assert M.products > 0 and M.throughput > 0
+    assert spmv_throughput(A, repeats=1) > 0
+    M.close()
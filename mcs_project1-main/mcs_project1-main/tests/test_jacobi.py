@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from tests.conftest import nonsymmetric, residual, tridiagonal
+
+TOL = 1e-10
+
+
+def _jacobi_riferimento(A, b, tol, omega=1.0):
+    """Jacobi (smorzato) da manuale: x += omega * D^-1 (b - A x) finché ||b - A x|| >= tol ||b||."""
+    x = np.zeros_like(b)
+    d = A.diagonal()
+    k = 0
+    while np.linalg.norm(b - A @ x) >= tol * np.linalg.norm(b):
+        x = x + omega * (b - A @ x) / d
+        k += 1
+    return x, k
+
+
+@pytest.mark.parametrize("omega", [1.0, 0.8])
+def test_come_jacobi_da_manuale(omega):
+    A = nonsymmetric(80, seed=4)
+    b = A @ np.ones(80)
+    x, it, _, _, conv = jacobi(A, b, np.ones(80), TOL, omega=omega)
+    x_rif, it_rif = _jacobi_riferimento(A, b, TOL, omega)
+    assert conv and it == it_rif
+    np.testing.assert_allclose(x, x_rif, rtol=1e-12)
+
+
+def test_chebyshev_e_omega_auto():
+    A = tridiagonal(100, diag=2.5)
+    b = A @ np.ones(100)
+    classico = jacobi(A, b, np.ones(100), TOL)[1]
+    for kwargs in ({"chebyshev": True}, {"omega": "auto"}):
+        x, _, _, _, conv = jacobi(A, b, np.ones(100), TOL, **kwargs)
+        assert conv and residual(A, b, x) < TOL
+    # Chebyshev: convergenza in circa sqrt(k) iterazioni invece di k
+    assert jacobi(A, b, np.ones(100), TOL, chebyshev=True)[1] < classico / 2
+
+
+@pytest.mark.filterwarnings("ignore:La matrice A non è")
+def test_chebyshev_richiede_spettro_positivo():
+    A = tridiagonal(30, diag=1.0)
+    with pytest.raises(ValueError, match="spettro"):
+        jacobi(A, A @ np.ones(30), np.ones(30), TOL, chebyshev=True)
+
+
+def test_controlli_sulla_matrice():
+    A = tridiagonal(20, diag=1.0)
+    b = A @ np.ones(20)
+    with pytest.warns(UserWarning, match="dominante") as avvisi:
+        jacobi(A, b, np.ones(20), TOL, max_iter=5)
+    assert avvisi[0].filename == __file__
+    with pytest.raises(ValueError, match="dominante"):
+        jacobi(A, b, np.ones(20), TOL, require_diagonal_dominance=True)
+    B = sp.lil_matrix(tridiagonal(20))
+    B[4, 4] = 0.0
+    with pytest.raises(ValueError, match="diagonale"):
+        jacobi(B.tocsr(), b, np.ones(20), TOL)
+    with pytest.raises(ValueError, match="incoerenti"):
+        jacobi(tridiagonal(20), np.ones(19), np.ones(20), TOL)
+
+
+def test_b_nullo():
+    A = tridiagonal(10)
+    x, it, _, _, conv = jacobi(A, np.zeros(10), np.zeros(10), TOL)
+    assert conv and it == 0 and not np.any(x)
+
+
+def test_spettro_in_cache_nel_profilo():
+    A = tridiagonal(50, diag=2.5)
+    jacobi(A, A @ np.ones(50), np.ones(50), TOL, chebyshev=True)
+    assert "jacobi_spectrum" in get_matrix_profile(A).__dict__
@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pytest
+import scipy.io
+
+from iterative_solver.utils.matrix_loader import (
+    _cache_dir,
+    load_cached_permutation,
+    load_matrix,
+    save_cached_permutation,
+)
+from tests.conftest import write_mtx
+
+
+def test_cache_binaria_e_invalidazione(mtx):
+    A = load_matrix(mtx, use_cache=True)
+    assert os.path.exists(os.path.join(_cache_dir(mtx), "meta.json"))
+    B = load_matrix(mtx, use_cache=True)
+    # Array memory-mapped di sola lettura, nessuna copia
+    assert not B.data.flags.owndata and not B.data.flags.writeable
+    np.testing.assert_array_equal(A.toarray(), B.toarray())
+
+    save_cached_permutation(mtx, "rcm", np.arange(4))
+    np.testing.assert_array_equal(load_cached_permutation(mtx, "rcm"), np.arange(4))
+
+    # File modificato (stesso contenuto numerico scalato, mtime diverso): cache ricostruita
+    with open(mtx) as f:
+        testo = f.read()
+    with open(mtx, "w") as f:
+        f.write(testo.replace("4 4 3\n", "4 4 9\n"))
+    st = os.stat(mtx)
+    os.utime(mtx, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert load_cached_permutation(mtx, "rcm") is None
+    C = load_matrix(mtx, use_cache=True)
+    np.testing.assert_array_equal(C.toarray(), scipy.io.mmread(mtx).toarray())
+    assert load_cached_permutation(mtx, "rcm") is None
+
+
+def test_cache_con_chiave_hash(tmp_path):
+    path = write_mtx(tmp_path, "h.mtx", "%%MatrixMarket matrix coordinate real general\n2 2 2\n1 1 1\n2 2 2\n")
+    load_matrix(path, use_cache=True, cache_key="hash")
+    # Stessa dimensione e mtime forzato uguale: solo l'hash si accorge della modifica
+    st = os.stat(path)
+    with open(path, "w") as f:
+        f.write("%%MatrixMarket matrix coordinate real general\n2 2 2\n1 1 1\n2 2 5\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert load_matrix(path, use_cache=True, cache_key="hash")[1, 1] == 5.0
+    with pytest.raises(ValueError):
+        load_matrix(path, use_cache=True, cache_key="boh")
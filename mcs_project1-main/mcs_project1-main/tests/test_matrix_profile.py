@@ -0,0 +1,54 @@
+import numpy as np
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.utils.matrix_profile import PROFILE_CACHE_SIZE, MatrixProfile, get_matrix_profile
+from tests.conftest import nonsymmetric, tridiagonal
+
+
+def test_stesso_contenuto_stesso_profilo():
+    A = tridiagonal(20)
+    profilo = get_matrix_profile(A)
+    assert get_matrix_profile(A.copy()) is profilo
+    assert get_matrix_profile(A.tocoo()) is profilo
+    B = A.copy()
+    B[0, 0] = 5.0
+    assert get_matrix_profile(B) is not profilo
+
+
+def test_cache_lru():
+    matrici = [tridiagonal(10, diag=3.0 + i) for i in range(PROFILE_CACHE_SIZE + 1)]
+    primo = get_matrix_profile(matrici[0])
+    for A in matrici[1:]:
+        get_matrix_profile(A)
+    # Il profilo usato meno di recente è uscito dalla cache
+    assert get_matrix_profile(matrici[0]) is not primo
+
+
+def test_proprieta_calcolate_una_volta_e_condivise():
+    A = tridiagonal(30)
+    b = A @ np.ones(30)
+    conjugate_gradient(A, b, np.ones(30), 1e-8)
+    profilo = get_matrix_profile(A)
+    # Verifica SPD già fatta dal gradiente coniugato e salvata nel profilo
+    assert "spd_certificate" in profilo.__dict__
+    assert profilo.is_spd and profilo.is_diagonally_dominant and profilo.has_strictly_dominant_row
+
+
+def test_splitting_e_diagonale():
+    A = nonsymmetric(25)
+    A[3, 3] = 0.0
+    profilo = MatrixProfile(A)
+    np.testing.assert_allclose((profilo.L + sp.diags(profilo.diag) + profilo.U).toarray(), A.toarray())
+    np.testing.assert_allclose(profilo.off_diagonal.toarray(), (A - sp.diags(A.diagonal())).toarray())
+    assert profilo.has_zero_diagonal and list(profilo.zero_diagonal_rows) == [3]
+    assert profilo.inv_diag[3] == 0.0
+    assert not profilo.is_symmetric and profilo.symmetry_defect > 0
+    assert not profilo.is_spd
+
+
+def test_profilo_di_matrice_densa():
+    A = tridiagonal(8).toarray()
+    profilo = MatrixProfile(A)
+    assert profilo.nnz == 22 and profilo.nnz_stats["max_row"] == 3
+    assert profilo.is_symmetric and profilo.is_positive_definite
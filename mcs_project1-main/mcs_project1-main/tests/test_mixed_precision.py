@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.checkpoints import ToleranceCheckpoints
+from iterative_solver.utils.mixed_precision import check_precision, working_dtype
+from tests.conftest import residual, tridiagonal
+
+TOL = 1e-10
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, gradient, conjugate_gradient], ids=lambda f: f.__name__)
+def test_precisione_mista(solver, spd):
+    A, b, x_true = spd
+    x, _, _, _, conv = solver(A, b, x_true, TOL, precision="mixed")
+    assert conv and x.dtype == np.float64 and residual(A, b, x) < TOL
+
+
+def test_gauss_seidel_precisione_mista_rifiuta_lo_splitting(spd):
+    A, b, x_true = spd
+    with pytest.raises(ValueError, match="splitting"):
+        gauss_seidel(A, b, x_true, TOL, splitting=sp.tril(A), precision="mixed")
+
+
+def test_precisione_mista_richiede_matrice_e_vettore(spd):
+    A, b, x_true = spd
+    with pytest.raises(ValueError, match="precisione mista"):
+        conjugate_gradient(spla.aslinearoperator(A), b, x_true, TOL, precision="mixed")
+    with pytest.raises(ValueError, match="precisione mista"):
+        jacobi(A, np.column_stack((b, b)), np.column_stack((x_true, x_true)), TOL, precision="mixed")
+    with pytest.raises(ValueError, match="Precisione sconosciuta"):
+        check_precision("half")
+
+
+def test_checkpoint_in_precisione_mista(spd):
+    A, b, x_true = spd
+    # Residuo (in float64) controllato ad ogni correzione: x salvata al passaggio di ogni tolleranza
+    checkpoints = ToleranceCheckpoints([1e-4, 1e-8], x_true, keep_x=True)
+    conjugate_gradient(A, b, x_true, 1e-8, checkpoints=checkpoints, precision="mixed")
+    for tol in (1e-4, 1e-8):
+        x, _, _, _, conv = checkpoints.result(tol)
+        assert conv and residual(A, b, x) < tol
+
+
+def test_tipo_dei_vettori_di_lavoro():
+    A = tridiagonal(10)
+    A32 = A.astype(np.float32)
+    assert working_dtype(A32, np.ones(10, dtype=np.float32)) == np.float32
+    assert working_dtype(A32, np.ones(10)) == np.float64
+    assert working_dtype(A, np.ones(10, dtype=np.float32)) == np.float64
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import scipy.io
+
+from iterative_solver.utils.matrix_loader import load_matrix
+from iterative_solver.utils.mtx_reader import read_mtx_csr, supports_streaming
+from tests.conftest import write_mtx
+
+
+@pytest.mark.parametrize("chunk_bytes", [7, 1 << 20])
+def test_lettore_a_blocchi_come_mmread(mtx, chunk_bytes):
+    A = read_mtx_csr(mtx, chunk_bytes=chunk_bytes)
+    atteso = scipy.io.mmread(mtx).tocsr()
+    assert A.has_canonical_format
+    np.testing.assert_array_equal(A.toarray(), atteso.toarray())
+
+
+def test_lettore_rifiuta_conteggio_errato(tmp_path):
+    path = write_mtx(tmp_path, "rotto.mtx", "%%MatrixMarket matrix coordinate real general\n2 2 3\n1 1 1\n2 2 1\n")
+    with pytest.raises(ValueError):
+        read_mtx_csr(path)
+    # Il caricamento in streaming non nasconde l'errore dietro mmread
+    with pytest.raises(ValueError):
+        load_matrix(path, streaming=True)
+
+
+def test_lettore_rifiuta_indici_fuori_dimensione(tmp_path):
+    path = write_mtx(tmp_path, "fuori.mtx", "%%MatrixMarket matrix coordinate real general\n2 2 2\n1 1 1\n3 1 1\n")
+    with pytest.raises(ValueError, match="fuori"):
+        read_mtx_csr(path)
+
+
+def test_load_matrix_in_streaming(mtx):
+    assert supports_streaming(mtx)
+    A = load_matrix(mtx, streaming=True)
+    np.testing.assert_array_equal(A.toarray(), load_matrix(mtx).toarray())
+
+
+def test_formato_array_letto_con_mmread(tmp_path):
+    path = str(tmp_path / "densa.mtx")
+    scipy.io.mmwrite(path, np.array([[4.0, -1.0], [-1.0, 4.0]]))
+    assert not supports_streaming(path)
+    with pytest.raises(ValueError, match="coordinate"):
+        read_mtx_csr(path)
+    np.testing.assert_array_equal(load_matrix(path, streaming=True).toarray(), [[4.0, -1.0], [-1.0, 4.0]])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.utils.coloring import adjacency_pattern, color_classes, greedy_coloring
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from tests.conftest import nonsymmetric, residual
+
+
+def test_multicolore_residuo_vero():
+    A = nonsymmetric(60, seed=3)
+    rng = np.random.default_rng(0)
+    b, x0 = rng.standard_normal(60), rng.standard_normal(60)
+    run = get_matrix_profile(A).multicolor_engine.start(b, x0.copy())
+    for _ in range(3):
+        r = run.sweep()
+        np.testing.assert_allclose(r, b - A @ run.x, atol=1e-12)
+
+
+@pytest.mark.parametrize("A", [poisson_2d(8), nonsymmetric(80, seed=4)], ids=["poisson", "non_simmetrica"])
+def test_colorazione_valida(A):
+    colors = greedy_coloring(A)
+    P = adjacency_pattern(A).tocoo()
+    # Nessuna coppia di righe accoppiate (da A o da A^T) con lo stesso colore
+    assert not np.any(colors[P.row] == colors[P.col])
+    classi = color_classes(colors)
+    assert len(classi) == colors.max() + 1
+    np.testing.assert_array_equal(np.sort(np.concatenate(classi)), np.arange(A.shape[0]))
+
+
+def test_rosso_nero_su_poisson():
+    # Griglia 2D a 5 punti: la colorazione greedy in ordine naturale è la scacchiera rosso-nero
+    colors = greedy_coloring(poisson_2d(6))
+    assert colors.max() == 1
+    np.testing.assert_array_equal(colors.reshape(6, 6), np.indices((6, 6)).sum(axis=0) % 2)
+
+
+def test_gauss_seidel_multicolore(spd):
+    A, b, x_true = spd
+    x, it, _, _, conv = gauss_seidel(A, b, x_true, 1e-10, variant="multicolor")
+    assert conv and residual(A, b, x) < 1e-10
+    # Su una scacchiera rosso-nero stessa velocità di convergenza dello sweep classico
+    assert abs(it - gauss_seidel(A, b, x_true, 1e-10)[1]) <= 2
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from iterative_solver.benchmark.generators import poisson_2d, poisson_2d_operator
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.operators import as_linear_operator, check_spd_operator, is_operator
+from tests.conftest import nonsymmetric, residual, tridiagonal
+
+TOL = 1e-10
+
+
+def test_operatore_non_assemblato(spd):
+    A, b, x_true = spd
+    op = spla.aslinearoperator(A)
+    for solver in (gradient, conjugate_gradient):
+        x, _, _, _, conv = solver(op, b, x_true, TOL)
+        assert conv and residual(A, b, x) < TOL
+    x, _, _, _, conv = jacobi(op, b, x_true, TOL, diag=A.diagonal())
+    assert conv and residual(A, b, x) < TOL
+    x, _, _, _, conv = gauss_seidel(op, b, x_true, TOL, splitting=sp.tril(A))
+    assert conv and residual(A, b, x) < TOL
+
+
+def test_stencil_senza_matrice():
+    # Funzione matvec pura: stessa soluzione e stesse iterazioni della matrice assemblata
+    op, diag = poisson_2d_operator(10)
+    A = poisson_2d(10)
+    b = A @ np.ones(100)
+    x, it, _, _, conv = conjugate_gradient(op.matvec, b, np.ones(100), TOL)
+    assert conv and residual(A, b, x) < TOL
+    assert it == conjugate_gradient(A, b, np.ones(100), TOL)[1]
+    x, _, _, _, conv = jacobi(op.matvec, b, np.ones(100), 1e-6, diag=diag)
+    assert conv and residual(A, b, x) < 1e-6
+
+
+def test_normalizzazione_e_controlli():
+    A = tridiagonal(20)
+    assert is_operator(A.dot) and not is_operator(A) and not is_operator(A.toarray())
+    assert as_linear_operator(A.dot, 20).shape == (20, 20)
+    with pytest.raises(ValueError, match="Dimensioni"):
+        as_linear_operator(spla.aslinearoperator(A), 10)
+    with pytest.raises(TypeError):
+        as_linear_operator("A", 20)
+    with pytest.raises(ValueError, match="diag"):
+        jacobi(A.dot, A @ np.ones(20), np.ones(20), TOL)
+
+    check_spd_operator(spla.aslinearoperator(A), 20, "CG")
+    with pytest.raises(ValueError, match="not symmetric"):
+        check_spd_operator(spla.aslinearoperator(nonsymmetric(20)), 20, "CG")
+    with pytest.raises(ValueError, match="not positive-definite"):
+        check_spd_operator(spla.aslinearoperator(-A), 20, "CG")
@@ -0,0 +1,50 @@
+import csv
+
+import numpy as np
+import pytest
+import scipy.io
+
+from iterative_solver.parallel_runner import _share_system, _worker_system
+from iterative_solver.test_matrices_folder import test_matrices_folder as run_folder
+from tests.conftest import nonsymmetric, tridiagonal
+
+# Colonne di output.csv che non dipendono dai tempi misurati
+_COLONNE = ("Metodo", "Tolleranza", "Iterazioni", "Errore Relativo", "Convergenza", "Iterazioni Previste")
+
+
+def _risultati(cartella, matrice):
+    with open(cartella / "results" / f"{matrice}_results" / "output.csv", newline="") as f:
+        return [tuple(riga.get(c) for c in _COLONNE) for riga in csv.DictReader(f)]
+
+
+def test_sistema_in_memoria_condivisa():
+    A = nonsymmetric(50)
+    b, x = np.arange(50.0), np.ones(50)
+    descrittore, blocchi = _share_system(A, b, x)
+    try:
+        A2, b2, x2 = _worker_system(descrittore)
+        assert (A2 != A).nnz == 0
+        np.testing.assert_array_equal(b2, b)
+        np.testing.assert_array_equal(x2, x)
+        # Stessa matrice agganciata una sola volta per processo
+        assert _worker_system(descrittore)[0] is A2
+    finally:
+        for shm in blocchi:
+            shm.close()
+            shm.unlink()
+
+
+@pytest.mark.parametrize("opzioni", [{}, {"predict": True, "precision": "mixed"}], ids=["default", "predict-mixed"])
+def test_parallelo_come_seriale(tmp_path, monkeypatch, opzioni):
+    matrici = tmp_path / "matrici"
+    matrici.mkdir()
+    scipy.io.mmwrite(str(matrici / "tri.mtx"), tridiagonal(40), symmetry="symmetric")
+    scipy.io.mmwrite(str(matrici / "tri2.mtx"), tridiagonal(30, diag=3.0), symmetry="symmetric")
+    for nome, workers in (("seriale", None), ("parallelo", 2)):
+        cartella = tmp_path / nome
+        cartella.mkdir()
+        monkeypatch.chdir(cartella)
+        run_folder(str(matrici), workers=workers, **opzioni)
+    for matrice in ("tri", "tri2"):
+        seriale = _risultati(tmp_path / "seriale", matrice)
+        assert seriale and seriale == _risultati(tmp_path / "parallelo", matrice)
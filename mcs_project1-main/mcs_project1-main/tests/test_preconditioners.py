@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.preconditioners import (
+    IncompleteCholeskyPreconditioner,
+    JacobiPreconditioner,
+    SSORPreconditioner,
+    make_preconditioner,
+)
+from tests.conftest import residual, tridiagonal
+
+TOL = 1e-10
+
+
+@pytest.fixture
+def spd():
+    # Diagonale variabile: Jacobi non è un multiplo dell'identità
+    A = (poisson_2d(10) + sp.diags(np.linspace(0.1, 5.0, 100))).tocsr()
+    return A, A @ np.ones(100)
+
+
+def test_jacobi_applica_l_inversa_della_diagonale(spd):
+    A, b = spd
+    M = JacobiPreconditioner(A)
+    np.testing.assert_allclose(M(b), b / A.diagonal())
+    B = np.column_stack([b, 2 * b])
+    np.testing.assert_allclose(M(B), B / A.diagonal()[:, None])
+
+
+@pytest.mark.parametrize("omega", [1.0, 1.5])
+def test_ssor_come_formula_esplicita(spd, omega):
+    A, b = spd
+    D = sp.diags(A.diagonal() / omega)
+    L, U = sp.tril(A, k=-1), sp.triu(A, k=1)
+    M = omega / (2.0 - omega) * ((D + L) @ sp.diags(omega / A.diagonal()) @ (D + U))
+    np.testing.assert_allclose(SSORPreconditioner(A, omega=omega)(b), spla.spsolve(M.tocsc(), b), rtol=1e-10)
+
+
+def test_ssor_omega_fuori_intervallo(spd):
+    with pytest.raises(ValueError):
+        SSORPreconditioner(spd[0], omega=2.0)
+
+
+def test_ic0_senza_riempimento_coincide_con_cholesky():
+    # Tridiagonale: il fattore di Cholesky non ha fill-in, IC(0) è esatta
+    A = tridiagonal(30)
+    M = IncompleteCholeskyPreconditioner(A)
+    np.testing.assert_allclose((M.L @ M.L.T).toarray(), A.toarray(), atol=1e-12)
+    b = A @ np.ones(30)
+    np.testing.assert_allclose(M(b), np.ones(30), rtol=1e-12)
+
+
+def test_ic0_riproduce_a_sul_pattern(spd):
+    A, _ = spd
+    M = IncompleteCholeskyPreconditioner(A)
+    assert M.shift == 0.0 and M.L.nnz == sp.tril(A).nnz
+    LLt = (M.L @ M.L.T).tocsr()
+    righe, colonne = A.nonzero()
+    np.testing.assert_allclose(np.asarray(LLt[righe, colonne]).ravel(), np.asarray(A[righe, colonne]).ravel())
+
+
+def test_ic0_con_shift_diagonale():
+    # SPD ma non M-matrice: IC(0) senza shift trova un pivot negativo
+    A = sp.csr_matrix(np.array([[3.0, -2, 0, 2], [-2, 3, -2, 0], [0, -2, 3, -2], [2, 0, -2, 3]]))
+    M = IncompleteCholeskyPreconditioner(A)
+    assert M.shift > 0
+    assert np.all(M.L.diagonal() > 0)
+
+
+@pytest.mark.parametrize("nome", ["jacobi", "ssor", "ic0", "amg"])
+def test_gradiente_coniugato_precondizionato(spd, nome):
+    A, b = spd
+    base = conjugate_gradient(A, b, np.ones(100), TOL)[1]
+    x, it, _, _, conv = conjugate_gradient(A, b, np.ones(100), TOL, preconditioner=nome)
+    assert conv and residual(A, b, x) < TOL
+    np.testing.assert_allclose(x, spla.spsolve(A.tocsc(), b), rtol=1e-8)
+    assert it < base
+
+
+def test_fattorizzazione_riusata_e_specifiche(spd):
+    A, b = spd
+    M = make_preconditioner("ic0", A)
+    assert make_preconditioner("ic0", A) is M and M.setup_time >= 0.0
+    assert make_preconditioner(None, A) is None
+    z = make_preconditioner(lambda r: 2 * r, A)(b)
+    np.testing.assert_allclose(z, 2 * b)
+    with pytest.raises(ValueError, match="sconosciuto"):
+        make_preconditioner("ilu", A)
+    with pytest.raises(ValueError, match="assemblata"):
+        make_preconditioner("jacobi", spla.aslinearoperator(A))
@@ -0,0 +1,66 @@
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.recorder import IterationRecorder
+from tests.conftest import residual
+
+TOL = 1e-8
+
+
+def test_contatori_e_array_estesi():
+    rec = IterationRecorder(capacity=2)
+    rec.begin("prova", 1, time.perf_counter(), spmv=1, dot=2)
+    rec.count(spmv=1, alloc=3)
+    for k in range(5):
+        assert not rec.record(k, 10.0 ** -k)
+    # Oltre capacity e max_iter + 1: gli array vengono estesi
+    np.testing.assert_allclose(rec.residuals, [1.0, 0.1, 0.01, 1e-3, 1e-4])
+    assert rec.iterations == 4 and np.all(np.diff(rec.times) >= 0)
+    assert (rec.spmv, rec.solve, rec.dot, rec.alloc) == (5, 0, 8, 3)
+    riepilogo = rec.summary()
+    assert riepilogo["method"] == "prova" and riepilogo["iterations"] == 4 and not riepilogo["aborted"]
+    with pytest.raises(ValueError, match="every"):
+        IterationRecorder(every=0)
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, gradient, conjugate_gradient], ids=lambda f: f.__name__)
+def test_residui_registrati_dai_metodi(solver, spd):
+    A, b, x_true = spd
+    rec = IterationRecorder()
+    x, it, _, _, conv = solver(A, b, x_true, TOL, recorder=rec)
+    assert conv and rec.iterations == it and rec.method == solver.__name__
+    # Ultimo residuo registrato = residuo relativo della soluzione restituita
+    assert rec.residuals[-1] < TOL
+    assert rec.residuals[-1] == pytest.approx(residual(A, b, x), rel=1e-6)
+    assert rec.spmv >= it and rec.setup_time >= 0.0
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, gradient, conjugate_gradient], ids=lambda f: f.__name__)
+def test_callback_interrompe(solver, spd):
+    A, b, x_true = spd
+    chiamate = []
+
+    def ferma(recorder, k, res_rel):
+        chiamate.append(k)
+        return k >= 6
+
+    rec = IterationRecorder(callback=ferma, every=3)
+    _, it, _, _, conv = solver(A, b, x_true, TOL, recorder=rec)
+    assert chiamate == [0, 3, 6]
+    assert not conv and it == 6 and rec.aborted
+
+
+def test_serializzazione_senza_callback():
+    rec = IterationRecorder(callback=lambda *args: False)
+    rec.begin("prova", 100, time.perf_counter())
+    rec.record(0, 1.0)
+    rec.record(1, 0.5)
+    copia = pickle.loads(pickle.dumps(rec))
+    assert copia.callback is None and copia.residuals.size == 2 and copia.summary()["iterations"] == 1
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+import scipy.io
+import scipy.sparse as sp
+
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.test_matrices_folder import _prepare_system
+from iterative_solver.utils.matrix_loader import load_matrix
+from iterative_solver.utils.reordering import Reordering, bandwidth, compute_reordering, reorder_matrix
+from tests.conftest import residual, tridiagonal
+
+
+def _tridiagonale_rimescolata(n=50, seed=0):
+    """Tridiagonale con righe e colonne permutate a caso: banda grande, RCM la riporta a 1."""
+    perm = np.random.default_rng(seed).permutation(n)
+    return tridiagonal(n)[perm][:, perm].tocsr()
+
+
+def test_banda():
+    assert bandwidth(sp.identity(5)) == 0
+    assert bandwidth(tridiagonal(10)) == 1
+    assert bandwidth(sp.csr_matrix((4, 4))) == 0
+    assert bandwidth(np.array([[1.0, 0.0, 2.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])) == 2
+
+
+def test_rcm_riduce_la_banda():
+    A = _tridiagonale_rimescolata()
+    ordinamento = compute_reordering(A)
+    assert ordinamento.bandwidth_before > 1 and ordinamento.bandwidth_after == 1 and ordinamento.pays_off
+    assert ordinamento.bandwidth_after == bandwidth(ordinamento.permute_matrix(A))
+    assert "RCM" in ordinamento.report()
+    with pytest.raises(ValueError, match="Riordinamento"):
+        compute_reordering(A, "amd")
+
+
+def test_permutazione_e_ritorno():
+    A = _tridiagonale_rimescolata(seed=1)
+    x_true = np.arange(1.0, 51.0)
+    b = A @ x_true
+    ordinamento = compute_reordering(A)
+    A_p = ordinamento.permute_matrix(A)
+    np.testing.assert_allclose(A_p @ ordinamento.permute(x_true), ordinamento.permute(b))
+    x_p, _, _, _, conv = conjugate_gradient(A_p, ordinamento.permute(b), ordinamento.permute(x_true), 1e-10)
+    x = ordinamento.unpermute(x_p)
+    assert conv and residual(A, b, x) < 1e-10
+    # Blocchi (n, k) permutati per righe
+    X = np.column_stack((x_true, 2 * x_true))
+    np.testing.assert_array_equal(ordinamento.unpermute(ordinamento.permute(X)), X)
+    assert not Reordering(np.arange(5), bandwidth_before=1, bandwidth_after=1).pays_off
+
+
+def test_permutazione_in_cache(tmp_path):
+    A = _tridiagonale_rimescolata(seed=2)
+    path = str(tmp_path / "m.mtx")
+    scipy.io.mmwrite(path, A)
+    # Senza la cache della matrice la permutazione non viene salvata
+    assert not reorder_matrix(path, A, use_cache=True).cached
+    assert not reorder_matrix(path, A, use_cache=True).cached
+    A = load_matrix(path, use_cache=True)
+    primo = reorder_matrix(path, A, use_cache=True)
+    secondo = reorder_matrix(path, A, use_cache=True)
+    assert not primo.cached and secondo.cached
+    np.testing.assert_array_equal(primo.perm, secondo.perm)
+    assert secondo.bandwidth_after == primo.bandwidth_after
+
+
+def test_sistema_preparato_permutato(tmp_path, capsys):
+    path = str(tmp_path / "m.mtx")
+    scipy.io.mmwrite(path, _tridiagonale_rimescolata(seed=3))
+    A_p, b_p, x_p, ordinamento = _prepare_system(path, reorder="rcm")
+    assert ordinamento is not None and bandwidth(A_p) == 1
+    np.testing.assert_allclose(A_p @ x_p, b_p)
+    # Matrice già a banda minima: ordinamento del file mantenuto
+    scipy.io.mmwrite(path, tridiagonal(20))
+    assert _prepare_system(path, reorder="rcm")[3] is None
+    assert "non conveniente" in capsys.readouterr().out
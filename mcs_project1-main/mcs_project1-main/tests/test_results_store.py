@@ -0,0 +1,58 @@
+import sqlite3
+
+import numpy as np
+import scipy.io
+
+import iterative_solver.test_matrices_folder as cartella
+from iterative_solver.utils.results_store import ResultsStore, params_key
+from tests.conftest import tridiagonal
+
+
+def test_archivio_risultati_ripresa(tmp_path):
+    path = str(tmp_path / "res" / "results.sqlite")
+    parametri = params_key(precision="double", reorder=None)
+    tolleranze = [1e-4, 1e-6, 1e-8]
+    with ResultsStore(path) as archivio:
+        archivio.put("abc", "vem1", "Jacobi", parametri, (1e-4, 10, 1e-3, 0.1, True, 0.01))
+        archivio.put("abc", "vem1", "Jacobi", parametri, (1e-6, 20, float("nan"), 0.0, False))
+    # Esecuzione ripresa: i risultati scritti sopravvivono alla chiusura
+    with ResultsStore(path) as archivio:
+        assert len(archivio) == 2
+        assert archivio.missing("abc", "Jacobi", tolleranze, parametri) == [1e-8]
+        assert archivio.missing("abc", "Jacobi", tolleranze, params_key(precision="mixed", reorder=None)) == tolleranze
+        assert archivio.get("abc", "Jacobi", 1e-4, parametri) == (1e-4, 10, 1e-3, 0.1, True, 0.01)
+        _, _, err, _, conv, setup = archivio.get("abc", "Jacobi", 1e-6, parametri)
+        assert np.isnan(err) and not conv and setup == 0.0
+        archivio.put("abc", "vem1", "Jacobi", parametri, (1e-4, 11, 1e-3, 0.1, True))
+        assert [r[1] for r in archivio.results("abc", "Jacobi", tolleranze, parametri)] == [11, 20]
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0] == 2
+
+
+def test_params_key_canonica():
+    assert params_key(a=1, b=2) == params_key(b=2, a=1)
+
+
+def test_cartella_ripresa_dall_archivio(tmp_path, monkeypatch, capsys):
+    matrici = tmp_path / "matrici"
+    matrici.mkdir()
+    scipy.io.mmwrite(str(matrici / "tri.mtx"), tridiagonal(30), symmetry="symmetric")
+    monkeypatch.chdir(tmp_path)  # results/ viene creata nella cartella corrente
+    archivio = str(tmp_path / "results.sqlite")
+    cartella.test_matrices_folder(str(matrici), store=archivio)
+    csv = tmp_path / "results" / "tri_results" / "output.csv"
+    primo = csv.read_text()
+    with ResultsStore(archivio) as s:
+        salvati = len(s)
+    assert salvati == 4 * len(cartella.METODI)
+
+    # Seconda esecuzione: nessun metodo rieseguito, output.csv rigenerato dall'archivio
+    def vietato(**kwargs):
+        raise AssertionError(f"{kwargs['name']} rieseguito")
+
+    monkeypatch.setattr(cartella, "_run_method_on_tolerances", vietato)
+    capsys.readouterr()
+    cartella.test_matrices_folder(str(matrici), store=archivio)
+    assert "già presenti nell'archivio" in capsys.readouterr().out
+    assert csv.read_text() == primo
+    with ResultsStore(archivio) as s:
+        assert len(s) == salvati
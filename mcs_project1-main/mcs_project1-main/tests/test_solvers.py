@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import scipy.sparse.linalg as spla
+
+from iterative_solver.iterative_methods.amg import amg
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gmres import gmres
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from tests.conftest import nonsymmetric, residual, tridiagonal
+
+TOL = 1e-10
+SPD = [jacobi, gauss_seidel, gradient, conjugate_gradient, gmres, amg]
+
+
+@pytest.mark.parametrize("solver", SPD, ids=lambda f: f.__name__)
+def test_converge_alla_soluzione_di_riferimento(solver, spd):
+    A, b, x_true = spd
+    x, it, _, _, conv = solver(A, b, x_true, TOL)
+    assert conv and it > 0
+    assert residual(A, b, x) < TOL
+    np.testing.assert_allclose(x, spla.spsolve(A.tocsc(), b), rtol=1e-7)
+
+
+def test_metodi_spd_rifiutano_matrici_non_simmetriche():
+    A = nonsymmetric(30)
+    b = A @ np.ones(30)
+    for solver in (gradient, conjugate_gradient):
+        with pytest.raises(ValueError, match="not symmetric"):
+            solver(A, b, np.ones(30), TOL)
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.float32])
+@pytest.mark.parametrize("solver", SPD, ids=lambda f: f.__name__)
+def test_termine_noto_non_float64(solver, dtype):
+    # Vettori di lavoro in float64 anche con b intero o float32 (A è float64)
+    A = tridiagonal(50)
+    x_true = np.ones(50)
+    b = (A @ x_true).astype(dtype)
+    x, _, _, _, conv = solver(A, b, x_true, 1e-8)
+    assert conv and x.dtype == np.float64 and residual(A, b, x) < 1e-8
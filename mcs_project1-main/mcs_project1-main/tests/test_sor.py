@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.sor import omega_from_jacobi, relaxation_parameter, sor, ssor
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from tests.conftest import residual
+
+
+@pytest.mark.parametrize("m", [16, 32])
+def test_omega_poisson_2d_formula_di_young(m):
+    # Poisson 2D (5 punti, griglia m x m): omega ottimo = 2 / (1 + sin(pi / (m + 1)))
+    profile = get_matrix_profile(poisson_2d(m))
+    rilassamento = relaxation_parameter(profile, "sor")
+    assert rilassamento.source == "spettro di Jacobi"
+    assert rilassamento.omega == pytest.approx(2.0 / (1.0 + math.sin(math.pi / (m + 1))), abs=5e-3)
+
+
+def test_sor_e_ssor_piu_veloci_di_gauss_seidel_su_poisson():
+    A = poisson_2d(32)
+    x_true = np.ones(A.shape[0])
+    b = A @ x_true
+    _, it_gs, _, _, _ = gauss_seidel(A, b, x_true, 1e-8)
+    for metodo in (sor, ssor):
+        x, it, _, _, conv = metodo(A, b, x_true, 1e-8)
+        assert conv and residual(A, b, x) < 1e-8
+        assert it < it_gs / 5
+
+
+def test_spettro_con_rho_maggiore_di_uno_passa_agli_sweep():
+    # SPD non diagonalmente dominante: rho(D^-1 A - I) = 1.8, Gauss-Seidel converge comunque
+    A = sp.csr_matrix(np.full((3, 3), 0.9) + 0.1 * np.eye(3))
+    profile = get_matrix_profile(A)
+    with pytest.warns(RuntimeWarning, match="sweep"):
+        rilassamento = relaxation_parameter(profile, "sor")
+    assert rilassamento.source == "sweep di Gauss-Seidel"
+    assert 0.0 < rilassamento.omega < 2.0
+
+
+def test_omega_esplicito_e_validato():
+    A = poisson_2d(8)
+    b = A @ np.ones(A.shape[0])
+    x, _, _, _, conv = sor(A, b, np.ones(A.shape[0]), 1e-10, omega=1.5)
+    assert conv and residual(A, b, x) < 1e-10
+    with pytest.raises(ValueError):
+        sor(A, b, np.ones(A.shape[0]), 1e-10, omega=2.0)
+
+
+def test_omega_from_jacobi():
+    assert omega_from_jacobi(0.0) == 1.0
+    assert omega_from_jacobi(0.6) == pytest.approx(2.0 / 1.8)
+    with pytest.raises(ValueError):
+        omega_from_jacobi(1.0)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from iterative_solver.benchmark.generators import poisson_2d, poisson_3d
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.utils import spd_certificate
+from iterative_solver.utils.matrix_profile import MatrixProfile
+from iterative_solver.utils.spd_certificate import FACTORIZATION_FLOP_RATIO, certify_spd, factorization_cost
+from tests.conftest import nonsymmetric, tridiagonal
+
+
+def _certificato(A, **kwargs):
+    return certify_spd(MatrixProfile(sp.csr_matrix(A)), **kwargs)
+
+
+def test_non_simmetrica():
+    cert = _certificato(nonsymmetric(30))
+    assert not cert and cert.tier == "simmetria" and cert.certified
+
+
+def test_diagonale_non_positiva():
+    cert = _certificato(-tridiagonal(10))
+    assert not cert and cert.tier == "diagonale"
+
+
+@pytest.mark.parametrize("A", [tridiagonal(50), tridiagonal(50, diag=2.0)])
+def test_dominanza_diagonale_stretta_e_irriducibile(A):
+    cert = _certificato(A)
+    assert cert and cert.tier == "dominanza diagonale" and cert.certified
+
+
+def test_dominanza_debole_riducibile_non_basta():
+    # Due blocchi disgiunti [[1, -1], [-1, 1]] (singolari): debolmente dominante ma non irriducibile
+    A = sp.block_diag([np.array([[1.0, -1.0], [-1.0, 1.0]]), np.array([[2.0]])])
+    cert = _certificato(A)
+    assert not cert and cert.tier == "fattorizzazione"
+
+
+@pytest.mark.parametrize("shift, atteso", [(-1e-3, True), (-0.3, False)])
+def test_fattorizzazione_concorda_con_gli_autovalori(shift, atteso):
+    A = poisson_2d(12) + shift * sp.identity(144)
+    cert = _certificato(A)
+    assert cert.tier == "fattorizzazione" and cert.certified
+    assert bool(cert) == atteso == (np.linalg.eigvalsh(A.toarray())[0] > 0)
+
+
+def test_densa():
+    A = poisson_2d(6).toarray() - 1e-3 * np.eye(36)
+    assert _certificato(A).tier == "fattorizzazione"
+    assert not _certificato(A - np.eye(36))
+
+
+@pytest.mark.parametrize("shift, atteso", [(-1e-3, True), (-0.3, False)])
+def test_lanczos_senza_fattorizzazione(shift, atteso):
+    A = poisson_2d(12) + shift * sp.identity(144)
+    cert = _certificato(A, factorize=False)
+    assert cert.tier == "lanczos" and not cert.certified and bool(cert) == atteso
+
+
+def test_fattorizzazione_costosa_saltata(monkeypatch):
+    # Poisson 3D non dominante: la fattorizzazione supererebbe il budget, si passa a Lanczos
+    A = (poisson_3d(16) - 1e-3 * sp.identity(16 ** 3)).tocsr()
+    assert factorization_cost(A) > FACTORIZATION_FLOP_RATIO * A.nnz
+    monkeypatch.setattr(spd_certificate.spla, "splu", None)  # non deve essere chiamata
+    cert = _certificato(A)
+    assert cert and cert.tier == "lanczos"
+
+
+def test_errore_del_gradiente_coniugato_cita_la_motivazione():
+    A = (poisson_2d(8) - 0.5 * sp.identity(64)).tocsr()
+    with pytest.raises(ValueError, match="pivot non positivo"):
+        conjugate_gradient(A, np.ones(64), np.ones(64), 1e-8)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from iterative_solver.benchmark.generators import poisson_2d
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from iterative_solver.utils.spmv import (
+    SpMVKernel,
+    get_spmv_threads,
+    nnz_balanced_rows,
+    set_spmv_threads,
+    spmv_kernel,
+    spmv_threads,
+)
+from tests.conftest import nonsymmetric
+
+
+def test_blocchi_bilanciati_per_non_nulli():
+    A = nonsymmetric(300)
+    confini = nnz_balanced_rows(A.indptr, 4)
+    assert confini[0] == 0 and confini[-1] == 300 and np.all(np.diff(confini) > 0)
+    per_blocco = np.diff(A.indptr[confini])
+    assert per_blocco.max() - per_blocco.min() <= 2 * np.diff(A.indptr).max()
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_kernel_multithread_come_prodotto_seriale(dtype):
+    A = nonsymmetric(500).astype(dtype)
+    kernel = SpMVKernel(A, threads=4, min_nnz_per_chunk=100)
+    assert kernel.n_chunks == 4
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(500)
+    # Stessa somma per riga del kernel seriale: risultato identico
+    np.testing.assert_array_equal(kernel(x), A @ x.astype(dtype))
+    X = rng.standard_normal((500, 3))
+    np.testing.assert_array_equal(kernel @ X, A @ X.astype(dtype))
+    out = np.empty(500)
+    assert kernel(x, out=out) is out
+    np.testing.assert_allclose(out, A @ x.astype(dtype), rtol=1e-6)
+
+
+def test_kernel_su_matrice_non_csr():
+    A = nonsymmetric(50)
+    kernel = SpMVKernel(A.tocsc(), threads=4)
+    x = np.ones(50)
+    assert kernel.n_chunks == 1
+    np.testing.assert_allclose(kernel(x), A @ x)
+
+
+def test_numero_di_thread():
+    precedente = get_spmv_threads()
+    with spmv_threads(3):
+        assert get_spmv_threads() == 3
+    assert get_spmv_threads() == precedente
+    with pytest.raises(ValueError):
+        set_spmv_threads(0)
+    # Un kernel per matrice e numero di thread, condiviso tramite il profilo
+    A = nonsymmetric(50)
+    profilo = get_matrix_profile(A)
+    assert spmv_kernel(A, profilo, threads=2) is spmv_kernel(A, profilo, threads=2)
+
+
+@pytest.mark.parametrize("solver", [jacobi, conjugate_gradient], ids=lambda f: f.__name__)
+def test_metodi_con_prodotto_multithread(solver):
+    # Abbastanza non nulli per più blocchi con la soglia predefinita
+    A = poisson_2d(300)
+    assert SpMVKernel(A, threads=4).n_chunks > 1
+    x_true = np.ones(A.shape[0])
+    b = A @ x_true
+    seriale = solver(A, b, x_true, 1e-12, 30)
+    with spmv_threads(4):
+        parallelo = solver(A, b, x_true, 1e-12, 30)
+    assert parallelo[1] == seriale[1] == 30
+    np.testing.assert_array_equal(parallelo[0], seriale[0])
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve_triangular
+
+from iterative_solver.utils.matrix_profile import get_matrix_profile
+from tests.conftest import nonsymmetric
+
+
+@pytest.fixture
+def sistema():
+    A = nonsymmetric(60, seed=3)
+    rng = np.random.default_rng(0)
+    return A, rng.standard_normal(60), rng.standard_normal(60)
+
+
+@pytest.mark.parametrize("variant", ["forward", "backward", "symmetric"])
+@pytest.mark.parametrize("omega", [1.0, 1.3, 0.7])
+def test_residuo_per_differenza_coincide_con_quello_vero(sistema, variant, omega):
+    A, b, x0 = sistema
+    run = get_matrix_profile(A).sweep_engine.start(b, x0.copy(), variant=variant, omega=omega)
+    for _ in range(4):
+        r = run.sweep()
+        np.testing.assert_allclose(r, b - A @ run.x, atol=1e-12)
+
+
+@pytest.mark.parametrize("variant", ["forward", "backward", "symmetric"])
+def test_residuo_su_blocco_di_termini_noti(sistema, variant):
+    A, _, _ = sistema
+    B = np.random.default_rng(1).standard_normal((60, 3))
+    run = get_matrix_profile(A).sweep_engine.start(B, np.zeros((60, 3)), variant=variant, omega=1.2)
+    for _ in range(3):
+        R = run.sweep()
+        np.testing.assert_allclose(R, B - A @ run.x, atol=1e-12)
+
+
+@pytest.mark.parametrize("omega", [1.0, 1.4])
+def test_sweep_forward_come_riferimento_scipy(sistema, omega):
+    # SOR: (D / omega + L) x_new = b - U x_old + (1 / omega - 1) D x_old
+    A, b, x0 = sistema
+    D = sp.diags(A.diagonal())
+    L, U = sp.tril(A, k=-1), sp.triu(A, k=1)
+    atteso = spsolve_triangular((D / omega + L).tocsr(), b - U @ x0 + (1.0 / omega - 1.0) * (D @ x0), lower=True)
+    run = get_matrix_profile(A).sweep_engine.start(b, x0.copy(), omega=omega)
+    run.sweep()
+    np.testing.assert_allclose(run.x, atteso, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("omega", [0.0, 2.0])
+def test_omega_fuori_intervallo(sistema, omega):
+    A, b, _ = sistema
+    with pytest.raises(ValueError):
+        get_matrix_profile(A).sweep_engine.start(b, omega=omega)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import scipy.sparse.linalg as spla
+
+from iterative_solver.iterative_methods.amg import amg
+from iterative_solver.iterative_methods.conjugate_gradient import conjugate_gradient
+from iterative_solver.iterative_methods.gauss_seidel import gauss_seidel
+from iterative_solver.iterative_methods.gmres import gmres
+from iterative_solver.iterative_methods.gradient import gradient
+from iterative_solver.iterative_methods.jacobi import jacobi
+from iterative_solver.utils.warm_start import SolutionCache, initial_guess
+from tests.conftest import residual, tridiagonal
+
+
+@pytest.mark.parametrize("solver", [jacobi, gauss_seidel, gradient, conjugate_gradient, gmres, amg],
+                         ids=lambda f: f.__name__)
+def test_warm_start_dalla_soluzione(solver, spd):
+    A, b, x_true = spd
+    _, it, _, _, conv = solver(A, b, x_true, 1e-8, x0=spla.spsolve(A.tocsc(), b))
+    assert conv and it == 0
+
+
+def test_punto_iniziale():
+    b = np.ones(4)
+    x = initial_guess(np.arange(4), b, np.float32)
+    assert x.dtype == np.float32 and np.all(initial_guess(None, b) == 0.0)
+    x0 = np.ones(4)
+    assert initial_guess(x0, b) is not x0
+    with pytest.raises(ValueError, match="Dimensioni"):
+        initial_guess(np.ones(3), b)
+
+
+@pytest.mark.parametrize("strategy", ["projection", "nearest"])
+def test_cache_delle_soluzioni(strategy, spd):
+    A, b, x_true = spd
+    cache = SolutionCache(strategy=strategy)
+    assert cache.initial_guess(A, b) is None
+    _, it_zero, _, _, conv = cache.solve(conjugate_gradient, A, b, x_true, 1e-8)
+    assert conv and len(cache) == 1
+    # Termine noto proporzionale: il punto iniziale è già la soluzione
+    x, it, _, _, conv = cache.solve(conjugate_gradient, A, 3 * b, 3 * x_true, 1e-8)
+    assert conv and it == 0 and residual(A, 3 * b, x) < 1e-8
+    assert cache.stats["warm"] == 1 and cache.stats["saved_iterations"] == it_zero
+    assert "iterazioni risparmiate" in cache.report()
+
+
+def test_proiezione_sullo_span_delle_soluzioni():
+    A = tridiagonal(30)
+    X = np.random.default_rng(0).standard_normal((30, 2))
+    cache = SolutionCache(strategy="projection")
+    for j in range(2):
+        cache.store(A, A @ X[:, j], X[:, j])
+    x_atteso = X @ [2.0, -1.0]
+    np.testing.assert_allclose(cache.initial_guess(A, A @ x_atteso), x_atteso, atol=1e-10)
+
+
+def test_limiti_di_memoria():
+    A, B = tridiagonal(10), tridiagonal(10, diag=5.0)
+    cache = SolutionCache(max_pairs=2, max_bytes=3 * 2 * 10 * 8)
+    for k in range(3):
+        cache.store(A, np.full(10, k + 1.0), np.ones(10))
+    assert len(cache) == 2
+    # Oltre max_bytes esce la matrice usata meno di recente
+    cache.store(B, np.ones(10), np.ones(10))
+    cache.store(B, 2 * np.ones(10), np.ones(10))
+    assert cache.initial_guess(A, np.ones(10)) is None and len(cache) == 2
+    assert cache.stats["evictions"] == 1
+    with pytest.raises(ValueError, match="Strategia"):
+        SolutionCache(strategy="boh")